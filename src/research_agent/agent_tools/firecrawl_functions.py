@@ -1,16 +1,53 @@
-from typing import Any, Dict, List, Optional, Literal, Union 
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Literal, Sequence, Tuple, Union 
 from firecrawl import AsyncFirecrawlApp 
 from dotenv import load_dotenv  
 import os 
 import asyncio 
+import logging
+import time
+import httpx
+from research_agent.common.rate_limits import rate_limited
+from research_agent.common.response_cache import (
+    ResponseCache,
+    build_response_cache,
+    default_cache_path,
+    normalize_url,
+)
 
 
 load_dotenv() 
 
+logger = logging.getLogger(__name__)
+
 firecrawl_api_key = os.getenv("FIRECRAWL_API_KEY")  
 async_firecrawl_app = AsyncFirecrawlApp(api_key=firecrawl_api_key)   
 
 
+# Scraped pages are kept for FIRECRAWL_SCRAPE_MAX_AGE; within FIRECRAWL_SCRAPE_FRESH_SECONDS
+# they are served as-is, after that they are revalidated with a conditional HEAD
+# (If-None-Match / If-Modified-Since) before paying for another scrape. Pages without
+# ETag/Last-Modified are simply re-scraped once stale.
+FIRECRAWL_SCRAPE_FRESH_SECONDS = float(os.getenv("FIRECRAWL_SCRAPE_FRESH_SECONDS", str(6 * 3600)))
+FIRECRAWL_SCRAPE_MAX_AGE = float(os.getenv("FIRECRAWL_SCRAPE_MAX_AGE", str(7 * 24 * 3600)))
+FIRECRAWL_REVALIDATE_TIMEOUT = float(os.getenv("FIRECRAWL_REVALIDATE_TIMEOUT", "10"))
+
+FIRECRAWL_CACHE_PATH = os.getenv("FIRECRAWL_CACHE_PATH") or default_cache_path(
+    "firecrawl_cache.sqlite3"
+)
+
+# Shared cache used by the research tools. Set FIRECRAWL_CACHE_DISABLED=1 to bypass.
+firecrawl_scrape_cache: ResponseCache = build_response_cache(
+    FIRECRAWL_CACHE_PATH,
+    ttls={"firecrawl_scrape": FIRECRAWL_SCRAPE_MAX_AGE},
+    enabled=os.getenv("FIRECRAWL_CACHE_DISABLED", "").lower() not in ("1", "true", "yes"),
+)
+
+# Max URLs a single batch scrape will take
+FIRECRAWL_BATCH_MAX_URLS = int(os.getenv("FIRECRAWL_BATCH_MAX_URLS", "10"))
+# Per-page content cap when several pages go into one summary prompt
+FIRECRAWL_BATCH_MAX_CHARS_PER_URL = int(os.getenv("FIRECRAWL_BATCH_MAX_CHARS_PER_URL", "20000"))
+
+
 
 async def firecrawl_scrape(
     app: AsyncFirecrawlApp,
@@ -37,15 +74,263 @@ async def firecrawl_scrape(
         A dict with scraped content in requested formats (implementation-specific).
     """
     # Pass keyword arguments directly to the SDK method
-    result = await app.scrape(
-        url,
+    async with rate_limited("firecrawl"):
+        result = await app.scrape(
+            url,
+            formats=formats,
+            include_links=include_links,
+            max_depth=max_depth,
+            include_images=include_images,
+        
+        )
+    return result
+
+
+def _document_to_dict(result: Any) -> Dict[str, Any]:
+    """Firecrawl returns a Pydantic Document; the cache stores plain JSON."""
+    if hasattr(result, "model_dump"):
+        return result.model_dump(mode="json", exclude_none=True)
+    if isinstance(result, dict):
+        return result
+    return {"markdown": str(result)}
+
+
+_revalidation_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_revalidation_client() -> httpx.AsyncClient:
+    global _revalidation_client
+    if _revalidation_client is None or _revalidation_client.is_closed:
+        _revalidation_client = httpx.AsyncClient(
+            timeout=FIRECRAWL_REVALIDATE_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; research-agent)"},
+        )
+    return _revalidation_client
+
+
+async def _head_validators(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Tuple[Optional[int], Dict[str, Optional[str]]]:
+    """
+    HEAD the page (conditionally if validators are given).
+
+    Returns (status_code, {"etag", "last_modified"}); status None if the request failed.
+    """
+    headers: Dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        resp = await _get_revalidation_client().head(url, headers=headers)
+    except httpx.HTTPError as e:
+        logger.debug(f"Revalidation HEAD failed for {url}: {e}")
+        return None, {"etag": None, "last_modified": None}
+    return resp.status_code, {
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+    }
+
+
+def _still_valid(
+    cached: Dict[str, Any],
+    status: Optional[int],
+    validators: Dict[str, Optional[str]],
+) -> bool:
+    if status == 304:
+        return True
+    if status != 200:
+        return False
+    # Servers that ignore conditional headers: compare the validators ourselves
+    if cached.get("etag") and validators.get("etag"):
+        return cached["etag"] == validators["etag"]
+    if cached.get("last_modified") and validators.get("last_modified"):
+        return cached["last_modified"] == validators["last_modified"]
+    return False
+
+
+async def close_revalidation_client() -> None:
+    """Close the HEAD client used for revalidation (call at process shutdown)."""
+    global _revalidation_client
+    if _revalidation_client is not None:
+        await _revalidation_client.aclose()
+        _revalidation_client = None
+
+
+def _scrape_is_fresh(entry: Dict[str, Any]) -> bool:
+    return time.time() - entry.get("validated_at", 0) < FIRECRAWL_SCRAPE_FRESH_SECONDS
+
+
+async def firecrawl_scrape_cached(
+    app: AsyncFirecrawlApp,
+    url: str,
+    formats: Optional[List[Literal["markdown", "html", "raw", "screenshot"]]] = None,
+    include_links: bool = False,
+    max_depth: int = 1,
+    include_images: bool = False,
+    cache: Optional[ResponseCache] = firecrawl_scrape_cache,
+) -> Dict[str, Any]:
+    """
+    firecrawl_scrape with a URL-keyed cache and conditional revalidation.
+
+    Returns the scraped document as a dict (format_firecrawl_search_response
+    accepts either form). Concurrent requests for the same page share one scrape
+    (ResponseCache.get_or_fetch coalescing). Entries older than
+    FIRECRAWL_SCRAPE_FRESH_SECONDS count as misses and are revalidated with a HEAD
+    before being scraped again; revalidations are counted under
+    "firecrawl_scrape_revalidated".
+    """
+    if cache is None or not cache.enabled:
+        return _document_to_dict(
+            await firecrawl_scrape(app, url, formats, include_links, max_depth, include_images)
+        )
+
+    namespace = "firecrawl_scrape"
+    params = {
+        "url": normalize_url(url),
+        "formats": sorted(formats or []),
+        "include_links": include_links,
+        "max_depth": max_depth,
+        "include_images": include_images,
+    }
+
+    async def refresh() -> Dict[str, Any]:
+        stale = await cache.get(namespace, params)
+        if stale is not None and (stale.get("etag") or stale.get("last_modified")):
+            status, validators = await _head_validators(
+                url, stale.get("etag"), stale.get("last_modified")
+            )
+            if _still_valid(stale, status, validators):
+                cache.stats_for("firecrawl_scrape_revalidated").hits += 1
+                logger.debug(f"💾 Firecrawl scrape revalidated ({status}): {url}")
+                return {**stale, "validated_at": time.time()}
+
+        start = time.perf_counter()
+        # The HEAD for the validators is free; run it alongside the paid scrape
+        result, (_, validators) = await asyncio.gather(
+            firecrawl_scrape(app, url, formats, include_links, max_depth, include_images),
+            _head_validators(url),
+        )
+        return {
+            "document": _document_to_dict(result),
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "validated_at": time.time(),
+            "fetch_seconds": time.perf_counter() - start,
+        }
+
+    entry = await cache.get_or_fetch(namespace, params, refresh, accept=_scrape_is_fresh)
+    return entry["document"]
+
+
+def dedupe_urls(urls: Sequence[str]) -> List[str]:
+    """Drop blanks and URLs that normalize to one already seen, keeping first-seen order."""
+    by_key: Dict[str, str] = {}
+    for u in urls:
+        if u and u.strip():
+            by_key.setdefault(normalize_url(u), u.strip())
+    return list(by_key.values())
+
+
+async def firecrawl_batch_scrape(
+    app: AsyncFirecrawlApp,
+    urls: Sequence[str],
+    formats: Optional[List[Literal["markdown", "html", "raw", "screenshot"]]] = None,
+    include_links: bool = False,
+    max_depth: int = 0,
+    include_images: bool = False,
+    cache: Optional[ResponseCache] = firecrawl_scrape_cache,
+) -> List[Tuple[str, Union[Dict[str, Any], Exception]]]:
+    """
+    Scrape several URLs concurrently (each through the cache; the "firecrawl"
+    rate limiter inside firecrawl_scrape bounds the real calls).
+
+    Duplicate URLs are scraped once. Returns (url, document | exception) in input
+    order, so one failing page does not sink the batch.
+    """
+    unique_urls = dedupe_urls(urls)
+    results = await asyncio.gather(
+        *(
+            firecrawl_scrape_cached(
+                app, u, formats, include_links, max_depth, include_images, cache=cache
+            )
+            for u in unique_urls
+        ),
+        return_exceptions=True,
+    )
+    out: List[Tuple[str, Union[Dict[str, Any], Exception]]] = []
+    for u, r in zip(unique_urls, results, strict=True):
+        if isinstance(r, BaseException) and not isinstance(r, Exception):
+            raise r
+        out.append((u, r))
+    return out
+
+
+async def firecrawl_batch_scrape_and_summarize(
+    app: AsyncFirecrawlApp,
+    urls: Sequence[str],
+    *,
+    summarize: Callable[[str], Awaitable[Any]],
+    format_summary: Callable[[Any], str],
+    save_raw: Optional[Callable[[str, str], Awaitable[Any]]] = None,
+    formats: Optional[List[Literal["markdown", "html", "raw", "screenshot"]]] = None,
+    include_links: bool = False,
+) -> Tuple[str, Optional[Any]]:
+    """
+    Body of the research subgraphs' batch-scrape tool: scrape up to
+    FIRECRAWL_BATCH_MAX_URLS distinct URLs, summarize the pages in one pass and
+    note the URLs that failed or were over the limit.
+
+    `summarize(formatted_pages)` returns a summary with `.summary` / `.citations`,
+    `format_summary` renders it, and `save_raw(formatted_pages, suffix)` keeps the
+    raw scrape. Returns (tool output, summary or None when nothing was scraped).
+    """
+    requested = dedupe_urls(urls)
+    selected = requested[:FIRECRAWL_BATCH_MAX_URLS]
+    logger.info(f"🔍 FIRECRAWL BATCH SCRAPE: {len(selected)} URL(s) (requested {len(requested)})")
+
+    results = await firecrawl_batch_scrape(
+        app,
+        selected,
         formats=formats,
         include_links=include_links,
-        max_depth=max_depth,
-        include_images=include_images,
-    
     )
-    return result
+
+    sections: List[str] = []
+    failed: List[str] = []
+    for url, result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"    ⚠️  Scrape failed for {url}: {type(result).__name__}: {result}")
+            failed.append(url)
+            continue
+        sections.append(
+            format_firecrawl_search_response(
+                result, max_content_chars=FIRECRAWL_BATCH_MAX_CHARS_PER_URL
+            )
+        )
+
+    skipped_note = ""
+    if failed:
+        skipped_note += "\n\nCould not scrape: " + ", ".join(failed)
+    if len(requested) > len(selected):
+        skipped_note += "\n\nNot scraped (batch limit): " + ", ".join(requested[len(selected):])
+
+    if not sections:
+        return "=== Firecrawl Batch Scrape ===\n(no pages could be scraped)" + skipped_note, None
+
+    formatted_results = "\n\n".join(sections)
+    if save_raw is not None:
+        await save_raw(formatted_results, f"{len(sections)}_pages")
+
+    summary = await summarize(formatted_results)
+    logger.info(
+        f"✅ FIRECRAWL BATCH SCRAPE complete: {len(sections)} page(s), "
+        f"{len(summary.citations)} citations extracted"
+    )
+    return format_summary(summary) + skipped_note, summary
 
 
 async def firecrawl_map(
@@ -74,15 +359,16 @@ async def firecrawl_map(
         A dict containing discovered URLs and metadata.
     """
     # Pass keyword arguments directly to the SDK method
-    result = await app.map(
-        url,
-        search=search,
-        include_subdomains=include_subdomains,
-        limit=limit,
-        sitemap=sitemap,
-       
-        
-    )
+    async with rate_limited("firecrawl"):
+        result = await app.map(
+            url,
+            search=search,
+            include_subdomains=include_subdomains,
+            limit=limit,
+            sitemap=sitemap,
+           
+            
+        )
     return result 
 
 
@@ -246,7 +532,7 @@ if __name__ == "__main__":
             "example.com", 
             formats=["markdown"]
         )
-        formatted_scrape = format_firecrawl_scrape_response(scrape_result, max_content_chars=1000)
+        formatted_scrape = format_firecrawl_search_response(scrape_result, max_content_chars=1000)
         print(formatted_scrape)
         
         print("\n" + "=" * 60)
@@ -2,6 +2,35 @@ from typing import Literal, Union, List, Dict, Any, Optional
 from tavily import AsyncTavilyClient  
 from datetime import datetime  
 import asyncio 
+import os 
+from research_agent.common.response_cache import (
+    ResponseCache,
+    build_response_cache,
+    default_cache_path,
+    normalize_text,
+    normalize_url,
+)
+from research_agent.common.rate_limits import rate_limited
+
+
+# Per-endpoint TTLs (seconds). News searches go stale quickly; extracted page
+# content and site maps change rarely.
+TAVILY_CACHE_TTLS: Dict[str, Optional[float]] = {
+    "tavily_search": 24 * 3600,
+    "tavily_search_news": 1 * 3600,
+    "tavily_extract": 7 * 24 * 3600,
+    "tavily_map": 3 * 24 * 3600,
+}
+
+TAVILY_CACHE_PATH = os.getenv("TAVILY_CACHE_PATH") or default_cache_path("tavily_cache.sqlite3")
+
+# Shared cache used by the research tools. Set TAVILY_CACHE_DISABLED=1 to bypass.
+tavily_response_cache: ResponseCache = build_response_cache(
+    TAVILY_CACHE_PATH,
+    ttls=TAVILY_CACHE_TTLS,
+    enabled=os.getenv("TAVILY_CACHE_DISABLED", "").lower() not in ("1", "true", "yes"),
+)
+
 
 async def tavily_search(
     client: AsyncTavilyClient,
@@ -14,6 +43,7 @@ async def tavily_search(
     include_raw_content: bool | Literal["markdown", "text"] = False, 
     start_date: Optional[str] = None,  
     end_date: Optional[str] = None, 
+    cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """
     Async wrapper around Tavily's search method.
@@ -30,25 +60,43 @@ async def tavily_search(
         exclude_domains: If set, avoid these domains (blacklist).
         start_date: Optional start date for search.
         end_date: Optional end date for search.
+        cache: Optional ResponseCache; identical (normalized) searches are served from it.
     Returns:
         A dict with Tavily's response (answer, results, etc.).
     """
    
 
     # Tavily async client uses `search` as well, just awaited.
-    result = await client.search( 
-
-        query=query,
-        max_results=max_results,
-        search_depth=search_depth,
-        topic=topic,
-        include_images=include_images,
-        include_raw_content=include_raw_content,
-      
-        start_date=start_date,
-        end_date=end_date,
-    )
-    return result  
+    async def _fetch() -> Dict[str, Any]:
+        async with rate_limited("tavily"):
+            return await client.search( 
+
+                query=query,
+                max_results=max_results,
+                search_depth=search_depth,
+                topic=topic,
+                include_images=include_images,
+                include_raw_content=include_raw_content,
+              
+                start_date=start_date,
+                end_date=end_date,
+            )
+
+    if cache is None:
+        return await _fetch()
+
+    namespace = "tavily_search_news" if topic == "news" else "tavily_search"
+    params = {
+        "query": normalize_text(query),
+        "max_results": max_results,
+        "search_depth": search_depth,
+        "topic": topic,
+        "include_images": include_images,
+        "include_raw_content": include_raw_content,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    return await cache.get_or_fetch(namespace, params, _fetch)
 
 async def tavily_search_multiple(
     client: AsyncTavilyClient,
@@ -223,6 +271,7 @@ async def tavily_extract(
     include_images: bool = False,
     include_favicon: bool = False,
     format: Literal["markdown", "text"] = "markdown",
+    cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """
     Async wrapper around Tavily's extract method.
@@ -230,6 +279,7 @@ async def tavily_extract(
     ✅ No **kwargs dict passed into the SDK (avoids Tavily SDK signature issues).
     ✅ Only passes chunks_per_source when query is provided.
     ✅ Normalizes urls to List[str].
+    ✅ Optional ResponseCache keyed on the (sorted, normalized) URL set + params.
 
     Works with tavily-python>=0.7.13
     """
@@ -246,26 +296,42 @@ async def tavily_extract(
     if not urls_list:
         raise ValueError("tavily_extract: urls must contain at least one valid URL.")
 
-    # Pass only supported args, explicitly (like search)
-    if query:
-        return await client.extract(
-            urls=urls_list,
-            query=query,
-            chunks_per_source=chunks_per_source,
-            extract_depth=extract_depth,
-            include_images=include_images,
-            include_favicon=include_favicon,
-            format=format,
-        )
-
-    # query is None → do NOT pass query/chunks_per_source
-    return await client.extract(
-        urls=urls_list,
-        extract_depth=extract_depth,
-        include_images=include_images,
-        include_favicon=include_favicon,
-        format=format,
-    )
+    async def _fetch() -> Dict[str, Any]:
+        async with rate_limited("tavily"):
+            # Pass only supported args, explicitly (like search)
+            if query:
+                return await client.extract(
+                    urls=urls_list,
+                    query=query,
+                    chunks_per_source=chunks_per_source,
+                    extract_depth=extract_depth,
+                    include_images=include_images,
+                    include_favicon=include_favicon,
+                    format=format,
+                )
+
+            # query is None → do NOT pass query/chunks_per_source
+            return await client.extract(
+                urls=urls_list,
+                extract_depth=extract_depth,
+                include_images=include_images,
+                include_favicon=include_favicon,
+                format=format,
+            )
+
+    if cache is None:
+        return await _fetch()
+
+    params = {
+        "urls": sorted({normalize_url(u) for u in urls_list}),
+        "query": normalize_text(query) if query else None,
+        "chunks_per_source": chunks_per_source if query else None,
+        "extract_depth": extract_depth,
+        "include_images": include_images,
+        "include_favicon": include_favicon,
+        "format": format,
+    }
+    return await cache.get_or_fetch("tavily_extract", params, _fetch)
 
 
 async def tavily_map(
@@ -275,6 +341,7 @@ async def tavily_map(
     max_depth: int = 1,
     max_breadth: int = 20,
     limit: int = 25,
+    cache: Optional[ResponseCache] = None,
 ) -> Dict[str, Any]:
     """
     Async wrapper around Tavily's map method.
@@ -282,6 +349,7 @@ async def tavily_map(
     ✅ No **kwargs dict passed into the SDK (avoids Tavily SDK signature issues).
     ✅ Only includes 'instructions' if provided.
     ✅ Default limit reduced (fast research path).
+    ✅ Optional ResponseCache keyed on normalized url + params.
 
     Works with tavily-python>=0.7.13
     """
@@ -289,23 +357,37 @@ async def tavily_map(
     if not isinstance(url, str) or not url.strip():
         raise ValueError("tavily_map: url must be a non-empty string.")
 
-    # Explicit argument passing, like search:
-    if instructions:
-        return await client.map(
-            url=url,
-            instructions=instructions,
-            max_depth=max_depth,
-            max_breadth=max_breadth,
-            limit=limit,
-        )
-
-    # instructions is None → do not pass it
-    return await client.map(
-        url=url,
-        max_depth=max_depth,
-        max_breadth=max_breadth,
-        limit=limit,
-    )
+    async def _fetch() -> Dict[str, Any]:
+        async with rate_limited("tavily"):
+            # Explicit argument passing, like search:
+            if instructions:
+                return await client.map(
+                    url=url,
+                    instructions=instructions,
+                    max_depth=max_depth,
+                    max_breadth=max_breadth,
+                    limit=limit,
+                )
+
+            # instructions is None → do not pass it
+            return await client.map(
+                url=url,
+                max_depth=max_depth,
+                max_breadth=max_breadth,
+                limit=limit,
+            )
+
+    if cache is None:
+        return await _fetch()
+
+    params = {
+        "url": normalize_url(url),
+        "instructions": normalize_text(instructions) if instructions else None,
+        "max_depth": max_depth,
+        "max_breadth": max_breadth,
+        "limit": limit,
+    }
+    return await cache.get_or_fetch("tavily_map", params, _fetch)
 
 
 def format_tavily_extract_response(
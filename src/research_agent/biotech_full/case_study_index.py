@@ -0,0 +1,165 @@
+"""
+case_study_index.py
+
+Local lookup index for case studies: normalized URL -> id and normalized title -> id.
+
+The schema has no caseStudyByUrl / caseStudyByTitle query, so the duplicate-error
+fallback used to page through every case study 50 at a time on *each* duplicate.
+`CaseStudyIndex` reads the catalog once (aliased multi-page `caseStudies` queries,
+several pages per request), is updated as case studies are created or updated, and
+answers `find(url, title)` from memory for the rest of the run.
+
+Usage:
+    index = CaseStudyIndex(GraphQLBatcher(gql))
+    csid = await index.find(url, title)     # loads the catalog on first use
+    index.add(new_id, url=url, title=title)
+
+    # A single lookup with no shared index: page until the first match instead
+    csid = await scan_case_study_id(gql, url, title)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from research_agent.biotech_full.graphql_batch import BatchOp, GraphQLBatcher
+
+CASE_STUDY_INDEX_PAGE_SIZE = int(os.getenv("CASE_STUDY_INDEX_PAGE_SIZE", "500"))
+CASE_STUDY_INDEX_PAGES_PER_REQUEST = int(os.getenv("CASE_STUDY_INDEX_PAGES_PER_REQUEST", "8"))
+CASE_STUDY_SCAN_PAGE_SIZE = int(os.getenv("CASE_STUDY_SCAN_PAGE_SIZE", "50"))
+
+
+def normalize_case_study_url(url: Optional[str]) -> str:
+    """Lowercase scheme/host, drop fragment and trailing slash; '' for empty."""
+    u = (url or "").strip()
+    if not u:
+        return ""
+    parts = urlsplit(u)
+    if not parts.scheme and not parts.netloc:
+        return u.rstrip("/")
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def normalize_case_study_title(title: Optional[str]) -> str:
+    return " ".join((title or "").strip().split()).lower()
+
+
+class CaseStudyIndex:
+    def __init__(
+        self,
+        batcher: GraphQLBatcher,
+        *,
+        page_size: int = CASE_STUDY_INDEX_PAGE_SIZE,
+        pages_per_request: int = CASE_STUDY_INDEX_PAGES_PER_REQUEST,
+    ) -> None:
+        self.batcher = batcher
+        self.page_size = page_size
+        self.pages_per_request = pages_per_request
+        self.by_url: Dict[str, str] = {}
+        self.by_title: Dict[str, str] = {}
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(set(self.by_url.values()) | set(self.by_title.values()))
+
+    def add(self, case_study_id: str, *, url: Optional[str], title: Optional[str]) -> None:
+        """Record a case study we created/updated (the latest write wins)."""
+        if not case_study_id:
+            return
+        url_key = normalize_case_study_url(url)
+        title_key = normalize_case_study_title(title)
+        if url_key:
+            self.by_url[url_key] = case_study_id
+        if title_key:
+            self.by_title[title_key] = case_study_id
+
+    def lookup(self, url: Optional[str], title: Optional[str]) -> Optional[str]:
+        """URL match first (more specific), then title. Memory only."""
+        url_key = normalize_case_study_url(url)
+        if url_key and url_key in self.by_url:
+            return self.by_url[url_key]
+        return self.by_title.get(normalize_case_study_title(title))
+
+    async def find(self, url: Optional[str], title: Optional[str]) -> Optional[str]:
+        await self.ensure_loaded()
+        return self.lookup(url, title)
+
+    async def ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        async with self._load_lock:
+            if not self.loaded:
+                await self._load()
+                self.loaded = True
+
+    async def _load(self) -> None:
+        # Done only on an empty page: a short page may be a server-side cap on `limit`,
+        # so reading continues after its last row with the page size it returned
+        offset = 0
+        page_size = max(1, self.page_size)
+        while True:
+            offsets = [offset + i * page_size for i in range(self.pages_per_request)]
+            ops: List[BatchOp] = [
+                BatchOp(
+                    key=str(o),
+                    field="caseStudies",
+                    variables={"limit": ("Int", page_size), "offset": ("Int", o)},
+                    selection="id title url",
+                )
+                for o in offsets
+            ]
+            results = await self.batcher.query(ops, operation_name="CaseStudyIndexPages")
+            for o in offsets:
+                r = results[str(o)]
+                if r.error is not None:
+                    raise r.error
+                rows = r.data or []
+                if not rows:
+                    return
+                for row in rows:
+                    # Catalog order decides ties, like the old linear scan
+                    url_key = normalize_case_study_url(row.get("url"))
+                    title_key = normalize_case_study_title(row.get("title"))
+                    if url_key:
+                        self.by_url.setdefault(url_key, row["id"])
+                    if title_key:
+                        self.by_title.setdefault(title_key, row["id"])
+                offset = o + len(rows)
+                if len(rows) < page_size:
+                    page_size = len(rows)
+                    break
+
+
+async def scan_case_study_id(
+    gql: Any,
+    url: Optional[str],
+    title: Optional[str],
+    *,
+    page_size: int = CASE_STUDY_SCAN_PAGE_SIZE,
+) -> Optional[str]:
+    """
+    Page through `caseStudies` (codegen client) and return the first url/title match.
+
+    For one-off lookups: it stops at the first hit instead of loading the whole
+    catalog, but every call starts over, so share a CaseStudyIndex for repeated ones.
+    """
+    url_key = normalize_case_study_url(url)
+    title_key = normalize_case_study_title(title)
+    offset = 0
+    limit = max(1, page_size)
+    while True:
+        page = await gql.case_studies(limit=limit, offset=offset)
+        rows = getattr(page, "case_studies", None) or []
+        if not rows:
+            return None
+        for cs in rows:
+            if url_key and normalize_case_study_url(getattr(cs, "url", None)) == url_key:
+                return cs.id
+            if title_key and normalize_case_study_title(getattr(cs, "title", None)) == title_key:
+                return cs.id
+        offset += len(rows)
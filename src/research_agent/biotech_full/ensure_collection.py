@@ -132,6 +132,12 @@ def ensure_qdrant_payload_indexes() -> None:
     # optional but recommended for windows
     _try_create("chunk_index", models.PayloadSchemaType.INTEGER)
 
+    # LangChain's QdrantVectorStore nests our metadata under "metadata"; these back the
+    # episode_url facet (get_unique_urls) and stale-chunk deletes (incremental_embeddings)
+    _try_create("metadata.episode_url", models.PayloadSchemaType.KEYWORD)
+    _try_create("metadata.parent_ref", models.PayloadSchemaType.KEYWORD)
+    _try_create("metadata.chunk_index", models.PayloadSchemaType.INTEGER)
+
 def main():
     recreate = os.getenv("RECREATE_ON_MISMATCH", "0") == "1"
     ensure_qdrant_collection(recreate_on_mismatch=recreate)
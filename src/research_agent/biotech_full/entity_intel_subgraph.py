@@ -9,18 +9,24 @@ from pydantic import BaseModel, Field
 import operator   
 import os   
 import uuid
-import json
 import logging
-import aiofiles
-import aiofiles.os
 from firecrawl import AsyncFirecrawlApp   
-from langchain.agents import create_agent  
+from research_agent.common.agent_registry import get_agent
+from research_agent.common.map_reduce_summary import summarize_results
+from research_agent.common import artifacts as common_artifacts
+from research_agent.common.research_aggregation import aggregate_research_content
 from langchain_core.prompts import PromptTemplate 
 from tavily import AsyncTavilyClient 
 from dotenv import load_dotenv 
 from langchain.tools import tool, ToolRuntime    
-from research_agent.agent_tools.tavily_functions import tavily_search, format_tavily_search_response    
-from research_agent.agent_tools.firecrawl_functions import firecrawl_scrape, format_firecrawl_map_response, format_firecrawl_search_response, firecrawl_map, format_firecrawl_map_response 
+from research_agent.agent_tools.tavily_functions import tavily_search, format_tavily_search_response, tavily_response_cache    
+from research_agent.agent_tools.firecrawl_functions import (
+    firecrawl_batch_scrape_and_summarize,
+    firecrawl_map,
+    firecrawl_scrape_cached,
+    format_firecrawl_map_response,
+    format_firecrawl_search_response,
+)
 from research_agent.agent_tools.filesystem_tools import write_file, read_file
 from research_agent.medical_db_tools.pub_med_tools import ( 
    pubmed_literature_search_tool 
@@ -71,16 +77,6 @@ def get_current_date_string() -> str:
 # FILE SAVING UTILITIES
 # ============================================================================
 
-async def ensure_directory_exists(path: str) -> None:
-    """Ensure a directory exists, creating it if necessary."""
-    dir_path = os.path.dirname(path)
-    if dir_path:
-        try:
-            await aiofiles.os.makedirs(dir_path, exist_ok=True)
-        except Exception as e:
-            logger.warning(f"Could not create directory {dir_path}: {e}")
-
-
 async def save_json_artifact(
     data: Any,
     direction_id: str,
@@ -88,48 +84,13 @@ async def save_json_artifact(
     suffix: str = "",
 ) -> str:
     """
-    Save a JSON artifact to disk with structured naming.
-    
-    Args:
-        data: Data to serialize (dict, Pydantic model, or JSON-serializable object)
-        direction_id: The research direction ID
-        artifact_type: Type of artifact (e.g., 'tavily_search', 'llm_response')
-        suffix: Optional suffix for additional context
+    Queue a JSON artifact on the background artifact sink (no filesystem I/O on the
+    tool path; see common/artifact_sink.py for the run log / modes).
     
     Returns:
-        The file path where the artifact was saved
+        The artifact reference, or "" if it won't be written
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{suffix}"
-    filename += ".json"
-    
-    filepath = os.path.join(ENTITY_INTEL_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    # Convert to JSON-serializable format
-    if hasattr(data, "model_dump"):
-        json_data = data.model_dump()
-    elif hasattr(data, "dict"):
-        json_data = data.dict()
-    elif isinstance(data, dict):
-        json_data = data
-    else:
-        json_data = {"content": str(data)}
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(json_data, indent=2, default=str, ensure_ascii=False))
-        logger.debug(f"Saved artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
+    return await common_artifacts.save_json_artifact(data, ENTITY_INTEL_OUTPUT_DIR, direction_id, artifact_type, suffix)
 
 
 async def save_text_artifact(
@@ -138,39 +99,9 @@ async def save_text_artifact(
     artifact_type: str,
     suffix: str = "",
 ) -> str:
-    """
-    Save a text artifact to disk.
-    
-    Args:
-        content: Text content to save
-        direction_id: The research direction ID
-        artifact_type: Type of artifact
-        suffix: Optional suffix
-    
-    Returns:
-        The file path where the artifact was saved
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{suffix}"
-    filename += ".txt"
-    
-    filepath = os.path.join(ENTITY_INTEL_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(content)
-        logger.debug(f"Saved text artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save text artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
+    """Queue a text artifact on the background artifact sink."""
+    return await common_artifacts.save_text_artifact(content, ENTITY_INTEL_OUTPUT_DIR, direction_id, artifact_type, suffix)
+
 
 
 
@@ -257,18 +188,13 @@ class EntityIntelResearchState(TypedDict, total=False):
 async def summarize_tavily_web_search(search_results: str, direction_id: str = uuid.uuid4()) -> TavilyResultsSummary:  
     logger.info(f"📝 Summarizing Tavily search results (input length: {len(search_results)} chars)")
     
-    agent_instructions = TAVILY_SUMMARY_PROMPT.format(search_results=search_results) 
-    web_search_summary_agent = create_agent( 
-        summary_model, 
-        response_format=TavilyResultsSummary, 
-
-    )   
-
-    web_search_summary_agent_response = await web_search_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
+    # Single call for normal-sized results; chunked map-reduce for oversized ones
+    summary = await summarize_results(
+        search_results,
+        prompt=TAVILY_SUMMARY_PROMPT,
+        schema=TavilyResultsSummary,
+        model=summary_model,
     )
-
-    summary = web_search_summary_agent_response["structured_response"]
     logger.info(f"✅ Tavily summary complete: {len(summary.citations)} citations found")
     
     # Save the summary
@@ -284,18 +210,13 @@ async def summarize_tavily_web_search(search_results: str, direction_id: str = u
 async def summarize_firecrawl_scrape(search_results: str, direction_id: str = uuid.uuid4()) -> FirecrawlResultsSummary:  
     logger.info(f"📝 Summarizing Firecrawl scrape results (input length: {len(search_results)} chars)")
     
-    agent_instructions = FIRECRAWL_SCRAPE_PROMPT.format(search_results=search_results) 
-    web_search_summary_agent = create_agent( 
-        summary_model, 
-        response_format=FirecrawlResultsSummary, 
-
-    )   
-
-    web_search_summary_agent_response = await web_search_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
+    # Single call for normal-sized results; chunked map-reduce for oversized ones
+    summary = await summarize_results(
+        search_results,
+        prompt=FIRECRAWL_SCRAPE_PROMPT,
+        schema=FirecrawlResultsSummary,
+        model=summary_model,
     )
-
-    summary = web_search_summary_agent_response["structured_response"]
     logger.info(f"✅ Firecrawl summary complete: {len(summary.citations)} citations found")
     
     # Save the summary
@@ -452,7 +373,7 @@ async def firecrawl_scrape_tool(
     
     logger.info(f"🔍 FIRECRAWL SCRAPE: Scraping URL: {url}")
 
-    results = await firecrawl_scrape(async_firecrawl_app, 
+    results = await firecrawl_scrape_cached(async_firecrawl_app, 
         url, 
         formats, 
         include_links, 
@@ -482,6 +403,61 @@ async def firecrawl_scrape_tool(
     return formatted_scrape_summary 
 
 
+@tool(
+    description="Use Firecrawl to scrape several URLs at once and get one combined summary.",
+    parse_docstring=False,
+)
+async def firecrawl_batch_scrape_tool(
+    runtime: ToolRuntime,
+    urls: List[str],
+    formats: Optional[List[Literal["markdown", "html", "raw", "screenshot"]]] = None,
+    include_links: bool = False,
+) -> str:
+
+    """Scrape a list of URLs concurrently and summarize them together in one pass.
+
+    Recommended usage:
+    - Prefer this over calling firecrawl_scrape_tool repeatedly when you already
+      have 2 or more promising URLs (e.g. several product or science pages from
+      firecrawl_map_tool or a web search). It costs a single tool step.
+    - Set `formats=["markdown"]` for clean, readable content.
+    - At most 10 URLs (FIRECRAWL_BATCH_MAX_URLS) are scraped per call; extra URLs
+      are listed back as not scraped.
+
+    Args:
+        urls (List[str]): The URLs to scrape (duplicates are scraped once).
+        formats (Optional[List[Literal["markdown", "html", "raw", "screenshot"]]],
+            optional): Output formats requested from Firecrawl. Defaults to None.
+        include_links (bool, optional): If True, include outgoing links from each
+            page. Defaults to False.
+
+    Returns:
+        str: One summary covering all scraped pages, with citations, plus a list
+        of any URLs that could not be scraped.
+
+    """
+    # Get direction_id for file naming
+    direction = runtime.state.get("direction")
+    direction_id = direction.id if direction else "unknown"
+
+    async def save_raw(formatted_results: str, suffix: str) -> None:
+        await save_text_artifact(formatted_results, direction_id, "firecrawl_batch_scrape_raw", suffix=suffix)
+
+    output, summary_of_scrape = await firecrawl_batch_scrape_and_summarize(
+        async_firecrawl_app,
+        urls,
+        summarize=lambda formatted_results: summarize_firecrawl_scrape(formatted_results, direction_id),
+        format_summary=format_firecrawl_summary_results,
+        save_raw=save_raw,
+        formats=formats,
+        include_links=include_links,
+    )
+    if summary_of_scrape is not None:
+        runtime.state.get("citations", []).extend([citation.url for citation in summary_of_scrape.citations])
+        runtime.state.get("research_notes", []).append(summary_of_scrape.summary)
+    return output
+
+
 def format_tavily_summary_results(summary: TavilyResultsSummary) -> str:
     """
     Format a TavilyResultsSummary into a clean, readable string
@@ -578,6 +554,7 @@ async def tavily_web_search_tool(
         include_raw_content=include_raw_content, 
         start_date=start_date,
         end_date=end_date,
+        cache=tavily_response_cache,
         ) 
 
     # Save raw search results
@@ -693,6 +670,7 @@ async def write_entity_intel_summary_tool(
 ENTITY_INTEL_TOOLS = [
     tavily_web_search_tool,
     firecrawl_scrape_tool,
+    firecrawl_batch_scrape_tool,
     firecrawl_map_tool,
     wiki_tool,
     pubmed_literature_search_tool,
@@ -989,35 +967,17 @@ async def research_output_node(state: EntityIntelResearchState) -> EntityIntelRe
     logger.info(f"📊 RESEARCH OUTPUT NODE [{direction_id}]")
     logger.info(f"{'='*60}")
 
-    # Aggregate intermediate summaries from files
-    aggregated_content = ""
-    
-    if file_refs:
-        intermediate_summaries = []
-        for file_path in file_refs:
-            try:
-                content = await read_file(file_path)
-                intermediate_summaries.append(f"--- File: {file_path} ---\n{content}")
-                logger.debug(f"    Loaded file: {file_path}")
-            except FileNotFoundError:
-                logger.warning(f"    File not found: {file_path}")
-                # File not found, skip (notes should have backup)
-                continue
-            except Exception as e:
-                logger.warning(f"    Error reading {file_path}: {e}")
-                # Log but continue
-                continue
-        
-        if intermediate_summaries:
-            aggregated_content = "=== INTERMEDIATE RESEARCH SUMMARIES (from files) ===\n\n"
-            aggregated_content += "\n\n".join(intermediate_summaries)
-            aggregated_content += "\n\n"
-    
-    # Add research_notes (which may include compact summaries as backup)
-    if notes:
-        aggregated_content += "=== RESEARCH NOTES ===\n\n"
-        aggregated_content += "\n\n---\n\n".join(notes)
-    
+    # Aggregate intermediate summaries (files, read concurrently) and research notes:
+    # deduplicated (files and their compact notes repeat the same synthesis),
+    # ranked by confidence/recency and fitted to a token budget
+    aggregated_content, aggregation_stats = await aggregate_research_content(
+        file_refs,
+        notes,
+        read=read_file,
+        files_header="=== INTERMEDIATE RESEARCH SUMMARIES (from files) ===",
+    )
+    logger.info(f"    Aggregation: {aggregation_stats.as_dict()}")
+
     # If nothing was collected, note that
     if not aggregated_content.strip():
         aggregated_content = "(no research notes or summaries collected)"
@@ -1051,7 +1011,7 @@ async def research_output_node(state: EntityIntelResearchState) -> EntityIntelRe
     logger.info(f"    Generating structured research result...")
 
     # Use strong model with structured output
-    result_agent = create_agent(
+    result_agent = get_agent(
         research_result_model,
         response_format=EntityIntelResearchOutput,
     )
@@ -1184,7 +1144,7 @@ async def extract_structured_entities(state: EntityIntelResearchState) -> Entity
         entity_intel_ids="\n".join(f"- {e}" for e in entity_intel_ids) or "(none identified)",
 )
 
-    entity_extraction_agent = create_agent( 
+    entity_extraction_agent = get_agent( 
         entity_extraction_model, 
         response_format=ResearchEntities,  
     )
@@ -10,16 +10,24 @@ import os
 import uuid
 import json
 import logging
-import aiofiles
-import aiofiles.os
 from firecrawl import AsyncFirecrawlApp   
-from langchain.agents import create_agent  
+from research_agent.common.agent_registry import get_agent
+from research_agent.common.map_reduce_summary import summarize_results
+from research_agent.common import artifacts as common_artifacts
+from research_agent.common.context_compaction import compact_tool_history, estimate_tokens
+from research_agent.common.research_aggregation import aggregate_research_content
 from langchain_core.prompts import PromptTemplate 
 from tavily import AsyncTavilyClient 
 from dotenv import load_dotenv 
 from langchain.tools import tool, ToolRuntime    
-from research_agent.agent_tools.tavily_functions import tavily_search, format_tavily_search_response    
-from research_agent.agent_tools.firecrawl_functions import firecrawl_scrape, format_firecrawl_map_response, format_firecrawl_search_response, firecrawl_map, format_firecrawl_map_response 
+from research_agent.agent_tools.tavily_functions import tavily_search, format_tavily_search_response, tavily_response_cache    
+from research_agent.agent_tools.firecrawl_functions import (
+    firecrawl_batch_scrape_and_summarize,
+    firecrawl_map,
+    firecrawl_scrape_cached,
+    format_firecrawl_map_response,
+    format_firecrawl_search_response,
+)
 from research_agent.agent_tools.filesystem_tools import write_file, read_file
 from research_agent.medical_db_tools.pub_med_tools import ( 
    pubmed_literature_search_tool 
@@ -85,16 +93,6 @@ openai_web_search = {"type": "web_search"}
 # FILE SAVING UTILITIES
 # ============================================================================
 
-async def ensure_directory_exists(path: str) -> None:
-    """Ensure a directory exists, creating it if necessary."""
-    dir_path = os.path.dirname(path)
-    if dir_path:
-        try:
-            await aiofiles.os.makedirs(dir_path, exist_ok=True)
-        except Exception as e:
-            logger.warning(f"Could not create directory {dir_path}: {e}")
-
-
 async def save_json_artifact(
     data: Any,
     direction_id: str,
@@ -102,48 +100,13 @@ async def save_json_artifact(
     suffix: str = "",
 ) -> str:
     """
-    Save a JSON artifact to disk with structured naming.
-    
-    Args:
-        data: Data to serialize (dict, Pydantic model, or JSON-serializable object)
-        direction_id: The research direction ID
-        artifact_type: Type of artifact (e.g., 'tavily_search', 'llm_response')
-        suffix: Optional suffix for additional context
+    Queue a JSON artifact on the background artifact sink (no filesystem I/O on the
+    tool path; see common/artifact_sink.py for the run log / modes).
     
     Returns:
-        The file path where the artifact was saved
+        The artifact reference, or "" if it won't be written
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{suffix}"
-    filename += ".json"
-    
-    filepath = os.path.join(EVIDENCE_RESEARCH_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    # Convert to JSON-serializable format
-    if hasattr(data, "model_dump"):
-        json_data = data.model_dump()
-    elif hasattr(data, "dict"):
-        json_data = data.dict()
-    elif isinstance(data, dict):
-        json_data = data
-    else:
-        json_data = {"content": str(data)}
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(json_data, indent=2, default=str, ensure_ascii=False))
-        logger.debug(f"Saved artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
+    return await common_artifacts.save_json_artifact(data, EVIDENCE_RESEARCH_OUTPUT_DIR, direction_id, artifact_type, suffix)
 
 
 async def save_text_artifact(
@@ -152,39 +115,9 @@ async def save_text_artifact(
     artifact_type: str,
     suffix: str = "",
 ) -> str:
-    """
-    Save a text artifact to disk.
-    
-    Args:
-        content: Text content to save
-        direction_id: The research direction ID
-        artifact_type: Type of artifact
-        suffix: Optional suffix
-    
-    Returns:
-        The file path where the artifact was saved
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{suffix}"
-    filename += ".txt"
-    
-    filepath = os.path.join(EVIDENCE_RESEARCH_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(content)
-        logger.debug(f"Saved text artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save text artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
+    """Queue a text artifact on the background artifact sink."""
+    return await common_artifacts.save_text_artifact(content, EVIDENCE_RESEARCH_OUTPUT_DIR, direction_id, artifact_type, suffix)
+
 
 
 
@@ -287,6 +220,10 @@ class EvidenceResearchState(TypedDict, total=False):
     steps_taken: int 
     summaries_written: int  # count of intermediate summaries
 
+    # Context accounting for the tool loop (cumulative, approximate tokens)
+    context_tokens_sent: int
+    context_tokens_saved: int
+
     # Type-specific progress tracking (appended as research progresses)
     # Each entry in the list is a progress snapshot from write_evidence_summary_tool
     claim_validation_progress: Annotated[List[Dict[str, Any]], operator.add]  # verdict evolution, evidence counts
@@ -296,10 +233,23 @@ class EvidenceResearchState(TypedDict, total=False):
 
     structured_outputs: Annotated[List[BaseModel], operator.add]   
 
+    # Written by advice_snippets_node (runs in parallel with extract_type_specific_structures)
+    advice_snippets: List[AdviceSnippet]
+
     # Final structured result
     result: EvidenceResearchResult
 
 
+# ============================================================================
+# CONTEXT COMPACTION
+# ============================================================================
+
+# Past this many (approximate) history tokens, older tool results are compacted
+# before each evidence-model call; the last N turns are always sent verbatim.
+EVIDENCE_CONTEXT_TOKEN_BUDGET = int(os.getenv("EVIDENCE_CONTEXT_TOKEN_BUDGET", "24000"))
+EVIDENCE_CONTEXT_KEEP_TURNS = int(os.getenv("EVIDENCE_CONTEXT_KEEP_TURNS", "4"))
+
+
 # ============================================================================
 # LLM MODELS
 # ============================================================================
@@ -336,18 +286,13 @@ structured_output_model = ChatOpenAI(
 async def summarize_tavily_web_search(search_results: str, direction_id: str = "unknown") -> TavilyResultsSummary:  
     logger.info(f"📝 Summarizing Tavily search results (input length: {len(search_results)} chars)")
     
-    agent_instructions = TAVILY_SUMMARY_PROMPT.format(search_results=search_results) 
-    web_search_summary_agent = create_agent( 
-        summary_model, 
-        response_format=TavilyResultsSummary, 
-
-    )   
-
-    web_search_summary_agent_response = await web_search_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
+    # Single call for normal-sized results; chunked map-reduce for oversized ones
+    summary = await summarize_results(
+        search_results,
+        prompt=TAVILY_SUMMARY_PROMPT,
+        schema=TavilyResultsSummary,
+        model=summary_model,
     )
-
-    summary = web_search_summary_agent_response["structured_response"]
     logger.info(f"✅ Tavily summary complete: {len(summary.citations)} citations found")
     
     # Save the summary
@@ -363,18 +308,13 @@ async def summarize_tavily_web_search(search_results: str, direction_id: str = "
 async def summarize_firecrawl_scrape(search_results: str, direction_id: str = "unknown") -> FirecrawlResultsSummary:  
     logger.info(f"📝 Summarizing Firecrawl scrape results (input length: {len(search_results)} chars)")
     
-    agent_instructions = FIRECRAWL_SCRAPE_PROMPT.format(search_results=search_results) 
-    web_search_summary_agent = create_agent( 
-        summary_model, 
-        response_format=FirecrawlResultsSummary, 
-
-    )   
-
-    web_search_summary_agent_response = await web_search_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
+    # Single call for normal-sized results; chunked map-reduce for oversized ones
+    summary = await summarize_results(
+        search_results,
+        prompt=FIRECRAWL_SCRAPE_PROMPT,
+        schema=FirecrawlResultsSummary,
+        model=summary_model,
     )
-
-    summary = web_search_summary_agent_response["structured_response"]
     logger.info(f"✅ Firecrawl summary complete: {len(summary.citations)} citations found")
     
     # Save the summary
@@ -531,7 +471,7 @@ async def firecrawl_scrape_tool(
     
     logger.info(f"🔍 FIRECRAWL SCRAPE: Scraping URL: {url}")
 
-    results = await firecrawl_scrape(async_firecrawl_app, 
+    results = await firecrawl_scrape_cached(async_firecrawl_app, 
         url, 
         formats, 
         include_links, 
@@ -561,6 +501,61 @@ async def firecrawl_scrape_tool(
     return formatted_scrape_summary 
 
 
+@tool(
+    description="Use Firecrawl to scrape several URLs at once and get one combined summary.",
+    parse_docstring=False,
+)
+async def firecrawl_batch_scrape_tool(
+    runtime: ToolRuntime,
+    urls: List[str],
+    formats: Optional[List[Literal["markdown", "html", "raw", "screenshot"]]] = None,
+    include_links: bool = False,
+) -> str:
+
+    """Scrape a list of URLs concurrently and summarize them together in one pass.
+
+    Recommended usage:
+    - Prefer this over calling firecrawl_scrape_tool repeatedly when you already
+      have 2 or more promising URLs (e.g. several product or science pages from
+      firecrawl_map_tool or a web search). It costs a single tool step.
+    - Set `formats=["markdown"]` for clean, readable content.
+    - At most 10 URLs (FIRECRAWL_BATCH_MAX_URLS) are scraped per call; extra URLs
+      are listed back as not scraped.
+
+    Args:
+        urls (List[str]): The URLs to scrape (duplicates are scraped once).
+        formats (Optional[List[Literal["markdown", "html", "raw", "screenshot"]]],
+            optional): Output formats requested from Firecrawl. Defaults to None.
+        include_links (bool, optional): If True, include outgoing links from each
+            page. Defaults to False.
+
+    Returns:
+        str: One summary covering all scraped pages, with citations, plus a list
+        of any URLs that could not be scraped.
+
+    """
+    # Get direction_id for file naming
+    direction = runtime.state.get("direction")
+    direction_id = direction.id if direction else "unknown"
+
+    async def save_raw(formatted_results: str, suffix: str) -> None:
+        await save_text_artifact(formatted_results, direction_id, "firecrawl_batch_scrape_raw", suffix=suffix)
+
+    output, summary_of_scrape = await firecrawl_batch_scrape_and_summarize(
+        async_firecrawl_app,
+        urls,
+        summarize=lambda formatted_results: summarize_firecrawl_scrape(formatted_results, direction_id),
+        format_summary=format_firecrawl_summary_results,
+        save_raw=save_raw,
+        formats=formats,
+        include_links=include_links,
+    )
+    if summary_of_scrape is not None:
+        runtime.state.get("citations", []).extend([citation.url for citation in summary_of_scrape.citations])
+        runtime.state.get("research_notes", []).append(summary_of_scrape.summary)
+    return output
+
+
 def format_tavily_summary_results(summary: TavilyResultsSummary) -> str:
     """
     Format a TavilyResultsSummary into a clean, readable string
@@ -657,6 +652,7 @@ async def tavily_web_search_tool(
         include_raw_content=include_raw_content, 
         start_date=start_date,
         end_date=end_date,
+        cache=tavily_response_cache,
         ) 
 
     # Save raw search results
@@ -867,6 +863,7 @@ async def write_evidence_summary_tool(
 ALL_EVIDENCE_RESEARCH_TOOLS = [
     tavily_web_search_tool,
     firecrawl_scrape_tool,
+    firecrawl_batch_scrape_tool,
     firecrawl_map_tool,  
     wiki_tool,
     pubmed_literature_search_tool,
@@ -983,12 +980,26 @@ async def call_evidence_model(state: EvidenceResearchState) -> EvidenceResearchS
         )
         logger.debug(f"    Using REMINDER evidence research prompt")
    
-    # existing conversation messages in this subgraph
+    # existing conversation messages in this subgraph, compacted past the token budget
     messages = list(state.get("messages", []))
-    
+    compaction = compact_tool_history(
+        messages,
+        token_budget=EVIDENCE_CONTEXT_TOKEN_BUDGET,
+        keep_recent_turns=EVIDENCE_CONTEXT_KEEP_TURNS,
+        summary_tool_name=write_evidence_summary_tool.name,
+    )
+    system_tokens = estimate_tokens([SystemMessage(content=system)])
+    tokens_sent = system_tokens + compaction.tokens_after
+
     logger.debug(f"    Messages in context: {len(messages)}")
+    if compaction.compacted_tool_messages:
+        logger.info(
+            f"📉 Context compacted: {compaction.compacted_tool_messages} tool result(s), "
+            f"~{compaction.tokens_before:,} → ~{compaction.tokens_after:,} history tokens"
+        )
+    logger.info(f"    ~{tokens_sent:,} tokens sent this call")
 
-    ai_msg = await model_with_tools.ainvoke([system] + messages)
+    ai_msg = await model_with_tools.ainvoke([system] + compaction.messages)
     
     # Log what the model decided to do
     tool_calls = getattr(ai_msg, "tool_calls", []) or []
@@ -1019,6 +1030,8 @@ async def call_evidence_model(state: EvidenceResearchState) -> EvidenceResearchS
     return {
         "messages": [ai_msg],
         "llm_calls": llm_calls + 1,
+        "context_tokens_sent": state.get("context_tokens_sent", 0) + tokens_sent,
+        "context_tokens_saved": state.get("context_tokens_saved", 0) + compaction.tokens_saved,
     }
 
 
@@ -1155,7 +1168,7 @@ async def generate_advice_snippets(
     )
     
     try:
-        advice_agent = create_agent(
+        advice_agent = get_agent(
             advice_snippet_model,
             response_format=AdviceSnippets,
         )
@@ -1175,7 +1188,7 @@ async def generate_advice_snippets(
 async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearchState:
     """
     Produce an EvidenceResearchResult by aggregating file-based summaries
-    and research notes, then generate advice snippets.
+    and research notes (advice snippets are generated in a parallel branch).
     """
     direction = state["direction"]
     direction_id = direction.id
@@ -1190,35 +1203,23 @@ async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearch
     logger.info(f"    Type: {direction_type.value}")
     logger.info(f"    Title: {direction.title[:60]}{'...' if len(direction.title) > 60 else ''}")
     logger.info(f"    Aggregating: {len(file_refs)} file refs, {len(notes)} notes, {len(citations)} citations")
+    logger.info(
+        f"    Tool-loop context: ~{state.get('context_tokens_sent', 0):,} tokens sent, "
+        f"~{state.get('context_tokens_saved', 0):,} saved by compaction"
+    )
     logger.info(f"{'='*60}")
 
-    # Aggregate intermediate summaries from files
-    aggregated_content = ""
-    
-    if file_refs:
-        intermediate_summaries = []
-        for file_path in file_refs:
-            try:
-                content = await read_file(file_path)
-                intermediate_summaries.append(f"--- File: {file_path} ---\n{content}")
-                logger.debug(f"    Loaded file: {file_path}")
-            except FileNotFoundError:
-                logger.warning(f"    File not found: {file_path}")
-                continue
-            except Exception as e:
-                logger.warning(f"    Error reading {file_path}: {e}")
-                continue
-        
-        if intermediate_summaries:
-            aggregated_content = "=== INTERMEDIATE EVIDENCE SUMMARIES (from files) ===\n\n"
-            aggregated_content += "\n\n".join(intermediate_summaries)
-            aggregated_content += "\n\n"
-    
-    # Add research_notes (which may include compact summaries as backup)
-    if notes:
-        aggregated_content += "=== RESEARCH NOTES ===\n\n"
-        aggregated_content += "\n\n---\n\n".join(notes)
-    
+    # Aggregate intermediate summaries (files, read concurrently) and research notes:
+    # deduplicated (files and their compact notes repeat the same synthesis),
+    # ranked by confidence/recency and fitted to a token budget
+    aggregated_content, aggregation_stats = await aggregate_research_content(
+        file_refs,
+        notes,
+        read=read_file,
+        files_header="=== INTERMEDIATE EVIDENCE SUMMARIES (from files) ===",
+    )
+    logger.info(f"    Aggregation: {aggregation_stats.as_dict()}")
+
     # If nothing was collected, note that
     if not aggregated_content.strip():
         aggregated_content = "(no research notes or summaries collected)"
@@ -1226,7 +1227,8 @@ async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearch
     else:
         logger.info(f"    Aggregated content length: {len(aggregated_content)} chars")
 
-    # Save the aggregated content before sending to LLM
+    # Queue the aggregated content on the artifact sink; its writer task saves it
+    # off the event loop while the LLM call below runs
     await save_text_artifact(
         aggregated_content,
         direction_id,
@@ -1247,7 +1249,7 @@ async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearch
     logger.info(f"    Generating structured evidence result...")
 
     # Use strong model with structured output
-    evidence_agent = create_agent(
+    evidence_agent = get_agent(
         evidence_result_model,
         response_format=EvidenceResearchOutput,
     )
@@ -1258,24 +1260,46 @@ async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearch
 
     evidence_result: EvidenceResearchOutput = agent_response["structured_response"] 
 
-    
-
-    # Ensure direction_id is set
-    
-    
-    # Generate advice snippets
-    advice_snippet = await generate_advice_snippets(evidence_result, direction)
-    
-    final_evidence_result: EvidenceResearchResult = EvidenceResearchResult(
+    # Advice snippets are filled in by advice_snippets_node, which runs in parallel
+    # with extract_type_specific_structures; finalize_evidence_result joins them.
+    evidence_research_result: EvidenceResearchResult = EvidenceResearchResult(
         direction_id=direction.id,
         short_answer=evidence_result.short_answer,
         long_answer=evidence_result.long_answer,
         evidence_strength=evidence_result.evidence_strength,
         key_points=evidence_result.key_points,
-        advice_snippets=advice_snippet.advice_snippets,
+        advice_snippets=[],
         evidence_items=evidence_result.evidence_items,
     )
-    
+
+    # Only update the parts we intend to change; LangGraph will merge this into state.
+    return {
+        "result": evidence_research_result,
+    }
+
+
+async def advice_snippets_node(state: EvidenceResearchState) -> EvidenceResearchState:
+    """Generate advice snippets from the evidence result (parallel branch)."""
+    evidence_result = state.get("result")
+    if not evidence_result:
+        logger.warning(f"    No evidence result available for advice snippets!")
+        return {"advice_snippets": []}
+
+    advice_snippet = await generate_advice_snippets(evidence_result, state["direction"])
+    return {"advice_snippets": advice_snippet.advice_snippets}
+
+
+async def finalize_evidence_result(state: EvidenceResearchState) -> EvidenceResearchState:
+    """Join the advice and type-specific extraction branches into the final result."""
+    direction_id = state["direction"].id
+    evidence_result = state.get("result")
+    if not evidence_result:
+        return {}
+
+    final_evidence_result = evidence_result.model_copy(
+        update={"advice_snippets": state.get("advice_snippets", []) or []}
+    )
+
     # Log result summary
     logger.info(f"✅ EVIDENCE OUTPUT complete:")
     logger.info(f"    Short answer length: {len(final_evidence_result.short_answer) if final_evidence_result.short_answer else 0} chars")
@@ -1292,7 +1316,6 @@ async def evidence_output_node(state: EvidenceResearchState) -> EvidenceResearch
         "final_evidence_result_final",
     )
 
-    # Only update the parts we intend to change; LangGraph will merge this into state.
     return {
         "result": final_evidence_result,
     }
@@ -1384,7 +1407,7 @@ async def extract_claim_validation(
     )
     
 
-    extraction_model = create_agent( 
+    extraction_model = get_agent( 
         type_specific_extraction_model,
         response_format=ClaimValidation, 
     )
@@ -1435,7 +1458,7 @@ async def extract_mechanism_explanation(
     )
     
 
-    extraction_model = create_agent( 
+    extraction_model = get_agent( 
         type_specific_extraction_model,
         response_format=MechanismExplanation, 
     )
@@ -1489,7 +1512,7 @@ async def extract_risk_benefit_profile(
     )
     
 
-    extraction_model = create_agent( 
+    extraction_model = get_agent( 
         type_specific_extraction_model,
         response_format=RiskBenefitProfile, 
     )
@@ -1542,7 +1565,7 @@ async def extract_comparative_analysis(
     )
   
 
-    extraction_model = create_agent( 
+    extraction_model = get_agent( 
         type_specific_extraction_model,
         response_format=ComparativeAnalysis, 
     )
@@ -1665,7 +1688,9 @@ evidence_research_subgraph_builder = StateGraph(EvidenceResearchState)
 evidence_research_subgraph_builder.add_node("call_evidence_model", call_evidence_model)
 evidence_research_subgraph_builder.add_node("evidence_tool_node", evidence_tool_node)
 evidence_research_subgraph_builder.add_node("evidence_output_node", evidence_output_node)
+evidence_research_subgraph_builder.add_node("advice_snippets_node", advice_snippets_node)
 evidence_research_subgraph_builder.add_node("extract_type_specific_structures", extract_type_specific_structures)
+evidence_research_subgraph_builder.add_node("finalize_evidence_result", finalize_evidence_result)
 
 # Entry point - start with the evidence model
 evidence_research_subgraph_builder.set_entry_point("call_evidence_model")
@@ -1683,9 +1708,14 @@ evidence_research_subgraph_builder.add_conditional_edges(
 # After tools, go back to the LLM
 evidence_research_subgraph_builder.add_edge("evidence_tool_node", "call_evidence_model")
 
-# After evidence output, extract type-specific structures then end
+# After evidence output, advice snippets and type-specific extraction run in parallel
+# (both only need the evidence result), then join into the final result
+evidence_research_subgraph_builder.add_edge("evidence_output_node", "advice_snippets_node")
 evidence_research_subgraph_builder.add_edge("evidence_output_node", "extract_type_specific_structures")
-evidence_research_subgraph_builder.add_edge("extract_type_specific_structures", END)
+evidence_research_subgraph_builder.add_edge(
+    ["advice_snippets_node", "extract_type_specific_structures"], "finalize_evidence_result"
+)
+evidence_research_subgraph_builder.add_edge("finalize_evidence_result", END)
 
 # Compile evidence research subgraph
 # evidence_research_subgraph = evidence_research_subgraph_builder.compile()
@@ -8,7 +8,12 @@ import re
 from bson import ObjectId
 from bson.errors import InvalidId
 
-from research_agent.retrieval.async_mongo_client import get_episodes_by_urls, episodes_collection
+from research_agent.retrieval.async_mongo_client import (
+    EPISODE_SUMMARY_DETAILED_PROJECTION,
+    bulk_set_episode_fields,
+    episodes_collection,
+    get_episodes_by_urls,
+)
 
 
 def _coerce_to_python(value: Any) -> Any:
@@ -95,12 +100,14 @@ async def fix_summary_detailed_for_urls(episode_urls: List[str]) -> Tuple[List[s
       - read current summaryDetailed (agent trace string)
       - extract final text
       - write it back to summaryDetailed
+    All rewrites go out in one bulk_write.
     Returns (updated_urls, skipped_urls).
     """
-    episodes = await get_episodes_by_urls(episode_urls)
+    episodes = await get_episodes_by_urls(episode_urls, projection=EPISODE_SUMMARY_DETAILED_PROJECTION)
 
     updated: List[str] = []
     skipped: List[str] = []
+    rewrites: Dict[Any, Dict[str, Any]] = {}
 
     for ep in episodes:
         url = (ep.get("episodePageUrl") or "").strip()
@@ -121,9 +128,13 @@ async def fix_summary_detailed_for_urls(episode_urls: List[str]) -> Tuple[List[s
             updated.append(url)
             continue
 
-        await update_episode_summary_detailed(ep.get("_id"), final_text)
+        rewrites[ep.get("_id")] = {"summaryDetailed": final_text}
         updated.append(url)
 
+    if rewrites:
+        stats = await bulk_set_episode_fields(rewrites)
+        print(f"📚 summaryDetailed bulk update: {stats.as_dict()}")
+
     # Also include any URLs that were requested but not found in Mongo
     found_urls = { (ep.get("episodePageUrl") or "").strip() for ep in episodes }
     for u in episode_urls:
@@ -185,7 +196,7 @@ async def export_episode_summaries_to_txt(
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    episodes = await get_episodes_by_urls(episode_urls)
+    episodes = await get_episodes_by_urls(episode_urls, projection=EPISODE_SUMMARY_DETAILED_PROJECTION)
 
     found_urls = {(ep.get("episodePageUrl") or "").strip() for ep in episodes}
     for u in episode_urls:
@@ -1,42 +1,217 @@
+"""
+get_unique_urls.py
+
+Which episodes are already embedded in the Qdrant collection?
+
+`get_unique_episode_urls` asks Qdrant for the distinct values of the keyword-indexed
+`metadata.episode_url` field with a facet query (one request, no points transferred).
+On servers without facet support or without that index, it falls back to scrolling
+with a payload selector that returns only that one field (no page_content, no vectors).
+
+`EpisodeManifest` caches the result on disk (url -> chunk count) so the summarization
+workflow can check "already indexed?" without touching Qdrant on every run.
+
+Usage:
+    urls = await get_unique_episode_urls()
+    manifest = await load_episode_manifest(max_age_seconds=3600)
+    if manifest.is_indexed(url): ...
+
+    python -m research_agent.biotech_full.get_unique_urls [--refresh]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
 import os
-from qdrant_client import QdrantClient
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
-COLLECTION = "human-upgrade"
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
 
-client = QdrantClient(url=os.getenv("QDRANT_URL") or "http://localhost:6333")
+logger = logging.getLogger(__name__)
 
-def get_unique_episode_urls(collection_name: str, batch_size: int = 512) -> set[str]:
-    unique: set[str] = set()
-    offset = None
+COLLECTION = os.getenv("QDRANT_COLLECTION_NAME") or "human-upgrade"
+QDRANT_URL = os.getenv("QDRANT_URL") or "http://localhost:6333"
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY") or None
+
+# LangChain's QdrantVectorStore nests our metadata under "metadata"
+EPISODE_URL_KEY = "metadata.episode_url"
 
+# Upper bound on distinct values returned by one facet request
+FACET_LIMIT = int(os.getenv("QDRANT_EPISODE_FACET_LIMIT", "100000"))
+
+EPISODE_MANIFEST_PATH = os.getenv(
+    "QDRANT_EPISODE_MANIFEST_PATH", os.path.join(".cache", "qdrant_episode_manifest.json")
+)
+EPISODE_MANIFEST_MAX_AGE = float(os.getenv("QDRANT_EPISODE_MANIFEST_MAX_AGE", "3600"))
+
+
+def make_async_client() -> AsyncQdrantClient:
+    return AsyncQdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+
+
+async def _facet_episode_urls(client: AsyncQdrantClient, collection_name: str) -> Dict[str, int]:
+    resp = await client.facet(
+        collection_name=collection_name,
+        key=EPISODE_URL_KEY,
+        limit=FACET_LIMIT,
+        exact=True,
+    )
+    if len(resp.hits) >= FACET_LIMIT:
+        raise RuntimeError(f"facet returned {len(resp.hits)} values (limit {FACET_LIMIT}); result may be truncated")
+    return {str(hit.value).strip(): hit.count for hit in resp.hits if str(hit.value).strip()}
+
+
+async def _scroll_episode_urls(client: AsyncQdrantClient, collection_name: str, batch_size: int) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    offset = None
     while True:
-        points, offset = client.scroll(
+        points, offset = await client.scroll(
             collection_name=collection_name,
             limit=batch_size,
             offset=offset,
-            with_payload=True,
+            with_payload=models.PayloadSelectorInclude(include=[EPISODE_URL_KEY]),
             with_vectors=False,
         )
+        for p in points:
+            meta = (p.payload or {}).get("metadata") or {}
+            url = meta.get("episode_url") if isinstance(meta, dict) else None
+            if isinstance(url, str) and url.strip():
+                counts[url.strip()] = counts.get(url.strip(), 0) + 1
+        if offset is None or not points:
+            return counts
 
-        if not points:
-            break
 
-        for p in points:
-            payload = p.payload or {}
+async def get_episode_chunk_counts(
+    collection_name: str = COLLECTION,
+    *,
+    client: Optional[AsyncQdrantClient] = None,
+    batch_size: int = 2048,
+) -> Dict[str, int]:
+    """episode_url -> number of stored chunks, via facet (falls back to a one-field scroll)."""
+    owned = client is None
+    client = client or make_async_client()
+    try:
+        try:
+            return await _facet_episode_urls(client, collection_name)
+        except Exception as e:
+            logger.warning(f"⚠️  Facet on {EPISODE_URL_KEY} unavailable ({type(e).__name__}: {e}); scrolling instead")
+            return await _scroll_episode_urls(client, collection_name, batch_size)
+    finally:
+        if owned:
+            await client.close()
+
+
+async def get_unique_episode_urls(
+    collection_name: str = COLLECTION,
+    *,
+    client: Optional[AsyncQdrantClient] = None,
+    batch_size: int = 2048,
+) -> set[str]:
+    return set(await get_episode_chunk_counts(collection_name, client=client, batch_size=batch_size))
+
+
+# -----------------------------------------------------------------------------
+# Local manifest
+# -----------------------------------------------------------------------------
+
+@dataclass
+class EpisodeManifest:
+    collection_name: str
+    episodes: Dict[str, int] = field(default_factory=dict)   # episode_url -> chunk count
+    refreshed_at: float = 0.0
+    path: str = EPISODE_MANIFEST_PATH
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.refreshed_at if self.refreshed_at else float("inf")
+
+    def is_indexed(self, episode_url: str) -> bool:
+        return self.episodes.get((episode_url or "").strip(), 0) > 0
+
+    def record(self, episode_url: str, chunk_count: int) -> None:
+        """Note an episode we just embedded (kept until the next refresh)."""
+        url = (episode_url or "").strip()
+        if url:
+            self.episodes[url] = chunk_count
+
+    def save(self) -> None:
+        dir_path = os.path.dirname(self.path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "collection_name": self.collection_name,
+                    "refreshed_at": self.refreshed_at,
+                    "episodes": self.episodes,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, collection_name: str = COLLECTION, path: str = EPISODE_MANIFEST_PATH) -> "EpisodeManifest":
+        """The manifest on disk, or an empty (stale) one if missing/unreadable/for another collection."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return cls(collection_name=collection_name, path=path)
+        if raw.get("collection_name") != collection_name:
+            return cls(collection_name=collection_name, path=path)
+        return cls(
+            collection_name=collection_name,
+            episodes={str(k): int(v) for k, v in (raw.get("episodes") or {}).items()},
+            refreshed_at=float(raw.get("refreshed_at") or 0.0),
+            path=path,
+        )
+
+
+async def refresh_episode_manifest(
+    collection_name: str = COLLECTION,
+    *,
+    client: Optional[AsyncQdrantClient] = None,
+    path: str = EPISODE_MANIFEST_PATH,
+) -> EpisodeManifest:
+    counts = await get_episode_chunk_counts(collection_name, client=client)
+    manifest = EpisodeManifest(collection_name=collection_name, episodes=counts, refreshed_at=time.time(), path=path)
+    await asyncio.to_thread(manifest.save)
+    return manifest
+
+
+async def load_episode_manifest(
+    collection_name: str = COLLECTION,
+    *,
+    max_age_seconds: float = EPISODE_MANIFEST_MAX_AGE,
+    client: Optional[AsyncQdrantClient] = None,
+    path: str = EPISODE_MANIFEST_PATH,
+) -> EpisodeManifest:
+    """The on-disk manifest if younger than `max_age_seconds`, else a fresh one from Qdrant."""
+    manifest = await asyncio.to_thread(EpisodeManifest.load, collection_name, path)
+    if manifest.age_seconds <= max_age_seconds:
+        return manifest
+    return await refresh_episode_manifest(collection_name, client=client, path=path)
 
-            # LangChain/QdrantVectorStore commonly nests your metadata like this:
-            meta = payload.get("metadata") or {}
-            if isinstance(meta, dict):
-                url = meta.get("episode_url")
-                if isinstance(url, str) and url.strip():
-                    unique.add(url.strip())
 
-        if offset is None:
-            break
+async def _main() -> None:
+    if "--refresh" in sys.argv:
+        manifest = await refresh_episode_manifest()
+    else:
+        manifest = await load_episode_manifest()
+    print(f"Unique episode_url count: {len(manifest.episodes)} (manifest age {manifest.age_seconds:.0f}s)")
+    for url in sorted(manifest.episodes):
+        print(f"{manifest.episodes[url]:>5}  {url}")
 
-    return unique
 
-urls = get_unique_episode_urls(COLLECTION)
-print(f"Unique episode_url count: {len(urls)}")
-for u in sorted(urls):
-    print(u)
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(_main())
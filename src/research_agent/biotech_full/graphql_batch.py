@@ -0,0 +1,289 @@
+"""
+graphql_batch.py
+
+Pack many GraphQL operations into one aliased document per round trip.
+
+    mutation SeedPeople($input0: PersonCreateInput!, $input1: PersonCreateInput!) {
+      op0: createPerson(input: $input0) { id }
+      op1: createPerson(input: $input1) { id }
+    }
+
+Errors are mapped back to the operation that caused them (via the alias in
+`error.path`, or the `$variable` named in request-level validation errors), so one
+bad item never hides the results of the others. Works on top of the ariadne-codegen
+`Client` (only `execute` is used), so operations that are missing from the generated
+client (createPerson, createCompound, ...) can still be batched.
+
+Usage:
+    batcher = GraphQLBatcher(gql)
+    results = await batcher.mutate([
+        BatchOp(key="jane doe", field="createPerson",
+                variables={"input": ("PersonCreateInput!", PersonCreateInput(name="jane doe"))}),
+    ])
+    results["jane doe"].id, results["jane doe"].error
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Tuple
+
+from graphql_client.client import Client
+from graphql_client.exceptions import (
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientHttpError,
+    GraphQLClientInvalidResponseError,
+)
+
+# Operations per document. Big enough to collapse an episode into a handful of
+# requests, small enough that one slow resolver doesn't stall a huge payload.
+GRAPHQL_BATCH_SIZE = int(os.getenv("GRAPHQL_BATCH_SIZE", "25"))
+# Documents in flight at once per batcher
+GRAPHQL_MAX_IN_FLIGHT = int(os.getenv("GRAPHQL_MAX_IN_FLIGHT", "4"))
+
+OperationKind = Literal["query", "mutation"]
+
+_ALIAS_RE = re.compile(r"^op(\d+)$")
+_VARIABLE_RE = re.compile(r"\$([A-Za-z_]+?)(\d+)\b")
+
+
+@dataclass(frozen=True)
+class BatchOp:
+    """
+    One root field of a batched document.
+
+    `variables` maps argument name -> (GraphQL type, value); values may be the
+    generated pydantic input models. `selection` is the sub-selection (empty for
+    scalar fields).
+    """
+    key: str
+    field: str
+    variables: Mapping[str, Tuple[str, Any]]
+    selection: str = "id"
+
+
+@dataclass
+class BatchItemResult:
+    key: str
+    data: Any = None  # the aliased field's value: an object, a list, or None
+    error: Optional[GraphQLClientGraphQLMultiError] = None
+    # True when the server nulled the whole `data` object (a sibling failed on a
+    # non-null mutation field), so whether this operation ran is unknown.
+    lost: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.lost
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.data.get("id") if isinstance(self.data, dict) else None
+
+
+@dataclass
+class BatchStats:
+    round_trips: int = 0
+    operations: int = 0
+    item_errors: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "round_trips": self.round_trips,
+            "operations": self.operations,
+            "item_errors": self.item_errors,
+        }
+
+
+def build_batch_document(
+    kind: OperationKind,
+    operation_name: str,
+    ops: Sequence[BatchOp],
+) -> Tuple[str, Dict[str, Any]]:
+    """Return (document, variables) with op `i` aliased as `op{i}` and its args as `${arg}{i}`."""
+    var_defs: List[str] = []
+    fields: List[str] = []
+    variables: Dict[str, Any] = {}
+    for i, op in enumerate(ops):
+        args: List[str] = []
+        for arg, (gql_type, value) in op.variables.items():
+            var = f"{arg}{i}"
+            var_defs.append(f"${var}: {gql_type}")
+            args.append(f"{arg}: ${var}")
+            variables[var] = value
+        call = f"{op.field}({', '.join(args)})" if args else op.field
+        body = f" {{ {op.selection} }}" if op.selection else ""
+        fields.append(f"  op{i}: {call}{body}")
+    header = f"{kind} {operation_name}"
+    if var_defs:
+        header += f"({', '.join(var_defs)})"
+    return header + " {\n" + "\n".join(fields) + "\n}", variables
+
+
+def _error_index(error: Dict[str, Any], n_ops: int) -> Optional[int]:
+    """Which op an error belongs to: alias in `path`, else a `$var{i}` named in the message."""
+    path = error.get("path") or []
+    if path:
+        m = _ALIAS_RE.match(str(path[0]))
+        if m and int(m.group(1)) < n_ops:
+            return int(m.group(1))
+    for m in _VARIABLE_RE.finditer(error.get("message") or ""):
+        idx = int(m.group(2))
+        if idx < n_ops:
+            return idx
+    return None
+
+
+class GraphQLBatcher:
+    """
+    Runs lists of `BatchOp` as aliased documents of at most `batch_size` fields,
+    with at most `max_in_flight` documents in flight across all callers.
+
+    Query chunks run concurrently. Mutation chunks run one after another so the
+    server sees writes in caller order, unless `ordered_mutations=False` (for
+    callers whose ops within one call are independent of each other).
+    """
+
+    def __init__(
+        self,
+        gql: Client,
+        *,
+        batch_size: int = GRAPHQL_BATCH_SIZE,
+        max_in_flight: int = GRAPHQL_MAX_IN_FLIGHT,
+        ordered_mutations: bool = True,
+    ) -> None:
+        self.gql = gql
+        self.batch_size = max(1, batch_size)
+        self.ordered_mutations = ordered_mutations
+        self.stats = BatchStats()
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def query(
+        self, ops: Sequence[BatchOp], *, operation_name: str = "BatchQuery"
+    ) -> Dict[str, BatchItemResult]:
+        return await self._run_concurrently("query", operation_name, self._chunks(ops))
+
+    async def mutate(
+        self, ops: Sequence[BatchOp], *, operation_name: str = "BatchMutation"
+    ) -> Dict[str, BatchItemResult]:
+        chunks = self._chunks(ops)
+        if not self.ordered_mutations:
+            return await self._run_concurrently("mutation", operation_name, chunks)
+        results: Dict[str, BatchItemResult] = {}
+        for chunk in chunks:
+            results.update(await self._run_chunk("mutation", operation_name, chunk))
+        return results
+
+    async def _run_concurrently(
+        self,
+        kind: OperationKind,
+        operation_name: str,
+        chunks: List[List[BatchOp]],
+    ) -> Dict[str, BatchItemResult]:
+        results: Dict[str, BatchItemResult] = {}
+        parts = await asyncio.gather(*(self._run_chunk(kind, operation_name, c) for c in chunks))
+        for part in parts:
+            results.update(part)
+        return results
+
+    def _chunks(self, ops: Sequence[BatchOp]) -> List[List[BatchOp]]:
+        keys = [op.key for op in ops]
+        if len(set(keys)) != len(keys):
+            raise ValueError("BatchOp keys must be unique within one call")
+        return [list(ops[i:i + self.batch_size]) for i in range(0, len(ops), self.batch_size)]
+
+    async def _run_chunk(
+        self,
+        kind: OperationKind,
+        operation_name: str,
+        ops: List[BatchOp],
+    ) -> Dict[str, BatchItemResult]:
+        results: Dict[str, BatchItemResult] = {}
+        pending = ops
+        while pending:
+            document, variables = build_batch_document(kind, operation_name, pending)
+            async with self._in_flight:
+                response = await self.gql.execute(
+                    query=document, operation_name=operation_name, variables=variables
+                )
+            self.stats.round_trips += 1
+            self.stats.operations += len(pending)
+
+            try:
+                payload = response.json()
+            except ValueError as exc:
+                if not response.is_success:
+                    raise GraphQLClientHttpError(
+                        status_code=response.status_code, response=response
+                    ) from exc
+                raise GraphQLClientInvalidResponseError(response=response) from exc
+            if not isinstance(payload, dict) or ("data" not in payload and "errors" not in payload):
+                if not response.is_success:
+                    raise GraphQLClientHttpError(
+                        status_code=response.status_code, response=response
+                    )
+                raise GraphQLClientInvalidResponseError(response=response)
+
+            data = payload.get("data")
+            errors_by_index: Dict[int, List[Dict[str, Any]]] = {}
+            unmapped: List[Dict[str, Any]] = []
+            for err in payload.get("errors") or []:
+                idx = _error_index(err, len(pending))
+                if idx is None:
+                    unmapped.append(err)
+                else:
+                    errors_by_index.setdefault(idx, []).append(err)
+
+            if unmapped:
+                # Document-level failure we can't pin on an item: nothing ran
+                raise GraphQLClientGraphQLMultiError.from_errors_dicts(
+                    errors_dicts=unmapped, data=data
+                )
+
+            for idx, errs in errors_by_index.items():
+                op = pending[idx]
+                results[op.key] = BatchItemResult(
+                    key=op.key,
+                    error=GraphQLClientGraphQLMultiError.from_errors_dicts(errors_dicts=errs),
+                )
+                self.stats.item_errors += 1
+
+            request_level = all(
+                not e.get("path") for errs in errors_by_index.values() for e in errs
+            )
+            if data is None and errors_by_index and request_level:
+                # Request-level validation errors (bad variable values): the document never
+                # executed, so resend everything that wasn't rejected.
+                pending = [op for i, op in enumerate(pending) if i not in errors_by_index]
+                continue
+
+            for i, op in enumerate(pending):
+                if i in errors_by_index:
+                    continue
+                if data is None:
+                    results[op.key] = BatchItemResult(key=op.key, lost=True)
+                else:
+                    results[op.key] = BatchItemResult(key=op.key, data=data.get(f"op{i}"))
+            pending = []
+        return results
+
+
+async def resolve_ids_by_name(
+    batcher: GraphQLBatcher,
+    field_name: str,
+    names: Iterable[str],
+) -> Dict[str, Optional[str]]:
+    """
+    Look up many `<entity>ByName` fields in one aliased query.
+    Returns {name: id or None}; failed lookups count as not found.
+    """
+    wanted = [n for n in dict.fromkeys(names) if n and n.strip()]
+    if not wanted:
+        return {}
+    results = await batcher.query(
+        [BatchOp(key=n, field=field_name, variables={"name": ("String!", n)}) for n in wanted],
+        operation_name=f"Batch{field_name[0].upper()}{field_name[1:]}",
+    )
+    return {n: results[n].id for n in wanted}
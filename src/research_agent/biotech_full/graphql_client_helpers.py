@@ -40,6 +40,10 @@ from graphql_client.input_types import (
 )
 from graphql_client.enums import CaseStudySourceType
 
+from research_agent.biotech_full.case_study_index import CaseStudyIndex, scan_case_study_id
+from research_agent.biotech_full.graphql_batch import GraphQLBatcher
+from research_agent.common.http_transport import make_http_client
+
 
 # -----------------------------------------------------------------------------
 # Duck-typed research agent outputs (mirror your pydantic models)
@@ -202,33 +206,21 @@ async def get_episode_id_by_page_url(gql: Client, page_url: str) -> Optional[str
     node = getattr(r, "episode_by_page_url", None)
     return node.id if node else None
 
-async def find_case_study_id_by_url_or_title(gql: Client, url: Optional[str], title: str) -> Optional[str]:
+async def find_case_study_id_by_url_or_title(
+    gql: Client,
+    url: Optional[str],
+    title: str,
+    *,
+    index: Optional[CaseStudyIndex] = None,
+) -> Optional[str]:
     """
     You don't have caseStudyByUrl/title query yet.
-    Best available fallback: paginate caseStudies and match by url/title locally.
-
-    This is O(N) and fine for early ingestion while your dataset is small.
+    Match by normalized url/title in a shared `index` (the catalog is read once, in
+    one batched pass); without one, scan the pages and stop at the first match.
     """
-    target_title = _norm(title)
-    target_url = (url or "").strip()
-
-    offset = 0
-    limit = 50
-    while True:
-        page = await gql.case_studies(limit=limit, offset=offset)
-        rows = getattr(page, "case_studies", [])
-        if not rows:
-            return None
-
-        for cs in rows:
-            if target_url and (getattr(cs, "url", None) or "").strip() == target_url:
-                return cs.id
-            if _norm(getattr(cs, "title", "") or "") == target_title:
-                return cs.id
-
-        if len(rows) < limit:
-            return None
-        offset += limit
+    if index is None:
+        return await scan_case_study_id(gql, url, title)
+    return await index.find(url, title)
 
 
 # -----------------------------------------------------------------------------
@@ -434,6 +426,7 @@ async def upsert_case_study(
     cs: CaseStudyOutput,
     *,
     episode_page_urls: List[str],
+    case_study_index: Optional[CaseStudyIndex] = None,
 ) -> str:
     """
     Uses your added connect-by-name convenience fields:
@@ -463,15 +456,18 @@ async def upsert_case_study(
                 compound_names=compound_names or None,         # ✅
             )
         )
-        return created.create_case_study.id
+        csid = created.create_case_study.id
+        if case_study_index is not None:
+            case_study_index.add(csid, url=cs.url, title=title)
+        return csid
     except Exception as e:
         if not _is_duplicate_error(e):
             raise
 
-        existing_id = await find_case_study_id_by_url_or_title(gql, cs.url, title)
+        existing_id = await find_case_study_id_by_url_or_title(gql, cs.url, title, index=case_study_index)
         if not existing_id:
             raise RuntimeError(
-                f"Duplicate case study '{title}' but could not find it via caseStudies pagination."
+                f"Duplicate case study '{title}' but could not find it in the case study index."
             ) from e
 
         updated = await gql.update_case_study(
@@ -487,7 +483,10 @@ async def upsert_case_study(
             )
         )
         node = getattr(updated, "update_case_study", None)
-        return node.id if node else existing_id
+        csid = node.id if node else existing_id
+        if case_study_index is not None:
+            case_study_index.add(csid, url=cs.url, title=title)
+        return csid
 
 
 # -----------------------------------------------------------------------------
@@ -626,8 +625,9 @@ async def ingest_entities_for_episode(
         )
         product_ids[_norm(pr.name)] = pid
 
-    # 5) Case studies
+    # 5) Case studies (duplicates resolve through one shared url/title index)
     case_study_ids: List[str] = []
+    case_study_index = CaseStudyIndex(GraphQLBatcher(gql))
     for cs in entities.case_studies:
         if not (cs.title or "").strip():
             continue
@@ -635,6 +635,7 @@ async def ingest_entities_for_episode(
             gql,
             cs,
             episode_page_urls=[episode_page_url],
+            case_study_index=case_study_index,
         )
         case_study_ids.append(csid)
 
@@ -679,7 +680,9 @@ def make_graphql_client_from_env() -> Client:
     if graphql_url.startswith("localhost"):
         graphql_url = "http://" + graphql_url
 
+    headers = {"Authorization": f"Bearer {graphql_auth_token}"}
     return Client(
         url=graphql_url,
-        headers={"Authorization": f"Bearer {graphql_auth_token}"},
+        headers=headers,
+        http_client=make_http_client(headers),
     )
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+graphql_id_resolver.py
+
+Per-run name -> ID cache for people, compounds, products and businesses.
+
+Seed ingestion asks "does X exist / what is its id?" many times per payload, for the
+same names (case studies re-check every product, business fallbacks re-query, ...).
+`EntityIdResolver` answers from memory, learns from every create/update result,
+and sends whatever it doesn't know as one aliased `<entity>ByName` query. `prefetch`
+pages the list queries (`people`, `compounds`, `products`, `businesses`) once so
+that, for the rest of the run, a miss in memory means "does not exist" without a
+round trip.
+
+Usage:
+    resolver = EntityIdResolver(GraphQLBatcher(gql))
+    await resolver.prefetch()                       # optional, one pass over the catalog
+    ids = await resolver.resolve_many("product", ["nitric oxide lozenge", "beet root"])
+    resolver.remember_many("product", {"beet root": "665f..."})
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Set
+
+from research_agent.biotech_full.case_study_index import CaseStudyIndex
+from research_agent.biotech_full.graphql_batch import BatchOp, GraphQLBatcher, resolve_ids_by_name
+
+EntityKind = Literal["person", "compound", "product", "business"]
+
+ENTITY_KINDS: tuple[EntityKind, ...] = ("person", "compound", "product", "business")
+
+_BY_NAME_FIELD: Dict[EntityKind, str] = {
+    "person": "personByName",
+    "compound": "compoundByName",
+    "product": "productByName",
+    "business": "businessByName",
+}
+
+_LIST_FIELD: Dict[EntityKind, str] = {
+    "person": "people",
+    "compound": "compounds",
+    "product": "products",
+    "business": "businesses",
+}
+
+# Page size for the list queries, and how many pages of each kind share one document
+GRAPHQL_PREFETCH_PAGE_SIZE = int(os.getenv("GRAPHQL_PREFETCH_PAGE_SIZE", "200"))
+GRAPHQL_PREFETCH_PAGES_PER_REQUEST = int(os.getenv("GRAPHQL_PREFETCH_PAGES_PER_REQUEST", "4"))
+
+
+def _name_key(name: str) -> str:
+    # Same normalization as graphql_seed_helpers.norm
+    return " ".join((name or "").strip().split()).lower()
+
+
+@dataclass
+class ResolverStats:
+    hits: int = 0
+    misses: int = 0
+    lookups: int = 0
+    prefetched: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookups": self.lookups,
+            "prefetched": self.prefetched,
+        }
+
+
+class EntityIdResolver:
+    """
+    Memoizes name -> id per entity kind for one ingestion run.
+
+    Known-missing names are cached too (until something with that name is
+    remembered), and kinds that were fully prefetched never hit the server again.
+    Case studies have no name key; their url/title index rides along as
+    `case_studies`.
+    """
+
+    def __init__(self, batcher: GraphQLBatcher) -> None:
+        self.batcher = batcher
+        self.case_studies = CaseStudyIndex(batcher)
+        self.stats = ResolverStats()
+        self._ids: Dict[EntityKind, Dict[str, str]] = {k: {} for k in ENTITY_KINDS}
+        self._missing: Dict[EntityKind, Set[str]] = {k: set() for k in ENTITY_KINDS}
+        self._complete: Set[EntityKind] = set()
+
+    def remember(self, kind: EntityKind, name: str, entity_id: Optional[str]) -> None:
+        if not name or not entity_id:
+            return
+        key = _name_key(name)
+        self._ids[kind][key] = entity_id
+        self._missing[kind].discard(key)
+
+    def remember_many(self, kind: EntityKind, ids: Mapping[str, Optional[str]]) -> None:
+        for name, entity_id in ids.items():
+            self.remember(kind, name, entity_id)
+
+    def cached(self, kind: EntityKind, name: str) -> Optional[str]:
+        return self._ids[kind].get(_name_key(name))
+
+    def known(self, kind: EntityKind, names: Iterable[str]) -> Dict[str, str]:
+        """The subset of `names` with a cached id (no network)."""
+        found: Dict[str, str] = {}
+        for name in names:
+            entity_id = self.cached(kind, name)
+            if entity_id:
+                found[name] = entity_id
+        return found
+
+    async def resolve(self, kind: EntityKind, name: str) -> Optional[str]:
+        return (await self.resolve_many(kind, [name])).get(name)
+
+    async def resolve_many(
+        self,
+        kind: EntityKind,
+        names: Iterable[str],
+        *,
+        refresh_missing: bool = False,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Return {name: id or None}; unknown names go out as one batched by-name query.
+        `refresh_missing` re-checks names cached as absent (e.g. after a duplicate error
+        or after entities were created without returning their ids).
+        """
+        wanted = [n for n in dict.fromkeys(names) if n and n.strip()]
+        result: Dict[str, Optional[str]] = {}
+        unknown: List[str] = []
+        for name in wanted:
+            key = _name_key(name)
+            if key in self._ids[kind]:
+                result[name] = self._ids[kind][key]
+                self.stats.hits += 1
+            elif not refresh_missing and (key in self._missing[kind] or kind in self._complete):
+                result[name] = None
+                self.stats.hits += 1
+            else:
+                unknown.append(name)
+
+        if unknown:
+            self.stats.misses += len(unknown)
+            self.stats.lookups += 1
+            fetched = await resolve_ids_by_name(self.batcher, _BY_NAME_FIELD[kind], unknown)
+            for name in unknown:
+                entity_id = fetched.get(name)
+                if entity_id:
+                    self.remember(kind, name, entity_id)
+                else:
+                    self._missing[kind].add(_name_key(name))
+                result[name] = entity_id
+        return result
+
+    async def prefetch(
+        self,
+        kinds: Sequence[EntityKind] = ENTITY_KINDS,
+        *,
+        page_size: int = GRAPHQL_PREFETCH_PAGE_SIZE,
+        pages_per_request: int = GRAPHQL_PREFETCH_PAGES_PER_REQUEST,
+    ) -> None:
+        """
+        Load every (name, id) of `kinds` via the paged list queries. Pages of all
+        kinds travel together: each request carries `pages_per_request` pages per
+        kind still being read.
+
+        A kind is complete only once a page comes back empty. A short page may be the
+        server capping `limit`, so reading continues right after its last row with
+        the page size shrunk to what the server returned.
+        """
+        offsets: Dict[EntityKind, int] = {k: 0 for k in kinds if k not in self._complete}
+        sizes: Dict[EntityKind, int] = {k: max(1, page_size) for k in offsets}
+        while offsets:
+            ops: List[BatchOp] = []
+            for kind, start in offsets.items():
+                for page in range(pages_per_request):
+                    offset = start + page * sizes[kind]
+                    ops.append(
+                        BatchOp(
+                            key=f"{kind}:{offset}",
+                            field=_LIST_FIELD[kind],
+                            variables={"limit": ("Int", sizes[kind]), "offset": ("Int", offset)},
+                            selection="id name",
+                        )
+                    )
+            results = await self.batcher.query(ops, operation_name="PrefetchEntityNames")
+            self.stats.lookups += 1
+
+            for kind in list(offsets):
+                size = sizes[kind]
+                next_offset = offsets[kind]
+                done = False
+                for page in range(pages_per_request):
+                    r = results[f"{kind}:{offsets[kind] + page * size}"]
+                    if r.error is not None:
+                        raise r.error
+                    rows = r.data or []
+                    for row in rows:
+                        self.remember(kind, row.get("name") or "", row.get("id"))
+                    self.stats.prefetched += len(rows)
+                    if not rows:
+                        done = True
+                        break
+                    next_offset += len(rows)
+                    if len(rows) < size:
+                        # End of the list or a server-side cap: later pages may have skipped rows
+                        sizes[kind] = len(rows)
+                        break
+                if done:
+                    self._complete.add(kind)
+                    del offsets[kind]
+                else:
+                    offsets[kind] = next_offset
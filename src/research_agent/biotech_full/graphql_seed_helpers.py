@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from dataclasses import dataclass
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from glob import glob
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import pandas as pd
 
@@ -12,13 +27,13 @@ from graphql_client.client import Client
 from graphql_client.input_types import (
     MediaLinkInput,
     # business
-    BusinessCreateRelationsInput,
-    BusinessUpdateRelationFieldsInput,
+    BusinessUpsertRelationFieldsInput,
     BusinessExecutiveNestedInput,
     BusinessProductNestedInput,
     # product
     ProductCreateWithIdsInput,
     ProductUpdateWithIdsInput,
+    ProductUpsertRelationFieldsInput,
     # person
     PersonCreateInput,
     PersonUpdateInput,
@@ -33,6 +48,11 @@ from graphql_client.input_types import (
 )
 from graphql_client.enums import CaseStudySourceType
 
+from research_agent.biotech_full.case_study_index import CaseStudyIndex, scan_case_study_id
+from research_agent.biotech_full.graphql_batch import BatchItemResult, BatchOp, GraphQLBatcher
+from research_agent.biotech_full.graphql_id_resolver import EntityIdResolver, EntityKind
+from research_agent.common.http_transport import make_http_client
+
 
 # -----------------------------------------------------------------------------
 # Normalization utilities
@@ -154,68 +174,56 @@ async def get_compound_id_by_name(gql: Client, name: str) -> Optional[str]:
     node = getattr(r, "compound_by_name", None)
     return node.id if node else None
 
-async def filter_existing_product_names(gql: Client, product_names: List[str]) -> List[str]:
+async def filter_existing_product_names(
+    gql: Client,
+    product_names: List[str],
+    *,
+    resolver: Optional[EntityIdResolver] = None,
+) -> List[str]:
     """
     Filter product names to only include those that exist in the database.
-    Returns a list of product names that were found.
+    Returns a list of product names that were found (cached names skip the lookup,
+    the rest go out as one batched query).
     """
-    if not product_names:
-        return []
-    existing_names: List[str] = []
-    for name in product_names:
-        if not name or not name.strip():
-            continue
-        pid = await get_product_id_by_name(gql, name)
-        if pid:
-            existing_names.append(name)
-    return existing_names
+    resolver = resolver or EntityIdResolver(GraphQLBatcher(gql))
+    found = await resolver.resolve_many("product", product_names or [])
+    return [name for name, pid in found.items() if pid]
 
-async def filter_existing_compound_names(gql: Client, compound_names: List[str]) -> List[str]:
+async def filter_existing_compound_names(
+    gql: Client,
+    compound_names: List[str],
+    *,
+    resolver: Optional[EntityIdResolver] = None,
+) -> List[str]:
     """
     Filter compound names to only include those that exist in the database.
-    Returns a list of compound names that were found.
+    Returns a list of compound names that were found (cached names skip the lookup,
+    the rest go out as one batched query).
     """
-    if not compound_names:
-        return []
-    existing_names: List[str] = []
-    for name in compound_names:
-        if not name or not name.strip():
-            continue
-        cid = await get_compound_id_by_name(gql, name)
-        if cid:
-            existing_names.append(name)
-    return existing_names
+    resolver = resolver or EntityIdResolver(GraphQLBatcher(gql))
+    found = await resolver.resolve_many("compound", compound_names or [])
+    return [name for name, cid in found.items() if cid]
 
 async def get_episode_id_by_page_url(gql: Client, page_url: str) -> Optional[str]:
     r = await gql.episode_by_page_url(page_url=page_url)
     node = getattr(r, "episode_by_page_url", None)
     return node.id if node else None
 
-async def find_case_study_id_by_url_or_title(gql: Client, url: Optional[str], title: str) -> Optional[str]:
+async def find_case_study_id_by_url_or_title(
+    gql: Client,
+    url: Optional[str],
+    title: str,
+    *,
+    index: Optional[CaseStudyIndex] = None,
+) -> Optional[str]:
     """
-    Fallback until you add caseStudyByUrl/title:
-    paginate caseStudies and match.
+    Until there is a caseStudyByUrl/title query: match on normalized url/title in a
+    shared `index`, so the catalog is read once per run instead of once per lookup.
+    Without one, scan the pages and stop at the first match.
     """
-    t_title = norm(title)
-    t_url = (url or "").strip()
-
-    offset = 0
-    limit = 50
-    while True:
-        page = await gql.case_studies(limit=limit, offset=offset)
-        rows = getattr(page, "case_studies", [])
-        if not rows:
-            return None
-
-        for cs in rows:
-            if t_url and ((getattr(cs, "url", None) or "").strip() == t_url):
-                return cs.id
-            if norm(getattr(cs, "title", "") or "") == t_title:
-                return cs.id
-
-        if len(rows) < limit:
-            return None
-        offset += limit
+    if index is None:
+        return await scan_case_study_id(gql, url, title)
+    return await index.find(url, title)
 
 
 # -----------------------------------------------------------------------------
@@ -454,17 +462,119 @@ def aggregate_extracted_entities(extracted_entities: Dict[str, Any]) -> Tuple[
 # Upsert implementations
 # -----------------------------------------------------------------------------
 
+def person_create_input(p: AggPerson) -> PersonCreateInput:
+    return PersonCreateInput(
+        name=p.name,
+        role=p.role,
+        bio=p.bio,
+        media_links=to_media_links(p.media_links),
+    )
+
+
+def person_update_input(p: AggPerson, pid: str) -> PersonUpdateInput:
+    return PersonUpdateInput(
+        id=pid,
+        name=p.name,
+        role=p.role,
+        bio=p.bio,
+        media_links=to_media_links(p.media_links),
+    )
+
+
+def compound_create_input(c: AggCompound) -> CompoundCreateWithIdsInput:
+    return CompoundCreateWithIdsInput(
+        name=c.name,
+        description=c.description,
+        aliases=dedupe(c.aliases),
+        media_links=to_media_links(c.media_links),
+    )
+
+
+def compound_update_input(c: AggCompound, cid: str) -> CompoundUpdateWithIdsInput:
+    return CompoundUpdateWithIdsInput(
+        id=cid,
+        name=c.name,
+        description=c.description,
+        aliases=dedupe(c.aliases),
+        media_links=to_media_links(c.media_links),
+    )
+
+
+def _product_fields(pr: AggProduct) -> Dict[str, Any]:
+    # Only include fields that are not None/empty
+    # Schema accepts number | null | undefined for price, so None is handled by omission
+    fields: Dict[str, Any] = {"name": pr.name}
+    if pr.description:
+        fields["description"] = pr.description
+    pr_price = parse_price_to_float(pr.price)
+    if pr_price is not None:
+        fields["price"] = pr_price
+    if pr.ingredients:
+        fields["ingredients"] = dedupe(pr.ingredients)
+    if pr.media_links:
+        fields["media_links"] = to_media_links(pr.media_links)
+    # Clean source_url - only include if not None/empty
+    source_url_clean = clean_url(pr.source_url)
+    if source_url_clean:
+        fields["source_url"] = source_url_clean
+    compound_names = dedupe([c.name for c in pr.compounds])
+    if compound_names:
+        fields["compound_names"] = compound_names
+    return fields
+
+
+def product_create_input(pr: AggProduct, *, business_id: str) -> ProductCreateWithIdsInput:
+    return ProductCreateWithIdsInput(business_id=business_id, **_product_fields(pr))
+
+
+def product_update_input(pr: AggProduct, pid: str) -> ProductUpdateWithIdsInput:
+    return ProductUpdateWithIdsInput(id=pid, **_product_fields(pr))
+
+
+def product_upsert_input(pr: AggProduct, *, business_id: str) -> ProductUpsertRelationFieldsInput:
+    return ProductUpsertRelationFieldsInput(business_id=business_id, **_product_fields(pr))
+
+
+def _case_study_fields(
+    cs: AggCaseStudy,
+    *,
+    episode_page_urls: List[str],
+    product_names: List[str],
+    compound_names: List[str],
+) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        "title": cs.title,
+        "summary": cs.summary,
+        "source_type": map_case_study_source_type(cs.source_type),
+        "episode_page_urls": dedupe(episode_page_urls),
+    }
+    # Clean url - only include if not None/empty
+    url_clean = clean_url(cs.url)
+    if url_clean:
+        fields["url"] = url_clean
+    if product_names:
+        fields["product_names"] = product_names
+    if compound_names:
+        fields["compound_names"] = compound_names
+    return fields
+
+
+def case_study_create_input(
+    cs: AggCaseStudy, **relations: Any
+) -> CaseStudyCreateWithOptionalIdsInput:
+    return CaseStudyCreateWithOptionalIdsInput(**_case_study_fields(cs, **relations))
+
+
+def case_study_update_input(
+    cs: AggCaseStudy, csid: str, **relations: Any
+) -> CaseStudyUpdateWithOptionalIdsInput:
+    return CaseStudyUpdateWithOptionalIdsInput(id=csid, **_case_study_fields(cs, **relations))
+
+
 async def upsert_person(gql: Client, p: AggPerson) -> str:
     name = p.name
     try:
-        created = await gql.create_person(
-            input=PersonCreateInput(
-                name=name,
-                role=p.role,
-                bio=p.bio,
-                media_links=to_media_links(p.media_links),
-            )
-        )
+        created = await gql.create_person(input=person_create_input(p))
         return created.create_person.id
     except Exception as e:
         if not is_duplicate_error(e):
@@ -472,15 +582,7 @@ async def upsert_person(gql: Client, p: AggPerson) -> str:
         pid = await get_person_id_by_name(gql, name)
         if not pid:
             raise RuntimeError(f"Duplicate person '{name}' but personByName returned no id") from e
-        updated = await gql.update_person(
-            input=PersonUpdateInput(
-                id=pid,
-                name=name,
-                role=p.role,
-                bio=p.bio,
-                media_links=to_media_links(p.media_links),
-            )
-        )
+        updated = await gql.update_person(input=person_update_input(p, pid))
         node = getattr(updated, "update_person", None)
         return node.id if node else pid
 
@@ -488,14 +590,7 @@ async def upsert_person(gql: Client, p: AggPerson) -> str:
 async def upsert_compound(gql: Client, c: AggCompound) -> str:
     name = c.name
     try:
-        created = await gql.create_compound(
-            input=CompoundCreateWithIdsInput(
-                name=name,
-                description=c.description,
-                aliases=dedupe(c.aliases),
-                media_links=to_media_links(c.media_links),
-            )
-        )
+        created = await gql.create_compound(input=compound_create_input(c))
         return created.create_compound.id
     except Exception as e:
         if not is_duplicate_error(e):
@@ -503,19 +598,36 @@ async def upsert_compound(gql: Client, c: AggCompound) -> str:
         cid = await get_compound_id_by_name(gql, name)
         if not cid:
             raise RuntimeError(f"Duplicate compound '{name}' but compoundByName returned no id") from e
-        updated = await gql.update_compound(
-            input=CompoundUpdateWithIdsInput(
-                id=cid,
-                name=name,
-                description=c.description,
-                aliases=dedupe(c.aliases),
-                media_links=to_media_links(c.media_links),
-            )
-        )
+        updated = await gql.update_compound(input=compound_update_input(c, cid))
         node = getattr(updated, "update_compound", None)
         return node.id if node else cid
 
 
+def business_upsert_input(
+    b: AggBusiness,
+    *,
+    products_nested: List[BusinessProductNestedInput],
+    executives_nested: List[BusinessExecutiveNestedInput],
+) -> BusinessUpsertRelationFieldsInput:
+    # Only include fields that are not None/empty (schema expects undefined, not null)
+    upsert_dict: Dict[str, Any] = {
+        "name": b.name,
+    }
+    if b.description:
+        upsert_dict["description"] = b.description
+    # Clean website URL - only include if not None/empty
+    website_val = clean_url(b.website)
+    if website_val:
+        upsert_dict["website"] = website_val
+    if b.media_links:
+        upsert_dict["media_links"] = to_media_links(b.media_links)
+    if products_nested:
+        upsert_dict["products_nested"] = products_nested
+    if executives_nested:
+        upsert_dict["executives_nested"] = executives_nested
+    return BusinessUpsertRelationFieldsInput(**upsert_dict)
+
+
 async def upsert_business(
     gql: Client,
     b: AggBusiness,
@@ -526,94 +638,20 @@ async def upsert_business(
     """
     Uses productsNested to create products inline (instead of productNames which requires existing products).
     And ONLY executivesNested if you have role (per your rule).
-    """
-    name = b.name
-
-    # Always pass arrays, never None (empty arrays if no items)
-    execs_array = executives_nested if executives_nested else []
-    products_array = products_nested if products_nested else []
-
-    # First, try to find existing business by name
-    existing_bid = await get_business_id_by_name(gql, name)
-    if existing_bid:
-        # Business exists, update it
-        # Build update input - only include fields that are not None/empty
-        update_dict: Dict[str, Any] = {
-            "id": existing_bid,
-        }
-        if b.description:
-            update_dict["description"] = b.description
-        # Clean website URL - only include if not None/empty
-        website_val = clean_url(b.website)
-        if website_val:
-            update_dict["website"] = website_val
-        if b.media_links:
-            update_dict["media_links"] = to_media_links(b.media_links)
-        if products_array:
-            update_dict["products_nested"] = products_array
-        if execs_array:
-            update_dict["executives_nested"] = execs_array
-        
-        updated = await gql.update_business_relations(
-            input=BusinessUpdateRelationFieldsInput(**update_dict)
-        )
-        node = getattr(updated, "update_business_relations", None)
-        return node.id if node else existing_bid
 
-    # Business doesn't exist, try to create it
-    try:
-        # Build create input - only include fields that are not None/empty
-        create_dict: Dict[str, Any] = {
-            "name": name,
-        }
-        if b.description:
-            create_dict["description"] = b.description
-        # Clean website URL - only include if not None/empty
-        website_val = clean_url(b.website)
-        if website_val:
-            create_dict["website"] = website_val
-        if b.media_links:
-            create_dict["media_links"] = to_media_links(b.media_links)
-        if products_array:
-            create_dict["products_nested"] = products_array
-        if execs_array:
-            create_dict["executives_nested"] = execs_array
-        
-        created = await gql.create_business_with_relations(
-            input=BusinessCreateRelationsInput(**create_dict)
+    upsertBusinessWithRelations matches on name server-side, so no lookup/create/update dance.
+    """
+    upserted = await gql.upsert_business_with_relations(
+        input=business_upsert_input(
+            b,
+            products_nested=products_nested,
+            executives_nested=executives_nested,
         )
-        return created.create_business_with_relations.id
-    except Exception as e:
-        # If creation fails, check if it's a duplicate error and business now exists
-        if is_duplicate_error(e):
-            # Try to find it again (might have been created in a race condition)
-            bid = await get_business_id_by_name(gql, name)
-            if bid:
-                # Found it, update it
-                # Build update input - only include fields that are not None/empty
-                update_dict: Dict[str, Any] = {
-                    "id": bid,
-                }
-                if b.description:
-                    update_dict["description"] = b.description
-                # Clean website URL - only include if not None/empty
-                website_val = clean_url(b.website)
-                if website_val:
-                    update_dict["website"] = website_val
-                if b.media_links:
-                    update_dict["media_links"] = to_media_links(b.media_links)
-                if products_array:
-                    update_dict["products_nested"] = products_array
-                if execs_array:
-                    update_dict["executives_nested"] = execs_array
-                
-                updated = await gql.update_business_relations(
-                    input=BusinessUpdateRelationFieldsInput(**update_dict)
-                )
-                node = getattr(updated, "update_business_relations", None)
-                return node.id if node else bid
-        # If it's not a duplicate or we still can't find it, re-raise the original error
-        raise
+    )
+    node = getattr(upserted, "upsert_business_with_relations", None)
+    if not node:
+        raise RuntimeError(f"upsertBusinessWithRelations returned no business for '{b.name}'")
+    return node.id
 
 
 async def upsert_product(
@@ -626,35 +664,8 @@ async def upsert_product(
     Per your new rule: pass ONLY compoundNames (not compoundsNested).
     """
     name = pr.name
-    compound_names = dedupe([c.name for c in pr.compounds])
-    # Parse price (returns None if not provided or invalid)
-    # Schema accepts number | null | undefined, so None is handled correctly
-    pr_price = parse_price_to_float(pr.price)
-
     try:
-        # Build product input - only include fields that are not None/empty
-        product_create_dict: Dict[str, Any] = {
-            "name": name,
-            "business_id": business_id,
-        }
-        if pr.description:
-            product_create_dict["description"] = pr.description
-        if pr_price is not None:
-            product_create_dict["price"] = pr_price
-        if pr.ingredients:
-            product_create_dict["ingredients"] = dedupe(pr.ingredients)
-        if pr.media_links:
-            product_create_dict["media_links"] = to_media_links(pr.media_links)
-        # Clean source_url - only include if not None/empty
-        source_url_clean = clean_url(pr.source_url)
-        if source_url_clean:
-            product_create_dict["source_url"] = source_url_clean
-        if compound_names:
-            product_create_dict["compound_names"] = compound_names
-        
-        created = await gql.create_product(
-            input=ProductCreateWithIdsInput(**product_create_dict)
-        )
+        created = await gql.create_product(input=product_create_input(pr, business_id=business_id))
         return created.create_product.id
     except Exception as e:
         if not is_duplicate_error(e):
@@ -662,29 +673,7 @@ async def upsert_product(
         pid = await get_product_id_by_name(gql, name)
         if not pid:
             raise RuntimeError(f"Duplicate product '{name}' but productByName returned no id") from e
-        # Build product update input - only include fields that are not None/empty
-        product_update_dict: Dict[str, Any] = {
-            "id": pid,
-            "name": name,
-        }
-        if pr.description:
-            product_update_dict["description"] = pr.description
-        if pr_price is not None:
-            product_update_dict["price"] = pr_price
-        if pr.ingredients:
-            product_update_dict["ingredients"] = dedupe(pr.ingredients)
-        if pr.media_links:
-            product_update_dict["media_links"] = to_media_links(pr.media_links)
-        # Clean source_url - only include if not None/empty
-        source_url_clean = clean_url(pr.source_url)
-        if source_url_clean:
-            product_update_dict["source_url"] = source_url_clean
-        if compound_names:
-            product_update_dict["compound_names"] = compound_names
-        
-        updated = await gql.update_product(
-            input=ProductUpdateWithIdsInput(**product_update_dict)
-        )
+        updated = await gql.update_product(input=product_update_input(pr, pid))
         node = getattr(updated, "update_product", None)
         return node.id if node else pid
 
@@ -694,6 +683,7 @@ async def upsert_case_study(
     cs: AggCaseStudy,
     *,
     episode_page_url: str,
+    resolver: Optional[EntityIdResolver] = None,
 ) -> str:
     """
     Uses connect-by-name:
@@ -702,68 +692,43 @@ async def upsert_case_study(
       - episodePageUrls
     """
     title = cs.title
-    source_type = map_case_study_source_type(cs.source_type)
 
     # Filter product and compound names to only include those that exist
     # Skip missing ones instead of throwing errors
-    filtered_product_names = await filter_existing_product_names(
-        gql, 
-        dedupe(cs.related_product_names) if cs.related_product_names else []
-    )
-    filtered_compound_names = await filter_existing_compound_names(
-        gql,
-        dedupe(cs.related_compound_names) if cs.related_compound_names else []
-    )
+    relations: Dict[str, Any] = {
+        "episode_page_urls": [episode_page_url],
+        "product_names": await filter_existing_product_names(
+            gql,
+            dedupe(cs.related_product_names) if cs.related_product_names else [],
+            resolver=resolver,
+        ),
+        "compound_names": await filter_existing_compound_names(
+            gql,
+            dedupe(cs.related_compound_names) if cs.related_compound_names else [],
+            resolver=resolver,
+        ),
+    }
 
+    index = resolver.case_studies if resolver else None
     try:
-        # Build case study input - only include url if not None/empty
-        case_study_create_dict: Dict[str, Any] = {
-            "title": title,
-            "summary": cs.summary,
-            "source_type": source_type,
-            "episode_page_urls": [episode_page_url],
-        }
-        # Clean url - only include if not None/empty
-        url_clean = clean_url(cs.url)
-        if url_clean:
-            case_study_create_dict["url"] = url_clean
-        if filtered_product_names:
-            case_study_create_dict["product_names"] = filtered_product_names
-        if filtered_compound_names:
-            case_study_create_dict["compound_names"] = filtered_compound_names
-        
-        created = await gql.create_case_study(
-            input=CaseStudyCreateWithOptionalIdsInput(**case_study_create_dict)
-        )
-        return created.create_case_study.id
+        created = await gql.create_case_study(input=case_study_create_input(cs, **relations))
+        csid = created.create_case_study.id
     except Exception as e:
         if not is_duplicate_error(e):
             raise
-        existing_id = await find_case_study_id_by_url_or_title(gql, cs.url, title)
+        existing_id = await find_case_study_id_by_url_or_title(gql, cs.url, title, index=index)
         if not existing_id:
-            raise RuntimeError(f"Duplicate case study '{title}' but could not find via pagination") from e
-        # Build case study update input - only include url if not None/empty
-        case_study_update_dict: Dict[str, Any] = {
-            "id": existing_id,
-            "title": title,
-            "summary": cs.summary,
-            "source_type": source_type,
-            "episode_page_urls": [episode_page_url],
-        }
-        # Clean url - only include if not None/empty
-        url_clean = clean_url(cs.url)
-        if url_clean:
-            case_study_update_dict["url"] = url_clean
-        if filtered_product_names:
-            case_study_update_dict["product_names"] = filtered_product_names
-        if filtered_compound_names:
-            case_study_update_dict["compound_names"] = filtered_compound_names
-        
+            raise RuntimeError(
+                f"Duplicate case study '{title}' but could not find it in the case study index"
+            ) from e
         updated = await gql.update_case_study(
-            input=CaseStudyUpdateWithOptionalIdsInput(**case_study_update_dict)
+            input=case_study_update_input(cs, existing_id, **relations)
         )
         node = getattr(updated, "update_case_study", None)
-        return node.id if node else existing_id
+        csid = node.id if node else existing_id
+    if index is not None:
+        index.add(csid, url=cs.url, title=title)
+    return csid
 
 
 async def attach_episode_guests(gql: Client, *, episode_page_url: str, guest_person_ids: List[str]) -> None:
@@ -781,6 +746,275 @@ async def attach_episode_guests(gql: Client, *, episode_page_url: str, guest_per
     )
 
 
+# -----------------------------------------------------------------------------
+# Batched upserts (one aliased document per tier instead of one request per entity)
+# -----------------------------------------------------------------------------
+
+T = TypeVar("T")
+
+@dataclass
+class BatchUpsertResult:
+    ids: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    # Raw selection per key (e.g. a business with its inline-created products)
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+async def _mutate_settled(
+    batcher: GraphQLBatcher,
+    ops: List[BatchOp],
+    *,
+    operation_name: str,
+) -> Dict[str, BatchItemResult]:
+    """
+    Run mutations; ops whose outcome was lost to a sibling's failure are resent one
+    per document, so the sibling that nulled `data` can't take them down again.
+    A single-op document reports its own error, so nothing comes back lost twice.
+    """
+    results = await batcher.mutate(ops, operation_name=operation_name)
+    lost = [op for op in ops if results[op.key].lost]
+    if lost:
+        for single in await asyncio.gather(
+            *(batcher.mutate([op], operation_name=operation_name) for op in lost)
+        ):
+            results.update(single)
+    return results
+
+
+async def batch_upsert(
+    batcher: GraphQLBatcher,
+    items: Mapping[str, T],
+    *,
+    entity: str,
+    create: Callable[[T], BatchOp],
+    update: Callable[[T, str], BatchOp],
+    resolve: Callable[[Dict[str, T]], Awaitable[Mapping[str, Optional[str]]]],
+    existing: Optional[Mapping[str, str]] = None,
+    lookup: Optional[Callable[[Dict[str, T]], Awaitable[Mapping[str, Optional[str]]]]] = None,
+) -> BatchUpsertResult:
+    """
+    Batched version of the create -> (duplicate) -> lookup -> update pattern.
+
+    `create(item)` / `update(item, id)` build the ops (their `key` must be the item's
+    key), `resolve(items)` returns existing ids for the duplicates. Items whose id is
+    already in `existing`, or found by `lookup(items)` before creating, skip the create
+    attempt. Creates that failed as duplicates, or whose outcome is unknown, go through
+    `resolve` and are updated if they exist. Failures are reported per key in
+    `result.errors` instead of aborting the whole batch.
+    """
+    result = BatchUpsertResult()
+    if not items:
+        return result
+    existing = dict(existing or {})
+
+    to_create = {key: item for key, item in items.items() if key not in existing}
+    if lookup is not None and to_create:
+        # One duplicate nulls `data` for its whole document, so find existing rows up front
+        existing.update({k: v for k, v in (await lookup(to_create)).items() if v})
+        to_create = {key: item for key, item in to_create.items() if key not in existing}
+
+    created = await _mutate_settled(
+        batcher,
+        [create(item) for item in to_create.values()],
+        operation_name=f"BatchCreate{entity}",
+    )
+    unsettled: Dict[str, T] = {}
+    for key, item in to_create.items():
+        r = created[key]
+        if r.ok and r.id:
+            result.ids[key] = r.id
+        elif r.lost or (r.error is not None and is_duplicate_error(r.error)):
+            # Already exists, or the create may have applied: look it up before judging
+            unsettled[key] = item
+        else:
+            result.errors[key] = r.error or RuntimeError(f"create {entity} '{key}' returned no id")
+
+    if unsettled:
+        existing.update({k: v for k, v in (await resolve(unsettled)).items() if v})
+
+    update_ops: List[BatchOp] = []
+    for key, item in items.items():
+        if key in result.ids or key in result.errors:
+            continue
+        eid = existing.get(key)
+        if eid:
+            update_ops.append(update(item, eid))
+        elif created[key].lost:
+            result.errors[key] = RuntimeError(
+                f"create {entity} '{key}' was not applied and lookup returned no id"
+            )
+        else:
+            result.errors[key] = RuntimeError(
+                f"Duplicate {entity} '{key}' but lookup returned no id"
+            )
+
+    updated = await _mutate_settled(batcher, update_ops, operation_name=f"BatchUpdate{entity}")
+    for op in update_ops:
+        r = updated[op.key]
+        if r.ok:
+            result.ids[op.key] = r.id or existing[op.key]
+        else:
+            result.errors[op.key] = r.error or RuntimeError(
+                f"update {entity} '{op.key}' was not applied"
+            )
+    return result
+
+
+def _input_op(
+    key: str, field_name: str, gql_type: str, value: Any, selection: str = "id"
+) -> BatchOp:
+    return BatchOp(
+        key=key, field=field_name, variables={"input": (gql_type, value)}, selection=selection
+    )
+
+
+async def batch_upsert_people(
+    resolver: EntityIdResolver, people: Mapping[str, AggPerson]
+) -> BatchUpsertResult:
+    async def resolve(dupes: Dict[str, AggPerson]) -> Mapping[str, Optional[str]]:
+        return await resolver.resolve_many("person", dupes.keys(), refresh_missing=True)
+
+    async def lookup(new: Dict[str, AggPerson]) -> Mapping[str, Optional[str]]:
+        return await resolver.resolve_many("person", new.keys())
+
+    result = await batch_upsert(
+        resolver.batcher,
+        people,
+        entity="Person",
+        create=lambda p: _input_op(
+            p.name, "createPerson", "PersonCreateInput!", person_create_input(p)
+        ),
+        update=lambda p, pid: _input_op(
+            p.name, "updatePerson", "PersonUpdateInput!", person_update_input(p, pid)
+        ),
+        resolve=resolve,
+        existing=resolver.known("person", people.keys()),
+        lookup=lookup,
+    )
+    resolver.remember_many("person", result.ids)
+    return result
+
+
+async def batch_upsert_compounds(
+    resolver: EntityIdResolver, compounds: Mapping[str, AggCompound]
+) -> BatchUpsertResult:
+    async def resolve(dupes: Dict[str, AggCompound]) -> Mapping[str, Optional[str]]:
+        return await resolver.resolve_many("compound", dupes.keys(), refresh_missing=True)
+
+    async def lookup(new: Dict[str, AggCompound]) -> Mapping[str, Optional[str]]:
+        return await resolver.resolve_many("compound", new.keys())
+
+    result = await batch_upsert(
+        resolver.batcher,
+        compounds,
+        entity="Compound",
+        create=lambda c: _input_op(
+            c.name, "createCompound", "CompoundCreateWithIdsInput!", compound_create_input(c)
+        ),
+        update=lambda c, cid: _input_op(
+            c.name, "updateCompound", "CompoundUpdateWithIdsInput!", compound_update_input(c, cid)
+        ),
+        resolve=resolve,
+        existing=resolver.known("compound", compounds.keys()),
+        lookup=lookup,
+    )
+    resolver.remember_many("compound", result.ids)
+    return result
+
+
+async def batch_upsert_by_name(
+    resolver: EntityIdResolver,
+    inputs: Mapping[str, Any],
+    *,
+    kind: EntityKind,
+    field_name: str,
+    input_type: str,
+    selection: str = "id",
+) -> BatchUpsertResult:
+    """
+    For server-side upserts (upsertBusinessWithRelations / upsertProductWithRelations):
+    one pass, no fallback.
+    """
+    result = BatchUpsertResult()
+    if not inputs:
+        return result
+    ops = [
+        _input_op(key, field_name, input_type, value, selection)
+        for key, value in inputs.items()
+    ]
+    results = await _mutate_settled(
+        resolver.batcher,
+        ops,
+        operation_name=f"Batch{field_name[0].upper()}{field_name[1:]}",
+    )
+    for key in inputs:
+        r = results[key]
+        if r.ok and r.id:
+            result.ids[key] = r.id
+            result.data[key] = r.data
+        else:
+            result.errors[key] = r.error or RuntimeError(f"{field_name} '{key}' returned no id")
+    resolver.remember_many(kind, result.ids)
+    return result
+
+
+async def batch_upsert_case_studies(
+    index: CaseStudyIndex,
+    case_studies: Mapping[str, AggCaseStudy],
+    *,
+    episode_page_urls: Mapping[str, List[str]],
+    existing_product_names: Iterable[str],
+    existing_compound_names: Iterable[str],
+) -> BatchUpsertResult:
+    """`episode_page_urls` maps each case-study key to every episode that cites it."""
+    products_ok = {norm(n) for n in existing_product_names}
+    compounds_ok = {norm(n) for n in existing_compound_names}
+    relations: Dict[str, Dict[str, Any]] = {
+        key: {
+            "episode_page_urls": list(episode_page_urls.get(key, [])),
+            "product_names": [
+                n for n in dedupe(cs.related_product_names) if norm(n) in products_ok
+            ],
+            "compound_names": [
+                n for n in dedupe(cs.related_compound_names) if norm(n) in compounds_ok
+            ],
+        }
+        for key, cs in case_studies.items()
+    }
+    key_of = {id(cs): key for key, cs in case_studies.items()}
+
+    async def resolve(dupes: Dict[str, AggCaseStudy]) -> Mapping[str, Optional[str]]:
+        await index.ensure_loaded()
+        return {key: index.lookup(cs.url, cs.title) for key, cs in dupes.items()}
+
+    def create(cs: AggCaseStudy) -> BatchOp:
+        key = key_of[id(cs)]
+        return _input_op(
+            key, "createCaseStudy", "CaseStudyCreateWithOptionalIdsInput!",
+            case_study_create_input(cs, **relations[key]),
+        )
+
+    def update(cs: AggCaseStudy, csid: str) -> BatchOp:
+        key = key_of[id(cs)]
+        return _input_op(
+            key, "updateCaseStudy", "CaseStudyUpdateWithOptionalIdsInput!",
+            case_study_update_input(cs, csid, **relations[key]),
+        )
+
+    result = await batch_upsert(
+        index.batcher,
+        case_studies,
+        entity="CaseStudy",
+        create=create,
+        update=update,
+        resolve=resolve,
+        lookup=resolve,
+    )
+    for key, csid in result.ids.items():
+        index.add(csid, url=case_studies[key].url, title=case_studies[key].title)
+    return result
+
+
 # -----------------------------------------------------------------------------
 # Seed runner (reads JSON files + ingests)
 # -----------------------------------------------------------------------------
@@ -808,154 +1042,361 @@ def preview_seed_payload(payload: Dict[str, Any]) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
-async def ingest_seed_payload(gql: Client, payload: Dict[str, Any]) -> Dict[str, Any]:
-    episode_url = payload.get("episode_url") or ""
-    ee = payload.get("extracted_entities", {}) or {}
+def _linked_products_nested(
+    b: AggBusiness, products: Mapping[str, AggProduct]
+) -> List[BusinessProductNestedInput]:
+    # productsNested: all products whose business_name matches this business
+    linked: List[BusinessProductNestedInput] = []
+    for pr in products.values():
+        if pr.business_name and pr.business_name == b.name:
+            # Schema expects string | undefined, not null, so we omit None values;
+            # compoundNames is linked afterwards via updateProduct
+            fields = _product_fields(pr)
+            fields.pop("compound_names", None)
+            linked.append(BusinessProductNestedInput(**fields))
+    return linked
+
+
+def _executives_nested(
+    b: AggBusiness, people: Mapping[str, AggPerson]
+) -> List[BusinessExecutiveNestedInput]:
+    # executivesNested: people whose business_name matches + have role
+    return [
+        BusinessExecutiveNestedInput(
+            name=p.name,
+            role=p.role,
+            title=p.role,  # you can refine later
+            media_links=to_media_links(p.media_links),
+        )
+        for p in people.values()
+        if p.role and p.business_name == b.name
+    ]
 
-    businesses, people, products, compounds, case_studies = aggregate_extracted_entities(ee)
 
-    # 1) People
-    person_name_to_id: Dict[str, str] = {}
-    for p in people.values():
-        pid = await upsert_person(gql, p)
-        person_name_to_id[p.name] = pid
+@dataclass
+class TierTiming:
+    name: str
+    entities: int
+    seconds: float
+    round_trips: int
+
+
+@dataclass
+class SeedIngestionReport:
+    results: List[Dict[str, Any]]
+    tiers: List[TierTiming]
+    entities: int
+    seconds: float
+    failed: Dict[str, str]
+
+    @property
+    def entities_per_second(self) -> float:
+        return self.entities / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Seeded {len(self.results)} payload(s): {self.entities} entities"
+            f" in {self.seconds:.2f}s ({self.entities_per_second:.1f} entities/sec),"
+            f" {len(self.failed)} failed"
+        ]
+        for t in self.tiers:
+            lines.append(
+                f"  {t.name:<16} {t.entities:>5} entities  {t.seconds * 1000:>8.1f} ms"
+                f"  {t.round_trips:>4} round trips"
+            )
+        return "\n".join(lines)
+
+
+@dataclass
+class _PayloadPlan:
+    episode_url: str
+    businesses: Dict[str, AggBusiness]
+    people: Dict[str, AggPerson]
+    products: Dict[str, AggProduct]
+    compounds: Dict[str, AggCompound]
+    case_studies: Dict[str, AggCaseStudy]
 
-    # 2) Compounds (ensure exist for compoundNames resolution)
-    for c in compounds.values():
-        await upsert_compound(gql, c)
+
+def _merged_extracted_entities(payloads: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Concatenate every payload's entity lists; aggregate_extracted_entities then
+    merges by name.
+    """
+    merged: Dict[str, List[Any]] = {
+        "businesses": [],
+        "people": [],
+        "products": [],
+        "case_studies": [],
+    }
+    for payload in payloads:
+        ee = payload.get("extracted_entities", {}) or {}
+        for kind, items in merged.items():
+            items.extend(ee.get(kind, []) or [])
+    return merged
+
+
+async def ingest_seed_payloads(
+    gql: Client,
+    payloads: Sequence[Dict[str, Any]],
+    *,
+    resolver: Optional[EntityIdResolver] = None,
+) -> SeedIngestionReport:
+    """
+    Ingest many seed payloads at once, dependency tier by dependency tier:
+
+        people + compounds -> businesses (+ inline products) -> products
+        -> case studies -> episode guests
+
+    Entities shared by several files are merged before anything is sent, so each is
+    written once. Within a tier every entity is independent, so the tier's aliased
+    documents run concurrently (bounded by the batcher's max_in_flight).
+
+    Per-entity failures don't abort the run; they are reported in each payload's
+    "failed" as {"<tier>:<name>": "<error>"}.
+    """
+    resolver = resolver or EntityIdResolver(GraphQLBatcher(gql, ordered_mutations=False))
+    batcher = resolver.batcher
+    run_start = time.perf_counter()
+    tiers: List[TierTiming] = []
+    failed: Dict[str, str] = {}
+
+    @asynccontextmanager
+    async def tier(name: str, entities: int):
+        start, trips = time.perf_counter(), batcher.stats.round_trips
+        yield
+        tiers.append(
+            TierTiming(
+                name, entities, time.perf_counter() - start, batcher.stats.round_trips - trips
+            )
+        )
+
+    def record_failures(tier_name: str, result: BatchUpsertResult) -> None:
+        for key, err in result.errors.items():
+            failed[f"{tier_name}:{key}"] = str(err)
+
+    plans: List[_PayloadPlan] = []
+    for payload in payloads:
+        b, pe, pr, c, cs = aggregate_extracted_entities(payload.get("extracted_entities", {}) or {})
+        plans.append(_PayloadPlan(payload.get("episode_url") or "", b, pe, pr, c, cs))
+    businesses, people, products, compounds, case_studies = aggregate_extracted_entities(
+        _merged_extracted_entities(payloads)
+    )
+    # Same key as aggregate_extracted_entities (url, else title) -> every episode citing it
+    case_study_episodes: Dict[str, List[str]] = {}
+    for plan in plans:
+        for key in plan.case_studies:
+            case_study_episodes.setdefault(key, []).append(plan.episode_url)
+
+    # 1) People + 2) Compounds (independent; compounds must exist for compoundNames resolution)
+    async with tier("people+compounds", len(people) + len(compounds)):
+        people_result, compounds_result = await asyncio.gather(
+            batch_upsert_people(resolver, people),
+            batch_upsert_compounds(resolver, compounds),
+        )
+    record_failures("person", people_result)
+    record_failures("compound", compounds_result)
+    person_name_to_id: Dict[str, str] = dict(people_result.ids)
 
     # 3) Businesses (create products inline using productsNested; connect executivesNested only if role)
-    business_name_to_id: Dict[str, str] = {}
-    product_name_to_id: Dict[str, str] = {}
+    async with tier("businesses", len(businesses)):
+        business_result = await batch_upsert_by_name(
+            resolver,
+            {
+                b.name: business_upsert_input(
+                    b,
+                    products_nested=_linked_products_nested(b, products),
+                    executives_nested=_executives_nested(b, people),
+                )
+                for b in businesses.values()
+            },
+            kind="business",
+            field_name="upsertBusinessWithRelations",
+            input_type="BusinessUpsertRelationFieldsInput!",
+            selection="id products { id name }",
+        )
+    record_failures("business", business_result)
+    business_name_to_id: Dict[str, str] = dict(business_result.ids)
+    for business in business_result.data.values():
+        for linked in business.get("products") or []:
+            resolver.remember("product", linked.get("name") or "", linked.get("id"))
+
+    # 4) Products: inline ones come back on the business selection (anything the
+    # resolver still doesn't know is looked up in one query) and get their compounds
+    # linked in one batch (price is already set via productsNested); the rest are
+    # upserted separately
     skipped_products: List[str] = []
-    
-    for b in businesses.values():
-        # productsNested: all products whose business_name matches this business
-        linked_products_nested: List[BusinessProductNestedInput] = []
-        for pr in products.values():
-            if pr.business_name and pr.business_name == b.name:
-                # Parse price if available (can be None if not provided or invalid)
-                pr_price = parse_price_to_float(pr.price)
-                
-                # Build product input - only include fields that are not None/empty
-                # Schema expects string | undefined, not null, so we omit None values
-                product_input_dict: Dict[str, Any] = {
-                    "name": pr.name,
-                }
-                if pr.description:
-                    product_input_dict["description"] = pr.description
-                if pr.ingredients:
-                    product_input_dict["ingredients"] = dedupe(pr.ingredients)
-                if pr.media_links:
-                    product_input_dict["media_links"] = to_media_links(pr.media_links)
-                # Clean source_url - only include if not None/empty
-                source_url_clean = clean_url(pr.source_url)
-                if source_url_clean:
-                    product_input_dict["source_url"] = source_url_clean
-                # Only add price field if it's not None
-                if pr_price is not None:
-                    product_input_dict["price"] = pr_price
-                
-                linked_products_nested.append(
-                    BusinessProductNestedInput(**product_input_dict)
+    async with tier("products", len(products)):
+        inline_products = [
+            pr for pr in products.values()
+            if pr.business_name and pr.business_name in business_name_to_id
+        ]
+        product_name_to_id: Dict[str, str] = {
+            name: pid
+            for name, pid in (
+                await resolver.resolve_many(
+                    "product", [pr.name for pr in inline_products], refresh_missing=True
                 )
+            ).items()
+            if pid
+        }
+        compound_link_ops = [
+            _input_op(
+                pr.name, "updateProduct", "ProductUpdateWithIdsInput!",
+                ProductUpdateWithIdsInput(
+                    id=product_name_to_id[pr.name],
+                    compound_names=dedupe([c.name for c in pr.compounds]),
+                ),
+            )
+            for pr in inline_products
+            if pr.name in product_name_to_id and pr.compounds
+        ]
+        # Compound linking is best-effort, as before
+        await _mutate_settled(
+            batcher, compound_link_ops, operation_name="BatchLinkProductCompounds"
+        )
 
-        # executivesNested: people whose business_name matches + have role
-        execs: List[BusinessExecutiveNestedInput] = []
-        for p in people.values():
-            if p.role and p.business_name == b.name:
-                execs.append(
-                    BusinessExecutiveNestedInput(
-                        name=p.name,
-                        role=p.role,
-                        title=p.role,  # you can refine later
-                        media_links=to_media_links(p.media_links),
-                    )
-                )
+        remaining_products: List[AggProduct] = []
+        for pr in products.values():
+            if not pr.business_name:
+                skipped_products.append(pr.name)
+            elif pr.name not in product_name_to_id:
+                remaining_products.append(pr)
+
+        # fallback: query missing businesses by name
+        business_ids = dict(business_name_to_id)
+        missing_businesses = [
+            pr.business_name
+            for pr in remaining_products
+            if pr.business_name not in business_ids
+        ]
+        for name, bid in (await resolver.resolve_many("business", missing_businesses)).items():
+            if bid:
+                business_ids[name] = bid
 
-        bid = await upsert_business(
-            gql,
-            b,
-            products_nested=linked_products_nested if linked_products_nested else [],
-            executives_nested=execs,
+        product_inputs: Dict[str, ProductUpsertRelationFieldsInput] = {}
+        for pr in remaining_products:
+            business_id = business_ids.get(pr.business_name or "")
+            if not business_id:
+                skipped_products.append(pr.name)
+                continue
+            product_inputs[pr.name] = product_upsert_input(pr, business_id=business_id)
+        product_result = await batch_upsert_by_name(
+            resolver,
+            product_inputs,
+            kind="product",
+            field_name="upsertProductWithRelations",
+            input_type="ProductUpsertRelationFieldsInput!",
         )
-        business_name_to_id[b.name] = bid
-        
-        # Track product names that were created inline and link their compounds
-        for pr in products.values():
-            if pr.business_name and pr.business_name == b.name:
-                # Products are created inline, so we need to query them to get their IDs
-                # This is a bit inefficient but necessary since productsNested doesn't return IDs
-                try:
-                    product_result = await gql.product_by_name(name=pr.name)
-                    if hasattr(product_result, "product_by_name") and product_result.product_by_name:
-                        product_id = product_result.product_by_name.id
-                        product_name_to_id[pr.name] = product_id
-                        
-                        # Update product with compounds (price is now set via productsNested)
-                        compound_names = dedupe([c.name for c in pr.compounds]) if pr.compounds else []
-                        
-                        # Only update if we have compounds to set (price is already set in nested input)
-                        if compound_names:
-                            try:
-                                await gql.update_product(
-                                    input=ProductUpdateWithIdsInput(
-                                        id=product_id,
-                                        compound_names=compound_names or [],
-                                    )
-                                )
-                            except Exception:
-                                # Update failed, but continue
-                                pass
-                except Exception:
-                    # Product might not exist yet or query failed, skip for now
-                    pass
-
-    # 4) Products that weren't linked to any business (create separately)
-    for pr in products.values():
-        if not pr.business_name:
-            skipped_products.append(pr.name)
-            continue
-        
-        # Skip if already created inline
-        if pr.name in product_name_to_id:
-            continue
+    record_failures("product", product_result)
+    product_name_to_id.update(product_result.ids)
 
-        business_id = business_name_to_id.get(pr.business_name)
-        if not business_id:
-            # fallback: query by name
-            business_id = await get_business_id_by_name(gql, pr.business_name)
+    # 5) Case studies (connect only products/compounds that exist)
+    async with tier("case_studies", len(case_studies)):
+        related_products = dedupe(
+            n for cs in case_studies.values() for n in cs.related_product_names
+        )
+        related_compounds = dedupe(
+            n for cs in case_studies.values() for n in cs.related_compound_names
+        )
+        existing_products, existing_compounds = await asyncio.gather(
+            resolver.resolve_many("product", related_products),
+            resolver.resolve_many("compound", related_compounds),
+        )
+        case_study_result = await batch_upsert_case_studies(
+            resolver.case_studies,
+            case_studies,
+            episode_page_urls=case_study_episodes,
+            existing_product_names=[n for n, pid in existing_products.items() if pid],
+            existing_compound_names=[n for n, cid in existing_compounds.items() if cid],
+        )
+    record_failures("case_study", case_study_result)
 
-        if not business_id:
-            skipped_products.append(pr.name)
+    # 6) Attach guests to episodes (one lookup query + one mutation document)
+    guests_by_episode: Dict[str, List[str]] = {}
+    for plan in plans:
+        if not plan.episode_url:
             continue
+        guest_ids = guests_by_episode.setdefault(plan.episode_url, [])
+        guest_ids.extend(
+            person_name_to_id[p.name] for p in plan.people.values()
+            if p.is_guest and p.name in person_name_to_id
+        )
+    guests_by_episode = {url: dedupe(ids) for url, ids in guests_by_episode.items() if ids}
+    async with tier("episodes", len(guests_by_episode)):
+        episodes = await batcher.query(
+            [
+                BatchOp(
+                    key=url, field="episodeByPageUrl", variables={"pageUrl": ("String!", url)}
+                )
+                for url in guests_by_episode
+            ],
+            operation_name="BatchEpisodeByPageUrl",
+        )
+        episode_ops = [
+            _input_op(
+                url, "updateEpisodeRelations", "EpisodeUpdateRelationFieldsInput!",
+                EpisodeUpdateRelationFieldsInput(id=episodes[url].id, guest_ids=guest_ids),
+            )
+            for url, guest_ids in guests_by_episode.items()
+            if episodes[url].id
+        ]
+        episode_results = await _mutate_settled(
+            batcher, episode_ops, operation_name="BatchUpdateEpisodeRelations"
+        )
+    for url, r in episode_results.items():
+        if not r.ok:
+            failed[f"episode:{url}"] = str(r.error or "update not applied")
+
+    # Per-payload view of the shared results
+    skipped = set(skipped_products)
+    results: List[Dict[str, Any]] = []
+    for plan in plans:
+        names = (
+            {f"person:{n}" for n in plan.people}
+            | {f"compound:{n}" for n in plan.compounds}
+            | {f"business:{n}" for n in plan.businesses}
+            | {f"product:{n}" for n in plan.products}
+            | {f"case_study:{k}" for k in plan.case_studies}
+            | {f"episode:{plan.episode_url}"}
+        )
+        results.append({
+            "episode_url": plan.episode_url,
+            "businesses": [n for n in plan.businesses if n in business_name_to_id],
+            "people": [n for n in plan.people if n in person_name_to_id],
+            "products": [n for n in plan.products if n in product_name_to_id],
+            "skipped_products_no_business": [n for n in plan.products if n in skipped],
+            "case_studies": [
+                cs.title for k, cs in plan.case_studies.items() if k in case_study_result.ids
+            ],
+            "failed": {k: v for k, v in failed.items() if k in names},
+        })
+
+    total = len(people) + len(compounds) + len(businesses) + len(products) + len(case_studies)
+    return SeedIngestionReport(
+        results=results,
+        tiers=tiers,
+        entities=total,
+        seconds=time.perf_counter() - run_start,
+        failed=failed,
+    )
 
-        pid = await upsert_product(gql, pr, business_id=business_id)
-        product_name_to_id[pr.name] = pid
-
-    # 5) Case studies
-    case_study_ids: List[str] = []
-    for cs in case_studies.values():
-        csid = await upsert_case_study(gql, cs, episode_page_url=episode_url)
-        case_study_ids.append(csid)
-
-    # 6) Attach guests to episode
-    guest_ids: List[str] = []
-    for p in people.values():
-        if p.is_guest:
-            pid = person_name_to_id.get(p.name)
-            if pid:
-                guest_ids.append(pid)
-    await attach_episode_guests(gql, episode_page_url=episode_url, guest_person_ids=guest_ids)
-
-    return {
-        "episode_url": episode_url,
-        "businesses": list(business_name_to_id.keys()),
-        "people": list(person_name_to_id.keys()),
-        "products": list(product_name_to_id.keys()),
-        "skipped_products_no_business": skipped_products,
-        "case_studies": [cs.title for cs in case_studies.values()],
-    }
+
+async def ingest_seed_payload(
+    gql: Client,
+    payload: Dict[str, Any],
+    *,
+    resolver: Optional[EntityIdResolver] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest one seed payload (see `ingest_seed_payloads`).
+
+    Pass one `resolver` for a whole run so name -> id lookups are shared across
+    payloads.
+    """
+    report = await ingest_seed_payloads(gql, [payload], resolver=resolver)
+    result = dict(report.results[0])
+    result["graphql_round_trips"] = sum(t.round_trips for t in report.tiers)
+    return result
 
 
 async def load_one_seed_file(gql: Client, seed_file: str) -> Dict[str, Any]:
@@ -1001,11 +1442,16 @@ async def seed_from_directory(gql: Client, seed_dir: str) -> pd.DataFrame:
     preview_df = pd.concat([preview_seed_payload(p) for p in payloads], ignore_index=True)
     print(preview_df.head(10))
 
-    results: List[Dict[str, Any]] = []
-    for p in payloads:
-        results.append(await ingest_seed_payload(gql, p))
+    # One run over every file: shared entities are merged and each tier is sent
+    # concurrently; the resolver loads the catalog's names once up front
+    resolver = EntityIdResolver(GraphQLBatcher(gql, ordered_mutations=False))
+    await resolver.prefetch()
+    report = await ingest_seed_payloads(gql, payloads, resolver=resolver)
+    print(report.summary())
+    print(f"GraphQL batching: {resolver.batcher.stats.as_dict()}")
+    print(f"Name resolver: {resolver.stats.as_dict()}")
 
-    return pd.DataFrame(results)
+    return pd.DataFrame(report.results)
 
 
 # -----------------------------------------------------------------------------
@@ -1018,7 +1464,9 @@ def make_client_from_env() -> Client:
     if graphql_url.startswith("localhost"):
         graphql_url = "http://" + graphql_url
 
+    headers = {"Authorization": f"Bearer {graphql_auth_token}"}
     return Client(
         url=graphql_url,
-        headers={"Authorization": f"Bearer {graphql_auth_token}"},
+        headers=headers,
+        http_client=make_http_client(headers),
     )
@@ -0,0 +1,166 @@
+"""
+incremental_embeddings.py
+
+Skip re-embedding chunks that are already stored unchanged in Qdrant.
+
+Every chunk carries `content_hash` (sha256 of its text) in its metadata. Before
+embedding, the writer retrieves the chunk's deterministic point ids (payload only,
+no vectors) and drops every chunk whose stored hash matches; if only the metadata
+changed, the payload is rewritten in place without an embedding call. Trailing
+chunks left over from a longer previous version of the same parent are deleted.
+Chunks that do need embedding are queued across episodes and sent in batches of
+up to EMBEDDING_MAX_BATCH_SIZE texts (one embedding request per batch).
+
+Usage:
+    writer = IncrementalEmbeddingWriter(qdrant_vector_store)
+    try:
+        for ep in episodes:
+            await writer.add(docs, ids, parent_ref=parent_ref)
+    finally:
+        await writer.flush()
+    print(writer.stats.as_dict())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import models
+
+# OpenAI accepts up to 2048 inputs per embeddings request
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "512"))
+
+CONTENT_HASH_KEY = "content_hash"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingWriteStats:
+    chunks: int = 0
+    embedded: int = 0
+    unchanged: int = 0
+    payload_updated: int = 0
+    stale_deleted_parents: int = 0
+    embedding_calls: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "embedded": self.embedded,
+            "unchanged": self.unchanged,
+            "payload_updated": self.payload_updated,
+            "stale_deleted_parents": self.stale_deleted_parents,
+            "embedding_calls": self.embedding_calls,
+        }
+
+
+class IncrementalEmbeddingWriter:
+    def __init__(
+        self,
+        vector_store: QdrantVectorStore,
+        *,
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+    ) -> None:
+        self.vector_store = vector_store
+        self.max_batch_size = max(1, max_batch_size)
+        self.stats = EmbeddingWriteStats()
+        self._pending_docs: List[Document] = []
+        self._pending_ids: List[str] = []
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def _metadata_key(self) -> str:
+        return self.vector_store.metadata_payload_key
+
+    async def _stored_payloads(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        points = await asyncio.to_thread(
+            self.vector_store.client.retrieve,
+            collection_name=self.vector_store.collection_name,
+            ids=list(ids),
+            with_payload=True,
+            with_vectors=False,
+        )
+        return {str(p.id): p.payload or {} for p in points}
+
+    async def _delete_stale(self, parent_ref: str, chunk_count: int) -> None:
+        """Delete this parent's chunks at index >= chunk_count (the summary got shorter)."""
+        await asyncio.to_thread(
+            self.vector_store.client.delete,
+            collection_name=self.vector_store.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key=f"{self._metadata_key}.parent_ref",
+                            match=models.MatchValue(value=parent_ref),
+                        ),
+                        models.FieldCondition(
+                            key=f"{self._metadata_key}.chunk_index",
+                            range=models.Range(gte=chunk_count),
+                        ),
+                    ]
+                )
+            ),
+        )
+        self.stats.stale_deleted_parents += 1
+
+    async def add(self, docs: Sequence[Document], ids: Sequence[str], *, parent_ref: Optional[str] = None) -> List[Document]:
+        """
+        Queue the chunks of one parent (ids are deterministic per chunk index).
+
+        Returns the documents with `content_hash` added to their metadata. With
+        `parent_ref`, stored chunks of that parent beyond len(docs) are deleted.
+        """
+        hashed = [
+            Document(page_content=d.page_content, metadata={**d.metadata, CONTENT_HASH_KEY: content_hash(d.page_content)})
+            for d in docs
+        ]
+        self.stats.chunks += len(hashed)
+
+        if parent_ref is not None:
+            await self._delete_stale(parent_ref, len(hashed))
+
+        stored = await self._stored_payloads(ids) if ids else {}
+        for point_id, doc in zip(ids, hashed, strict=True):
+            payload = stored.get(point_id)
+            stored_meta = (payload or {}).get(self._metadata_key) or {}
+            if payload is None or stored_meta.get(CONTENT_HASH_KEY) != doc.metadata[CONTENT_HASH_KEY]:
+                self._pending_docs.append(doc)
+                self._pending_ids.append(point_id)
+                continue
+            self.stats.unchanged += 1
+            if stored_meta != doc.metadata:
+                await asyncio.to_thread(
+                    self.vector_store.client.set_payload,
+                    collection_name=self.vector_store.collection_name,
+                    payload={self._metadata_key: doc.metadata},
+                    points=[point_id],
+                )
+                self.stats.payload_updated += 1
+
+        if len(self._pending_docs) >= self.max_batch_size:
+            await self.flush(full_batches_only=True)
+        return hashed
+
+    async def flush(self, *, full_batches_only: bool = False) -> None:
+        """Embed + upsert queued chunks, `max_batch_size` texts per embedding request."""
+        async with self._flush_lock:
+            while self._pending_docs:
+                if full_batches_only and len(self._pending_docs) < self.max_batch_size:
+                    return
+                docs = self._pending_docs[:self.max_batch_size]
+                ids = self._pending_ids[:self.max_batch_size]
+                await self.vector_store.aadd_documents(documents=docs, ids=ids, batch_size=self.max_batch_size)
+                del self._pending_docs[:len(docs)]
+                del self._pending_ids[:len(ids)]
+                self.stats.embedded += len(docs)
+                self.stats.embedding_calls += 1
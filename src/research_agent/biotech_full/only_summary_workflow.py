@@ -13,14 +13,21 @@ from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from uuid import uuid4
 from typing import List
-from research_agent.retrieval.async_mongo_client import get_episodes_by_urls
-from research_agent.retrieval.async_s3_client import get_transcript_text_from_s3_url
+from research_agent.retrieval.async_mongo_client import (
+    EPISODE_SUMMARY_INPUT_PROJECTION,
+    EpisodeUpdateBuffer,
+    get_episodes_by_urls,
+    get_summarized_episode_ids,
+)
+from research_agent.common.staged_pipeline import PipelineReport, run_pipeline, summary_stages
+from research_agent.retrieval.async_s3_client import get_transcript_text_from_s3_url, close_shared_s3_client
 from pathlib import Path
 import aiofiles 
 from uuid import uuid4, uuid5, NAMESPACE_URL
 
 
 
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 from pymongo import AsyncMongoClient
 from bson.objectid import ObjectId
@@ -45,6 +52,8 @@ MONGO_DB_NAME = os.getenv("HU_DB_NAME")
 VECTOR_SIZE = 1536
 DISTANCE = models.Distance.COSINE
 
+SUMMARY_UPDATE_FLUSH_EVERY = int(os.getenv("SUMMARY_UPDATE_FLUSH_EVERY", "5"))
+
 
 
 def create_mongo_client() -> AsyncMongoClient:
@@ -493,54 +502,130 @@ async def create_final_client_summary_text(initial_summary: str, guest_overview:
 
 
 
-async def run_summarization_and_storage(episode_urls: list[str]):
-    episodes = await get_episodes_by_urls(episode_urls)
+@dataclass
+class EpisodeJob:
+    episode_url: str
+    s3_url: str
+    mongo_episode_id: Any
+    webpage_summary: str
+    transcript_text: str = ""
+    summary_output: Optional[TranscriptSummaryOutput] = None
+    final_summary_text: str = ""
+
+
+async def run_summarization_and_storage(episode_urls: list[str], force: bool = False) -> PipelineReport:
+    """
+    Summarize episodes as a staged pipeline:
 
+        fetch (S3) -> summarize (LLM) -> save initial outputs -> final summary (LLM)
+        -> Mongo update (buffered bulk writes)
+
+    Each stage has its own worker count and bounded queue, so transcript downloads
+    and writes overlap with the LLM stages. Episodes that already have a
+    summaryDetailed are skipped unless `force`.
+    """
+    episodes = await get_episodes_by_urls(episode_urls, projection=EPISODE_SUMMARY_INPUT_PROJECTION)
+    summarized_ids = set() if force else await get_summarized_episode_ids(episode_urls)
+    # summaryDetailed writes go out in bulk every few episodes (and on the way out)
+    summary_updates = EpisodeUpdateBuffer(flush_every=SUMMARY_UPDATE_FLUSH_EVERY)
+
+    jobs: List[EpisodeJob] = []
     for ep in episodes:
         episode_url = ep.get("episodePageUrl") or ""
         s3_url = ep.get("s3TranscriptUrl") or ""
-        mongo_episode_id = ep.get("_id") or ""
-        webpage_summary = ep.get("webPageSummary") or ""  # optional; may not exist
 
         # Only skip if transcript is missing
         if not s3_url:
             print(f"Skipping {episode_url or '[unknown episode url]'}: missing s3TranscriptUrl")
             continue
+        if ep.get("_id") in summarized_ids:
+            print(f"Skipping {episode_url}: summaryDetailed already exists")
+            continue
 
         # episode_url is still useful for metadata/logging; but do NOT skip the run
         if not episode_url:
             print("Warning: missing episodePageUrl on record (continuing anyway)")
 
-        transcript_text = await get_transcript_text_from_s3_url(s3_url)
+        jobs.append(
+            EpisodeJob(
+                episode_url=episode_url,
+                s3_url=s3_url,
+                mongo_episode_id=ep.get("_id"),
+                webpage_summary=ep.get("webPageSummary") or "",  # optional; may not exist
+            )
+        )
 
-        summary_output = await summarize_transcript(
-            transcript_text=transcript_text,
-            webpage_summary=webpage_summary,
+    async def fetch(job: EpisodeJob) -> EpisodeJob:
+        job.transcript_text = await get_transcript_text_from_s3_url(job.s3_url)
+        return job
+
+    async def summarize(job: EpisodeJob) -> EpisodeJob:
+        job.summary_output = await summarize_transcript(
+            transcript_text=job.transcript_text,
+            webpage_summary=job.webpage_summary,
         )
+        job.transcript_text = ""
+        return job
 
+    async def save_initial(job: EpisodeJob) -> EpisodeJob:
         await save_initial_outputs_to_filesystem(
-            episode_url=episode_url,
-            mongo_episode_id=str(mongo_episode_id) if mongo_episode_id is not None else None,
-            initial_summary=summary_output.initial_summary,
-            guest_overview=summary_output.guest_overview,
+            episode_url=job.episode_url,
+            mongo_episode_id=str(job.mongo_episode_id) if job.mongo_episode_id is not None else None,
+            initial_summary=job.summary_output.initial_summary,
+            guest_overview=job.summary_output.guest_overview,
         )
+        return job
 
-        final_summary_text = await create_final_client_summary(
-            initial_summary=summary_output.initial_summary,
-            guest_overview=summary_output.guest_overview,
+    async def final_summary(job: EpisodeJob) -> EpisodeJob:
+        job.final_summary_text = await create_final_client_summary(
+            initial_summary=job.summary_output.initial_summary,
+            guest_overview=job.summary_output.guest_overview,
         )
-
-        if mongo_episode_id is not None:
-            await update_episode_summary_detailed(
-                mongo_episode_id=str(mongo_episode_id),
-                summary_detailed=final_summary_text,
-            )
+        return job
+
+    # Episodes whose summaryDetailed is buffered but not yet written to Mongo
+    unflushed: List[str] = []
+
+    def report_flushed() -> None:
+        for url in unflushed:
+            print(f"Done: {url}")
+        unflushed.clear()
+
+    async def mongo_update(job: EpisodeJob) -> EpisodeJob:
+        if job.mongo_episode_id is not None:
+            unflushed.append(job.episode_url)
+            await summary_updates.set(job.mongo_episode_id, {"summaryDetailed": job.final_summary_text})
+            if not len(summary_updates):
+                report_flushed()
         else:
-            print(f"Warning: no mongo episode id for {episode_url}, skipping Mongo update")
-
-       
+            print(f"Warning: no mongo episode id for {job.episode_url}, skipping Mongo update")
+            print(f"Done: {job.episode_url}")
+        return job
 
-        print(f"Done: {episode_url}")
+    try:
+        report = await run_pipeline(
+            jobs,
+            summary_stages(
+                fetch=fetch,
+                summarize=summarize,
+                save_initial=save_initial,
+                final_summary=final_summary,
+                mongo_update=mongo_update,
+                # A single writer, so buffered sets and their flushes never interleave
+                mongo_workers=1,
+            ),
+            key=lambda job: job.episode_url or str(job.mongo_episode_id),
+        )
+    finally:
+        try:
+            await summary_updates.flush()
+            report_flushed()
+        finally:
+            await close_shared_s3_client()
+            print(f"📚 summaryDetailed bulk updates: {summary_updates.stats.as_dict()}")
+
+    print(report.summary())
+    return report
 
 
 episode_urls: list[str] = [
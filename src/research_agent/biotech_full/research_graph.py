@@ -2,10 +2,11 @@ import os
 import sys
 import asyncio
 import json
+import time
 from uuid import uuid4
 from pathlib import Path
 from typing import (Optional, Union, Tuple, List, Dict, Any, TypedDict, 
- Iterable, Literal, Mapping, AsyncIterator, cast) 
+ Iterable, Literal, Mapping, AsyncIterator, Awaitable, cast) 
 from contextlib import asynccontextmanager    
 import operator 
 from typing_extensions import Annotated 
@@ -14,10 +15,11 @@ from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from langchain.agents import create_agent
 from langchain_openai import ChatOpenAI 
 from langgraph.store.postgres.aio import AsyncPostgresStore  
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver 
+from psycopg.rows import dict_row 
+from psycopg_pool import AsyncConnectionPool 
 from langchain_core.prompts import PromptTemplate
 from langgraph.graph import StateGraph, START, END 
 from langgraph.graph.state import CompiledStateGraph 
@@ -28,10 +30,17 @@ from urllib.parse import urlparse
 from research_agent.entity_intel_subgraph import entity_intel_subgraph_builder, EntityIntelResearchState    
 from research_agent.evidence_research_subgraph import evidence_research_subgraph_builder, EvidenceResearchState    
 from research_agent.prompts.research_directions_prompts import RESEARCH_DIRECTIONS_SYSTEM_PROMPT, RESEARCH_DIRECTIONS_USER_PROMPT 
-from research_agent.retrieval.async_mongo_client import get_episode, EpisodeDoc 
+from research_agent.retrieval.async_mongo_client import get_episode, get_episode_page_urls, EpisodeDoc, EPISODE_RESEARCH_PROJECTION 
 from research_agent.retrieval.async_s3_client import get_transcript_text_from_s3_url  
 from research_agent.common.artifacts import save_json_artifact, save_text_artifact   
+from research_agent.common.artifact_sink import close_artifact_sink
+from research_agent.agent_tools.tavily_functions import tavily_response_cache 
+from research_agent.agent_tools.firecrawl_functions import close_revalidation_client, firecrawl_scrape_cache
+from research_agent.medical_db_tools.pub_med_tools import pubmed_article_store
 from research_agent.common.logging_utils import configure_logging     
+from research_agent.common.agent_registry import get_agent 
+from research_agent.common.rate_limits import LLMConcurrencyBudget, direction_slot, scheduler 
+from research_agent.common.http_transport import close_shared_transport, make_http_client
 from copy import deepcopy 
 from pprint import pprint 
 import logging 
@@ -49,6 +58,7 @@ from research_agent.output_models import (
     ResearchDirectionOutput, 
     ResearchDirection, 
     GuestInfoModel,
+    UpdatedGuestInfoModel,
     SummaryAndAttributionOutput,
     AttributionQuote,
     ResearchDirectionType, 
@@ -73,6 +83,8 @@ from research_agent.prompts.prompts import (
 
 load_dotenv()   
 
+logger = logging.getLogger(__name__)
+
 
 
 graphql_auth_token = os.getenv("GRAPHQL_AUTH_TOKEN")
@@ -99,6 +111,8 @@ async_graphql_client = AsyncBaseClient(
     url=graphql_url,
     ws_url=ws_url,  # Add this for WebSocket subscriptions
     headers={"Authorization": f"Bearer {graphql_auth_token}"},
+    # Pooled keep-alive transport with gzip + retries, shared with the other GraphQL clients
+    http_client=make_http_client({"Authorization": f"Bearer {graphql_auth_token}"}),
     ws_headers={"Authorization": f"Bearer {graphql_auth_token}"},  # Auth for WebSocket too
 )
 
@@ -284,7 +298,8 @@ def select_subgraph_for_direction(
     # Fallback: treat unknown types as evidence-oriented
     return "evidence" 
 
-MAX_PARALLEL_DIRECTIONS=2   
+# Direction fan-out is bounded by the process-wide adaptive "research_directions"
+# lane in common/rate_limits.py (was a fixed MAX_PARALLEL_DIRECTIONS=2 per call).
 
 evidence_research_graph = ["research_graph"] 
 entity_intel_graph = ["entity_intel_graph"]  
@@ -345,7 +360,6 @@ class SingleDirectionRunResult(TypedDict):
 async def run_single_direction(
     direction: ResearchDirection,
     episode_context: str,
-    semaphore: asyncio.Semaphore,
     evidence_subgraph_app: CompiledStateGraph, 
     entity_intel_subgraph_app: CompiledStateGraph,  
     config: RunnableConfig,
@@ -354,9 +368,11 @@ async def run_single_direction(
     Run the appropriate subgraph (evidence or entity) for a single ResearchDirection.
 
     The compiled subgraphs are passed in so we don't rely on globals and can
-    ensure they share the same checkpointer/store as the parent.
+    ensure they share the same checkpointer/store as the parent. Concurrency is
+    governed by the shared adaptive direction lane, which shrinks when any
+    provider starts returning 429s.
     """
-    async with semaphore:
+    async with direction_slot():
         subgraph_kind = select_subgraph_for_direction(direction)
 
         if subgraph_kind == "evidence":
@@ -409,76 +425,129 @@ async def run_single_direction(
 # Graph Nodes
 # -----------------------------------------------------------------------------
 
-async def summarize_transcript(state: TranscriptGraph) -> TranscriptGraph:
-    """
-    Run summary and guest extraction in parallel, then combine results.
-    
-    This splits the work into two focused agents:
-    1. Summary agent - focuses only on producing the episode summary
-    2. Guest agent - focuses only on extracting guest information
-    
-    Both run concurrently and their outputs are combined into TranscriptSummaryOutput.
-    """
-    webpage_summary = state.get("webpage_summary")
-    full_transcript = state.get("full_transcript")
-
-    if not webpage_summary or not full_transcript:
-        raise Exception("webpage_summary and full_transcript are required for this graph")
-
-    # Format prompts for both agents
-  
-    
-    formatted_guest_prompt = guest_extraction_prompt.format(
-        webpage_summary=webpage_summary,
-    )
-
-    # Create both agents with their respective output formats
-    summary_agent = create_agent(
+def get_summary_agent():
+    """Compiled (build-once) full-transcript summary agent."""
+    return get_agent(
         summary_model,
         system_prompt=SUMMARY_SYSTEM_PROMPT,
         response_format=SummaryAndAttributionOutput,
     )
-    
-    guest_agent = create_agent(
+
+
+def get_guest_agent():
+    """Compiled (build-once) guest extraction agent."""
+    return get_agent(
         guest_extraction_model,
         system_prompt=GUEST_EXTRACTION_SYSTEM_PROMPT,
         response_format=GuestInfoModel,
-    )  
+    )
 
-    guest_response = await guest_agent.ainvoke(
+
+# "pipelined": start the expensive summary call immediately and join guest extraction afterwards.
+# "sequential": extract the guest first and feed it into the summary prompt (previous behaviour).
+SUMMARY_MODE: Literal["pipelined", "sequential"] = cast(
+    Literal["pipelined", "sequential"],
+    os.getenv("TRANSCRIPT_SUMMARY_MODE", "pipelined"),
+)
+
+PENDING_GUEST_FIELD = "(not yet extracted; infer from the webpage summary and transcript)"
+
+
+def merge_guest_information(
+    enhanced: UpdatedGuestInfoModel | None,
+    guest: GuestInfoModel,
+) -> UpdatedGuestInfoModel:
+    """
+    Join step for the pipelined summary: the summary agent's enhanced guest info wins,
+    the (webpage-grounded) guest extraction fills whatever it left empty.
+    """
+    if enhanced is None:
+        return UpdatedGuestInfoModel(
+            name=guest.name,
+            description=guest.description,
+            company=guest.company,
+            product=list(guest.product),
+        )
+
+    return enhanced.model_copy(
+        update={
+            "name": enhanced.name or guest.name,
+            "description": enhanced.description or guest.description,
+            "company": enhanced.company or guest.company,
+            "product": enhanced.product or list(guest.product),
+        }
+    )
+
+
+async def _extract_guest(webpage_summary: str) -> GuestInfoModel:
+    formatted_guest_prompt = guest_extraction_prompt.format(
+        webpage_summary=webpage_summary,
+    )
+    guest_response = await get_guest_agent().ainvoke(
         {"messages": [{"role": "user", "content": formatted_guest_prompt}]}
-    ) 
+    )
+    return guest_response["structured_response"]
 
-    guest_output: GuestInfoModel = guest_response["structured_response"] 
 
+async def _summarize(
+    webpage_summary: str,
+    full_transcript: str,
+    guest: GuestInfoModel | None,
+) -> SummaryAndAttributionOutput:
     formatted_summary_prompt = summary_only_prompt.format(
         webpage_summary=webpage_summary,
         full_transcript=full_transcript,
-        guest_name=guest_output.name,
-        guest_description=guest_output.description,
-        guest_company=guest_output.company or "(not specified)",
-        guest_product=guest_output.product or "(not specified)",
+        guest_name=guest.name if guest else PENDING_GUEST_FIELD,
+        guest_description=guest.description if guest else PENDING_GUEST_FIELD,
+        guest_company=(guest.company or "(not specified)") if guest else PENDING_GUEST_FIELD,
+        guest_product=(guest.product or "(not specified)") if guest else PENDING_GUEST_FIELD,
     )
-
-   
-    summary_response = await summary_agent.ainvoke(
+    summary_response = await get_summary_agent().ainvoke(
         {"messages": [{"role": "user", "content": formatted_summary_prompt}]}
-    ) 
+    )
+    return summary_response["structured_response"]
+
+
+async def summarize_transcript(state: TranscriptGraph) -> TranscriptGraph:
+    """
+    Produce the episode summary, attribution quotes and enhanced guest information.
+
+    This splits the work into two focused agents:
+    1. Summary agent - the expensive full-transcript call (summary + quotes + enhanced guest)
+    2. Guest agent - a cheap extraction of the guest from the webpage summary
+
+    In "pipelined" mode (default) the summary call starts immediately, concurrently with
+    guest extraction, and the guest fields are merged in afterwards. In "sequential" mode
+    the guest is extracted first and passed into the summary prompt.
+    """
+    webpage_summary = state.get("webpage_summary")
+    full_transcript = state.get("full_transcript")
 
-    summary_output: SummaryAndAttributionOutput = summary_response["structured_response"]
-   
-    
-    
-    
+    if not webpage_summary or not full_transcript:
+        raise Exception("webpage_summary and full_transcript are required for this graph")
 
-    # Extract structured responses
-    summary_output: SummaryAndAttributionOutput = summary_response["structured_response"]
-    guest_output: GuestInfoModel = guest_response["structured_response"]
+    if SUMMARY_MODE == "sequential":
+        guest_output = await _extract_guest(webpage_summary)
+        summary_output = await _summarize(webpage_summary, full_transcript, guest_output)
+        guest_information = summary_output.enhanced_guest_information
+    else:
+        summary_task = asyncio.create_task(_summarize(webpage_summary, full_transcript, None))
+        guest_task = asyncio.create_task(_extract_guest(webpage_summary))
+        try:
+            summary_output, guest_output = await asyncio.gather(summary_task, guest_task)
+        except BaseException:
+            summary_task.cancel()
+            guest_task.cancel()
+            raise
+        guest_information = merge_guest_information(
+            summary_output.enhanced_guest_information,
+            guest_output,
+        )
 
     # Combine into the final TranscriptSummaryOutput
     transcript_output = TranscriptSummaryOutput(
         summary=summary_output.summary,
-        guest_information=summary_output.enhanced_guest_information,
+        guest_information=guest_information,
         attribution_quotes=summary_output.attribution_quotes,
     )
 
@@ -542,7 +611,7 @@ async def generate_research_directions(state: TranscriptGraph) -> TranscriptGrap
     )
 
     # Create the agent that returns ResearchDirectionOutput
-    research_directions_agent = create_agent(
+    research_directions_agent = get_agent(
         general_model,
         system_prompt=RESEARCH_DIRECTIONS_SYSTEM_PROMPT,
         response_format=ResearchDirectionOutput,
@@ -614,13 +683,10 @@ async def run_research_directions(
     if state.get("initial_transcript_output") is not None:
         episode_context = getattr(state["initial_transcript_output"], "summary", "") or ""
 
-    semaphore = asyncio.Semaphore(MAX_PARALLEL_DIRECTIONS)
-
     tasks = [
         run_single_direction(
             direction=direction,
             episode_context=episode_context,
-            semaphore=semaphore,
             evidence_subgraph_app=evidence_subgraph_app,
             entity_intel_subgraph_app=entity_intel_subgraph_app,
             config=config,
@@ -628,7 +694,7 @@ async def run_research_directions(
         for direction in directions
     ]
 
-    # Run all directions concurrently (bounded by semaphore)
+    # Run all directions concurrently (bounded by the scheduler's direction lane)
     results: list[SingleDirectionRunResult] = await asyncio.gather(*tasks)
 
     # Subgraph-specific buckets
@@ -684,8 +750,6 @@ async def run_research_directions(
 
 
 
-graph = StateGraph(TranscriptGraph)
-
 def build_transcript_graph(
     evidence_subgraph_app: CompiledStateGraph,
     entity_intel_subgraph_app: CompiledStateGraph,
@@ -693,8 +757,11 @@ def build_transcript_graph(
     """
     Build the parent transcript graph, closing over the compiled
     evidence/entity subgraphs in the run_research_directions node.
+
+    A fresh StateGraph is built on every call so the builder can be reused
+    (e.g. by the batch runner) without duplicate-node errors.
     """
-    
+    graph = StateGraph(TranscriptGraph)
 
     graph.add_node("summarize_transcript", summarize_transcript)
     graph.add_node("generate_research_directions", generate_research_directions)
@@ -783,22 +850,62 @@ async def postgres_store(
         await store.setup()
         yield store
 
-# -----------------------------------------------------------------------------
-# Main: run the graph, persist checkpoints, pretty-print final state
-# -----------------------------------------------------------------------------
 
-async def run_transcript_graph_for_episode(episode_page_url: str) -> None:
+@asynccontextmanager
+async def postgres_pool_persistence(
+    pg_url: str,
+    *,
+    max_pool_size: int = 20,
+    index: Mapping[str, object] | None = None,
+) -> AsyncIterator[Tuple[AsyncPostgresSaver, AsyncPostgresStore]]:
     """
-    Run the full transcript graph pipeline for a single episode:
-    - Load episode metadata + transcript
-    - Initialize state
-    - Create checkpointer + shared store
-    - Compile parent graph and subgraphs with shared persistence
-    - Attach compiled subgraphs (and memory manager if desired) to state
-    - Invoke the parent graph and write final state to disk.
+    Yield an (AsyncPostgresSaver, AsyncPostgresStore) pair backed by ONE shared
+    psycopg connection pool. Use this when many graph runs execute concurrently;
+    `from_conn_string` gives each of them a single connection.
     """
-    # Fetch episode and context
-    episode_doc: EpisodeDoc = await get_episode(episode_page_url=episode_page_url)
+    async with AsyncConnectionPool(
+        conninfo=pg_url,
+        max_size=max_pool_size,
+        open=False,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+    ) as pool:
+        checkpointer = AsyncPostgresSaver(pool)
+        await checkpointer.setup()
+
+        store = AsyncPostgresStore(pool, index=index or DEFAULT_INDEX_CONFIG)
+        await store.setup()
+
+        yield checkpointer, store
+
+
+def compile_transcript_app(
+    checkpointer: BaseCheckpointSaver,
+    store: BaseStore,
+) -> CompiledStateGraph:
+    """Compile the subgraphs and the parent graph against shared persistence."""
+    evidence_subgraph_app, entity_intel_subgraph_app = compile_subgraphs(
+        checkpointer=checkpointer,
+        store=store,
+    )
+
+    graph = build_transcript_graph(
+        evidence_subgraph_app=evidence_subgraph_app,
+        entity_intel_subgraph_app=entity_intel_subgraph_app,
+    )
+
+    return graph.compile(
+        checkpointer=checkpointer,
+        store=store,
+    )
+
+
+async def load_initial_state(episode_page_url: str) -> TranscriptGraph:
+    """Fetch the episode doc + transcript and build the parent graph's initial state."""
+    episode_doc: EpisodeDoc | None = await get_episode(
+        episode_page_url=episode_page_url, projection=EPISODE_RESEARCH_PROJECTION
+    )
+    if episode_doc is None:
+        raise ValueError(f"Episode not found: {episode_page_url}")
 
     episode_meta = {
         "episode_number": episode_doc.get("episodeNumber") or "Unknown",
@@ -812,12 +919,48 @@ async def run_transcript_graph_for_episode(episode_page_url: str) -> None:
 
     webpage_summary = episode_doc.get("webPageSummary")
 
-    initial_state: TranscriptGraph = {
+    return {
         "episode_meta": episode_meta,
         "webpage_summary": webpage_summary,
         "full_transcript": full_transcript,
     }
 
+
+# Routes every chat-model call in a run through the scheduler's adaptive "openai" limiter.
+default_llm_budget = LLMConcurrencyBudget()
+
+
+def make_parent_graph_config(
+    episode_page_url: str,
+    callbacks: Optional[List[Any]] = None,
+) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": str(uuid4()),
+            "checkpoint_ns": "transcript_graph",
+            "episode_id": episode_page_url,
+        },
+        "callbacks": callbacks if callbacks is not None else [default_llm_budget],
+    }
+
+
+# -----------------------------------------------------------------------------
+# Main: run the graph, persist checkpoints, pretty-print final state
+# -----------------------------------------------------------------------------
+
+async def run_transcript_graph_for_episode(episode_page_url: str) -> None:
+    """
+    Run the full transcript graph pipeline for a single episode:
+    - Load episode metadata + transcript
+    - Initialize state
+    - Create checkpointer + shared store
+    - Compile parent graph and subgraphs with shared persistence
+    - Attach compiled subgraphs (and memory manager if desired) to state
+    - Invoke the parent graph and write final state to disk.
+    """
+    # Fetch episode and context
+    initial_state = await load_initial_state(episode_page_url)
+
     # Use AsyncPostgresSaver as an async context manager
     async with postgres_checkpointer(pg_url) as checkpointer, \
                postgres_store(pg_url) as store: 
@@ -827,38 +970,14 @@ async def run_transcript_graph_for_episode(episode_page_url: str) -> None:
         # add streaming support. Don't want so much latency 
        
 
-        parent_graph_config = { 
-            "configurable": {
-                "thread_id": str(uuid4()),
-                "checkpoint_ns": "transcript_graph",
-                "episode_id": episode_meta["episode_page_url"],
-            }
-        }   
-
-        evidence_subgraph_app, entity_intel_subgraph_app = compile_subgraphs(
-            checkpointer=checkpointer,
-            store=store,
-        ) 
-
-        graph = build_transcript_graph(
-            evidence_subgraph_app=evidence_subgraph_app,
-            entity_intel_subgraph_app=entity_intel_subgraph_app,
+        parent_graph_config = make_parent_graph_config(
+            initial_state["episode_meta"]["episode_page_url"]
         )
 
-        # Compile parent graph with checkpointer + store
-        parent_app = graph.compile(
-            checkpointer=checkpointer,
-            store=store,
-        ) 
-
-
-
-      
-      
+        parent_app = compile_transcript_app(checkpointer=checkpointer, store=store)
 
         # Single final result (no streaming)
         final_state: TranscriptGraph = await parent_app.ainvoke(initial_state, parent_graph_config)  
-
         snapshot_path = await dump_final_state_snapshot(
             app=parent_app,
             config=parent_graph_config,
@@ -867,9 +986,138 @@ async def run_transcript_graph_for_episode(episode_page_url: str) -> None:
 
         full_state_history = await parent_app.aget_state_history(parent_graph_config) 
 
+        # Paid Tavily calls / latency avoided by the response cache this run
+        tavily_response_cache.log_stats()
+        firecrawl_scrape_cache.log_stats()
+        pubmed_article_store.log_stats()
+        scheduler.log_stats()
+        # Write out queued artifacts (run log / files) before the loop goes away
+        await close_artifact_sink()
+
         return full_state_history  
 
-    
+
+class EpisodeBatchResult(TypedDict):
+    episode_page_url: str
+    ok: bool
+    thread_id: Optional[str]
+    snapshot_path: Optional[str]
+    seconds: float
+    error: Optional[str]
+
+
+DEFAULT_MAX_CONCURRENT_EPISODES = 4
+DEFAULT_LLM_CONCURRENCY = 12
+
+
+async def run_transcript_graph_batch(
+    episode_page_urls: Optional[List[str]] = None,
+    *,
+    mongo_query: Optional[Dict[str, Any]] = None,
+    limit: int = 0,
+    max_concurrent_episodes: int = DEFAULT_MAX_CONCURRENT_EPISODES,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    max_pool_size: int = 20,
+) -> List[EpisodeBatchResult]:
+    """
+    Run the transcript graph for many episodes in one process.
+
+    - Episodes come from `episode_page_urls`, or from `mongo_query` against the
+      episodes collection when no URLs are given.
+    - One pooled AsyncPostgresSaver/AsyncPostgresStore and ONE compiled parent app
+      (with its subgraphs) are shared by every episode; each episode gets its own thread_id.
+    - At most `max_concurrent_episodes` episodes run at once, and all chat-model calls
+      across all episodes share an `llm_concurrency` budget plus the per-provider
+      rate limiters in common/rate_limits.py.
+    - A failing episode is logged and reported; it does not stop the batch.
+    """
+    if episode_page_urls is None:
+        episode_page_urls = await get_episode_page_urls(mongo_query, limit=limit)
+    elif limit:
+        episode_page_urls = episode_page_urls[:limit]
+
+    # Preserve order, drop duplicates
+    episode_page_urls = list(dict.fromkeys(episode_page_urls))
+    if not episode_page_urls:
+        logger.warning("No episodes to process")
+        return []
+
+    logger.info(
+        f"🚀 BATCH: {len(episode_page_urls)} episode(s), "
+        f"max_concurrent_episodes={max_concurrent_episodes}, llm_concurrency={llm_concurrency}"
+    )
+
+    llm_budget = LLMConcurrencyBudget(max_concurrent_calls=llm_concurrency)
+    episode_semaphore = asyncio.Semaphore(max_concurrent_episodes)
+    batch_start = time.perf_counter()
+
+    async with postgres_pool_persistence(pg_url, max_pool_size=max_pool_size) as (checkpointer, store):
+        parent_app = compile_transcript_app(checkpointer=checkpointer, store=store)
+
+        async def run_one(episode_page_url: str) -> EpisodeBatchResult:
+            async with episode_semaphore:
+                start = time.perf_counter()
+                thread_id: Optional[str] = None
+                try:
+                    initial_state = await load_initial_state(episode_page_url)
+                    config = make_parent_graph_config(episode_page_url, callbacks=[llm_budget])
+                    thread_id = config["configurable"]["thread_id"]
+
+                    logger.info(f"▶️  BATCH episode start: {episode_page_url} (thread {thread_id})")
+                    await parent_app.ainvoke(initial_state, config)
+
+                    snapshot_path = await dump_final_state_snapshot(
+                        app=parent_app,
+                        config=config,
+                        thread_id=thread_id,
+                    )
+                    seconds = time.perf_counter() - start
+                    logger.info(f"✅ BATCH episode done: {episode_page_url} in {seconds:.1f}s")
+                    return EpisodeBatchResult(
+                        episode_page_url=episode_page_url,
+                        ok=True,
+                        thread_id=thread_id,
+                        snapshot_path=snapshot_path,
+                        seconds=seconds,
+                        error=None,
+                    )
+                except Exception as e:
+                    seconds = time.perf_counter() - start
+                    logger.exception(f"❌ BATCH episode failed: {episode_page_url}: {e}")
+                    return EpisodeBatchResult(
+                        episode_page_url=episode_page_url,
+                        ok=False,
+                        thread_id=thread_id,
+                        snapshot_path=None,
+                        seconds=seconds,
+                        error=str(e),
+                    )
+
+        results = await asyncio.gather(*(run_one(url) for url in episode_page_urls))
+
+    total_seconds = time.perf_counter() - batch_start
+    ok_count = sum(1 for r in results if r["ok"])
+    logger.info(
+        f"🏁 BATCH complete: {ok_count}/{len(results)} succeeded in {total_seconds:.1f}s "
+        f"(sum of episode times {sum(r['seconds'] for r in results):.1f}s)"
+    )
+    logger.info(f"    LLM budget: {llm_budget.stats()}")
+    tavily_response_cache.log_stats()
+    firecrawl_scrape_cache.log_stats()
+    pubmed_article_store.log_stats()
+    scheduler.log_stats()
+    await close_artifact_sink()
+
+    return list(results)
+
+
+async def run_until_shutdown(run: Awaitable[Any]) -> Any:
+    """Await a workflow run, then close the process-wide HTTP clients before the loop ends."""
+    try:
+        return await run
+    finally:
+        await close_shared_transport()
+        await close_revalidation_client()
 
 
 if __name__ == "__main__": 
@@ -879,8 +1127,26 @@ if __name__ == "__main__":
         log_dir="transcript_graph_logs"
     )
     parser = argparse.ArgumentParser()
-    parser.add_argument("--episode_page_url", type=str, required=True)
+    parser.add_argument("--episode_page_url", type=str, default=None)
+    parser.add_argument("--episode_page_urls", type=str, nargs="+", default=None,
+                        help="Run several episodes concurrently in one process")
+    parser.add_argument("--mongo_query", type=str, default=None,
+                        help='JSON filter for the episodes collection, e.g. \'{"episodeNumber": {"$gte": 1200}}\'')
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--max_concurrent_episodes", type=int, default=DEFAULT_MAX_CONCURRENT_EPISODES)
+    parser.add_argument("--llm_concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY)
     args = parser.parse_args()
-    episode_page_url = args.episode_page_url
-    asyncio.run(run_transcript_graph_for_episode(episode_page_url))  
-    # print(TRANSCRIPT_FILE.read_text())
\ No newline at end of file
+
+    if args.episode_page_url:
+        asyncio.run(run_until_shutdown(run_transcript_graph_for_episode(args.episode_page_url)))  
+    elif args.episode_page_urls or args.mongo_query:
+        asyncio.run(run_until_shutdown(run_transcript_graph_batch(
+            args.episode_page_urls,
+            mongo_query=json.loads(args.mongo_query) if args.mongo_query else None,
+            limit=args.limit,
+            max_concurrent_episodes=args.max_concurrent_episodes,
+            llm_concurrency=args.llm_concurrency,
+        )))
+    else:
+        parser.error("Provide --episode_page_url, --episode_page_urls or --mongo_query")
+    # print(TRANSCRIPT_FILE.read_text())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Benchmark: duplicate-fallback case-study lookup, linear `caseStudies` scan vs CaseStudyIndex.
+
+Serves a synthetic catalog from a local stub GraphQL server (stdlib http.server,
+no database), then resolves a batch of duplicate case studies both ways through
+the real generated `Client`.
+
+    python -m research_agent.biotech_full.run_case_study_index_benchmark \
+        [catalog_size] [lookups] [latency_ms]
+"""
+
+import asyncio
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from graphql_client.client import Client
+from research_agent.biotech_full.case_study_index import (
+    CaseStudyIndex,
+    normalize_case_study_title,
+)
+from research_agent.biotech_full.graphql_batch import GraphQLBatcher
+
+# Matches both `caseStudies(limit: $limit, offset: $offset)` and aliased `op3: caseStudies(...)`
+_FIELD_RE = re.compile(r"(?:(\w+):\s*)?caseStudies\(limit:\s*\$(\w+),\s*offset:\s*\$(\w+)\)")
+
+
+def _synthetic_catalog(size: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"cs{i:06d}",
+            "title": f"Randomized trial {i} of compound {i % 97} in cohort {i % 13}",
+            "url": f"https://pubmed.ncbi.nlm.nih.gov/{30_000_000 + i}/",
+        }
+        for i in range(size)
+    ]
+
+
+def _start_stub_server(
+    catalog: List[Dict[str, Any]], latency_s: float
+) -> Tuple[ThreadingHTTPServer, Dict[str, int]]:
+    counters = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            variables = body.get("variables") or {}
+            data: Dict[str, Any] = {}
+            for alias, limit_var, offset_var in _FIELD_RE.findall(body["query"]):
+                limit, offset = variables[limit_var], variables[offset_var]
+                data[alias or "caseStudies"] = catalog[offset:offset + limit]
+            counters["requests"] += 1
+            if latency_s:
+                time.sleep(latency_s)
+            payload = json.dumps({"data": data}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counters
+
+
+async def legacy_find(gql: Client, url: Optional[str], title: str) -> Optional[str]:
+    """The pre-index fallback: page caseStudies 50 at a time and compare in Python."""
+    query = (
+        "query CaseStudies($limit: Int, $offset: Int) "
+        "{ caseStudies(limit: $limit, offset: $offset) { id title url } }"
+    )
+    t_title = normalize_case_study_title(title)
+    t_url = (url or "").strip()
+    offset, limit = 0, 50
+    while True:
+        response = await gql.execute(
+            query=query,
+            operation_name="CaseStudies",
+            variables={"limit": limit, "offset": offset},
+        )
+        rows = gql.get_data(response)["caseStudies"]
+        for cs in rows:
+            if t_url and (cs.get("url") or "").strip() == t_url:
+                return cs["id"]
+            if normalize_case_study_title(cs.get("title")) == t_title:
+                return cs["id"]
+        if len(rows) < limit:
+            return None
+        offset += limit
+
+
+def _print_header(title: str) -> None:
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+async def amain() -> None:
+    catalog_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    catalog = _synthetic_catalog(catalog_size)
+    server, counters = _start_stub_server(catalog, latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+    rng = random.Random(7)
+    # Mostly real duplicates (by url or by title), plus a few misses that force a full scan
+    targets: List[Tuple[Optional[str], str, Optional[str]]] = []
+    for i in range(lookups):
+        if i % 5 == 4:
+            targets.append((None, f"missing study {i}", None))
+            continue
+        row = catalog[rng.randrange(catalog_size)]
+        by_url = i % 2 == 0
+        targets.append(
+            (row["url"] if by_url else None, row["title"].upper() if not by_url else "x", row["id"])
+        )
+
+    _print_header(
+        f"Catalog={catalog_size:,}  lookups={lookups}  stub latency={latency_ms} ms/request"
+    )
+    async with Client(url=url) as gql:
+        counters["requests"] = 0
+        start = time.perf_counter()
+        legacy = [await legacy_find(gql, u, t) for u, t, _ in targets]
+        legacy_s = time.perf_counter() - start
+        legacy_requests = counters["requests"]
+
+        counters["requests"] = 0
+        start = time.perf_counter()
+        index = CaseStudyIndex(GraphQLBatcher(gql))
+        indexed = [await index.find(u, t) for u, t, _ in targets]
+        index_s = time.perf_counter() - start
+        index_requests = counters["requests"]
+
+    server.shutdown()
+
+    expected = [e for _, _, e in targets]
+    assert indexed == expected, "index returned wrong ids"
+    assert legacy == expected, "legacy scan returned wrong ids"
+
+    print(
+        f"{'linear scan (50/page)':<26} {legacy_s * 1000:10.1f} ms"
+        f"   requests={legacy_requests:,}"
+    )
+    print(
+        f"{'CaseStudyIndex':<26} {index_s * 1000:10.1f} ms"
+        f"   requests={index_requests:,}   entries={len(index):,}"
+    )
+    print(
+        f"→ speedup: {legacy_s / max(index_s, 1e-9):,.1f}x, "
+        f"{legacy_requests / max(index_requests, 1):,.0f}x fewer requests"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
@@ -8,6 +8,7 @@ from research_agent.biotech_full.graphql_seed_helpers import (
     seed_from_directory,
     seed_one_entity_file
 )
+from research_agent.common.http_transport import close_shared_transport
 
 # Seed directory path
 seed_dir = r"C:\Users\Pinda\Proyectos\humanupgradeapp\ingestion\src\research_agent\entities_seed"
@@ -77,5 +78,12 @@ async def main():
     # return None 
     return None  
 
+async def run_main():
+    try:
+        return await main()
+    finally:
+        # The GraphQL client's pooled connections outlive the client; close them here
+        await close_shared_transport()
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(run_main())
\ No newline at end of file
@@ -12,14 +12,24 @@ from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from uuid import uuid4
 from typing import List
-from research_agent.retrieval.async_mongo_client import get_episodes_by_urls
-from research_agent.retrieval.async_s3_client import get_transcript_text_from_s3_url
+from research_agent.retrieval.async_mongo_client import (
+    EPISODE_SUMMARY_DETAILED_PROJECTION,
+    EPISODE_SUMMARY_INPUT_PROJECTION,
+    get_episode,
+    get_episodes_by_urls,
+    get_summarized_episode_ids,
+)
+from research_agent.biotech_full.get_unique_urls import EpisodeManifest, load_episode_manifest
+from research_agent.biotech_full.incremental_embeddings import IncrementalEmbeddingWriter
+from research_agent.common.staged_pipeline import PipelineReport, Stage, run_pipeline, summary_stages
+from research_agent.retrieval.async_s3_client import get_transcript_text_from_s3_url, close_shared_s3_client
 from pathlib import Path
 import aiofiles 
 from uuid import uuid4, uuid5, NAMESPACE_URL
 
 
 
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 from pymongo import AsyncMongoClient
 from bson.objectid import ObjectId
@@ -453,7 +463,15 @@ async def store_document_embeddings(
     vector_store: QdrantVectorStore,
     episode_transcript_url: str | None = None,
     mongo_episode_id: str | None = None,
+    writer: IncrementalEmbeddingWriter | None = None,
 ) -> List[Document]:
+    """
+    Split the final summary and store its chunks in Qdrant, embedding only chunks
+    whose content changed since the last run.
+
+    Pass a shared `writer` to batch embedding calls across episodes (call
+    `writer.flush()` at the end); without one the chunks are written immediately.
+    """
     docs = splitter.create_documents([final_summary_text])
 
     stable_key = mongo_episode_id or episode_url
@@ -481,63 +499,167 @@ async def store_document_embeddings(
 
     docs = [Document(page_content=d.page_content, metadata=m) for d, m in zip(docs, metadata)]
 
-    await vector_store.aadd_documents(documents=docs, ids=ids)
-    return docs
+    if writer is None:
+        writer = IncrementalEmbeddingWriter(vector_store)
+        docs = await writer.add(docs, ids, parent_ref=parent_ref)
+        await writer.flush()
+        return docs
+    return await writer.add(docs, ids, parent_ref=parent_ref)
+
+@dataclass
+class EpisodeJob:
+    episode_url: str
+    s3_url: str
+    mongo_episode_id: Optional[str]
+    webpage_summary: str
+    already_summarized: bool = False
+    transcript_text: str = ""
+    summary_output: Optional[TranscriptSummaryOutput] = None
+    final_summary_text: str = ""
+
+
+def _episode_job(ep: Dict[str, Any], summarized_ids: set) -> Optional[EpisodeJob]:
+    episode_url = ep.get("episodePageUrl") or ""
+    s3_url = ep.get("s3TranscriptUrl") or ""
+    mongo_episode_id = ep.get("_id")
+
+    # Only skip if transcript is missing
+    if not s3_url:
+        print(f"Skipping {episode_url or '[unknown episode url]'}: missing s3TranscriptUrl")
+        return None
+
+    # episode_url is still useful for metadata/logging; but do NOT skip the run
+    if not episode_url:
+        print("Warning: missing episodePageUrl on record (continuing anyway)")
+
+    return EpisodeJob(
+        episode_url=episode_url,
+        s3_url=s3_url,
+        mongo_episode_id=str(mongo_episode_id) if mongo_episode_id is not None else None,
+        webpage_summary=ep.get("webPageSummary") or "",  # optional; may not exist
+        already_summarized=mongo_episode_id in summarized_ids,
+    )
 
-async def run_summarization_and_storage(episode_urls: list[str]):
-    episodes = await get_episodes_by_urls(episode_urls)
 
-    for ep in episodes:
-        episode_url = ep.get("episodePageUrl") or ""
-        s3_url = ep.get("s3TranscriptUrl") or ""
-        mongo_episode_id = ep.get("_id") or ""
-        webpage_summary = ep.get("webPageSummary") or ""  # optional; may not exist
+async def _load_manifest_or_empty(collection_name: str) -> EpisodeManifest:
+    """Indexed-episode manifest (cached on disk); empty if Qdrant can't be reached."""
+    try:
+        return await load_episode_manifest(collection_name)
+    except Exception as e:
+        print(f"Warning: could not load Qdrant episode manifest ({type(e).__name__}: {e}); checking chunks per episode")
+        return EpisodeManifest(collection_name=collection_name)
 
-        # Only skip if transcript is missing
-        if not s3_url:
-            print(f"Skipping {episode_url or '[unknown episode url]'}: missing s3TranscriptUrl")
-            continue
 
-        # episode_url is still useful for metadata/logging; but do NOT skip the run
-        if not episode_url:
-            print("Warning: missing episodePageUrl on record (continuing anyway)")
+async def run_summarization_and_storage(episode_urls: list[str], force: bool = False) -> PipelineReport:
+    """
+    Summarize + store episodes as a staged pipeline:
 
-        transcript_text = await get_transcript_text_from_s3_url(s3_url)
+        fetch (S3) -> summarize (LLM) -> save initial outputs -> final summary (LLM)
+        -> Mongo update -> Qdrant embeddings
 
-        summary_output = await summarize_transcript(
-            transcript_text=transcript_text,
-            webpage_summary=webpage_summary,
-        )
+    Each stage has its own worker count and bounded queue, so transcript downloads
+    and writes overlap with the LLM stages. Episodes that already have a
+    summaryDetailed skip the LLM stages (unless `force`); if the episode manifest
+    also lists them as indexed in Qdrant they are skipped entirely, otherwise they
+    only go through the embedding stage (a no-op for unchanged chunks).
+    """
+    episodes = await get_episodes_by_urls(episode_urls, projection=EPISODE_SUMMARY_INPUT_PROJECTION)
+    summarized_ids = set() if force else await get_summarized_episode_ids(episode_urls)
+    manifest = await _load_manifest_or_empty(qdrant_vector_store.collection_name)
 
-        await save_initial_outputs_to_filesystem(
-            episode_url=episode_url,
-            mongo_episode_id=str(mongo_episode_id) if mongo_episode_id is not None else None,
-            initial_summary=summary_output.initial_summary,
-            guest_overview=summary_output.guest_overview,
-        )
+    jobs: List[EpisodeJob] = []
+    for job in (_episode_job(ep, summarized_ids) for ep in episodes):
+        if job is None:
+            continue
+        if job.already_summarized and not force and manifest.is_indexed(job.episode_url):
+            print(f"Skipping {job.episode_url}: already summarized and indexed")
+            continue
+        jobs.append(job)
 
-        final_summary_text = await create_final_client_summary(
-            initial_summary=summary_output.initial_summary,
-            guest_overview=summary_output.guest_overview,
-        )
+    # Chunk embeddings are queued across episodes and sent in provider-sized batches
+    embedding_writer = IncrementalEmbeddingWriter(qdrant_vector_store)
 
-        if mongo_episode_id is not None:
+    async def fetch(job: EpisodeJob) -> EpisodeJob:
+        if job.already_summarized:
+            doc = await get_episode(episode_id=job.mongo_episode_id, projection=EPISODE_SUMMARY_DETAILED_PROJECTION)
+            job.final_summary_text = (doc or {}).get("summaryDetailed") or ""
+        else:
+            job.transcript_text = await get_transcript_text_from_s3_url(job.s3_url)
+        return job
+
+    async def summarize(job: EpisodeJob) -> EpisodeJob:
+        if not job.already_summarized:
+            job.summary_output = await summarize_transcript(
+                transcript_text=job.transcript_text,
+                webpage_summary=job.webpage_summary,
+            )
+            job.transcript_text = ""
+        return job
+
+    async def save_initial(job: EpisodeJob) -> EpisodeJob:
+        if job.summary_output is not None:
+            await save_initial_outputs_to_filesystem(
+                episode_url=job.episode_url,
+                mongo_episode_id=job.mongo_episode_id,
+                initial_summary=job.summary_output.initial_summary,
+                guest_overview=job.summary_output.guest_overview,
+            )
+        return job
+
+    async def final_summary(job: EpisodeJob) -> EpisodeJob:
+        if job.summary_output is not None:
+            job.final_summary_text = await create_final_client_summary(
+                initial_summary=job.summary_output.initial_summary,
+                guest_overview=job.summary_output.guest_overview,
+            )
+        return job
+
+    async def mongo_update(job: EpisodeJob) -> EpisodeJob:
+        if job.already_summarized:
+            return job
+        if job.mongo_episode_id is not None:
             await update_episode_summary_detailed(
-                mongo_episode_id=str(mongo_episode_id),
-                summary_detailed=final_summary_text,
+                mongo_episode_id=job.mongo_episode_id,
+                summary_detailed=job.final_summary_text,
             )
         else:
-            print(f"Warning: no mongo episode id for {episode_url}, skipping Mongo update")
+            print(f"Warning: no mongo episode id for {job.episode_url}, skipping Mongo update")
+        return job
 
-        await store_document_embeddings(
-            final_summary_text=final_summary_text,
-            episode_url=episode_url,
+    async def embed(job: EpisodeJob) -> EpisodeJob:
+        docs = await store_document_embeddings(
+            final_summary_text=job.final_summary_text,
+            episode_url=job.episode_url,
             vector_store=qdrant_vector_store,
-            episode_transcript_url=s3_url,
-            mongo_episode_id=str(mongo_episode_id) if mongo_episode_id is not None else None,
+            episode_transcript_url=job.s3_url,
+            mongo_episode_id=job.mongo_episode_id,
+            writer=embedding_writer,
         )
+        manifest.record(job.episode_url, len(docs))
+        print(f"Done: {job.episode_url}{' (resumed)' if job.already_summarized else ''}")
+        return job
 
-        print(f"Done: {episode_url}")
+    try:
+        report = await run_pipeline(
+            jobs,
+            summary_stages(
+                fetch=fetch,
+                summarize=summarize,
+                save_initial=save_initial,
+                final_summary=final_summary,
+                mongo_update=mongo_update,
+                after=[Stage("embed", embed, workers=1)],
+            ),
+            key=lambda job: job.episode_url or str(job.mongo_episode_id),
+        )
+    finally:
+        await embedding_writer.flush()
+        await asyncio.to_thread(manifest.save)
+        await close_shared_s3_client()
+
+    print(report.summary())
+    print(f"📚 Embeddings: {embedding_writer.stats.as_dict()}")
+    return report
 
 
 episode_urls: list[str] = [
@@ -0,0 +1,103 @@
+# common/agent_registry.py
+
+"""
+Build-once registry for `create_agent(...)` graphs.
+
+`create_agent` compiles a fresh LangGraph graph on every call. The agents we use
+for summarization / extraction are stateless (no checkpointer, no tools that hold
+state), so a compiled agent can be reused safely across calls and coroutines.
+
+Usage:
+    agent = get_agent(
+        summary_model,
+        system_prompt=SUMMARY_SYSTEM_PROMPT,
+        response_format=SummaryAndAttributionOutput,
+    )
+    response = await agent.ainvoke({"messages": [...]})
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+from langchain.agents import create_agent
+
+logger = logging.getLogger(__name__)
+
+_registry_lock = threading.Lock()
+# key -> (model, agent). The model is kept alive so its id() cannot be reused.
+_AGENT_REGISTRY: Dict[Tuple[Hashable, ...], Tuple[Any, Any]] = {}
+
+
+def _response_format_key(response_format: Any) -> Hashable:
+    """
+    Identify a response_format. Handles bare schemas (pydantic classes) as well as
+    strategy wrappers like ProviderStrategy(Schema) / ToolStrategy(Schema).
+    """
+    if response_format is None:
+        return None
+    schema = getattr(response_format, "schema", None)
+    if schema is not None and not isinstance(response_format, type):
+        return (type(response_format).__name__, id(schema))
+    return ("schema", id(response_format))
+
+
+def _agent_key(
+    model: Any,
+    response_format: Any,
+    system_prompt: Optional[str],
+    tools: Optional[Sequence[Any]],
+    name: Optional[str],
+) -> Tuple[Hashable, ...]:
+    tool_ids = tuple(id(t) for t in tools) if tools else ()
+    return (id(model), _response_format_key(response_format), system_prompt, tool_ids, name)
+
+
+def get_agent(
+    model: Any,
+    *,
+    response_format: Any = None,
+    system_prompt: Optional[str] = None,
+    tools: Optional[Sequence[Any]] = None,
+    name: Optional[str] = None,
+) -> Any:
+    """
+    Return a compiled agent for this (model, response_format, system_prompt, tools, name)
+    combination, compiling it on first use only.
+
+    Only use this for agents without a checkpointer/store; per-run persistence
+    should keep calling `create_agent` directly.
+    """
+    key = _agent_key(model, response_format, system_prompt, tools, name)
+
+    cached = _AGENT_REGISTRY.get(key)
+    if cached is not None:
+        return cached[1]
+
+    with _registry_lock:
+        cached = _AGENT_REGISTRY.get(key)
+        if cached is not None:
+            return cached[1]
+
+        kwargs: Dict[str, Any] = {}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+        if name is not None:
+            kwargs["name"] = name
+
+        agent = create_agent(model, tools=list(tools) if tools else None, **kwargs)
+        _AGENT_REGISTRY[key] = (model, agent)
+        logger.debug(f"Compiled agent #{len(_AGENT_REGISTRY)} (name={name})")
+        return agent
+
+
+def clear_agent_registry() -> None:
+    """Drop all compiled agents (e.g. after swapping models in tests/notebooks)."""
+    with _registry_lock:
+        _AGENT_REGISTRY.clear()
+
+
+def agent_registry_size() -> int:
+    return len(_AGENT_REGISTRY)
@@ -0,0 +1,399 @@
+# common/artifact_sink.py
+
+"""
+Background sink for research artifacts (tool results, LLM turns, summaries).
+
+Tools used to write every artifact inline: makedirs + pretty-printed JSON +
+open/write/close of a new timestamped file, thousands of tiny files per episode,
+all on the request path. Now `submit()` only normalizes the payload and puts it
+on a bounded queue; a writer task drains the queue in batches off the event loop.
+
+Modes (ARTIFACT_SINK_MODE):
+- "log" (default): one append-only run log `<ARTIFACT_LOG_DIR>/<run_id>.jsonl.gz`.
+  Each batch is appended as its own gzip member (concatenated members are a valid
+  gzip stream, so `zcat`/`gzip.open` read the whole log), and one line per record
+  goes to `<run_id>.index.jsonl` with the member's byte offset for random access.
+- "files": the old one-file-per-artifact layout, still written by the background task.
+- "sampled": "log", but only for a deterministic ARTIFACT_SAMPLE_RATE share of
+  direction ids (so sampled directions keep complete traces).
+- "off": nothing is written.
+
+A full queue back-pressures the submitter instead of dropping artifacts. Pending
+records are flushed by `close_artifact_sink()` (call it before the loop ends) and,
+as a last resort, synchronously from an atexit hook.
+
+Usage:
+    ref = await get_artifact_sink().submit(data, base_dir, direction_id, "tavily_search")
+    ...
+    await close_artifact_sink()
+
+    for record in iter_run_log("research_artifacts/run_20250101_120000_ab12cd34.jsonl.gz"):
+        ...
+    data = read_artifact(ref)
+"""
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_SINK_MODE = (os.getenv("ARTIFACT_SINK_MODE") or "log").strip().lower()
+ARTIFACT_SAMPLE_RATE = float(os.getenv("ARTIFACT_SAMPLE_RATE", "0.1"))
+ARTIFACT_LOG_DIR = os.getenv("ARTIFACT_LOG_DIR") or "research_artifacts"
+ARTIFACT_QUEUE_SIZE = int(os.getenv("ARTIFACT_QUEUE_SIZE", "2000"))
+ARTIFACT_BATCH_SIZE = int(os.getenv("ARTIFACT_BATCH_SIZE", "128"))
+# Max time a record waits in the queue before its batch is written
+ARTIFACT_FLUSH_INTERVAL = float(os.getenv("ARTIFACT_FLUSH_INTERVAL", "2.0"))
+
+SINK_MODES = ("log", "files", "sampled", "off")
+
+# "<log path>#<seq>"
+REF_SEPARATOR = "#"
+
+
+def _normalize(data: Any) -> Any:
+    """Same conversion the file savers always used."""
+    if hasattr(data, "model_dump"):
+        return data.model_dump()
+    if hasattr(data, "dict"):
+        return data.dict()
+    if isinstance(data, dict):
+        return data
+    return {"content": str(data)}
+
+
+def _legacy_filename(artifact_type: str, suffix: str, extension: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{artifact_type}_{timestamp}_{str(uuid.uuid4())[:8]}"
+    if suffix:
+        filename += f"_{suffix}"
+    return f"{filename}.{extension}"
+
+
+@dataclass
+class ArtifactRecord:
+    seq: int
+    kind: str                   # "json" | "text"
+    base_dir: str
+    direction_id: str
+    artifact_type: str
+    suffix: str
+    created_at: float
+    payload: Any
+    path: str = ""              # target file in "files" mode
+
+    def header(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "kind": self.kind,
+            "base_dir": self.base_dir,
+            "direction_id": self.direction_id,
+            "artifact_type": self.artifact_type,
+            "suffix": self.suffix,
+            "created_at": self.created_at,
+        }
+
+
+@dataclass
+class ArtifactSinkStats:
+    submitted: int = 0
+    written: int = 0
+    skipped: int = 0            # "off" / not sampled
+    failed: int = 0
+    batches: int = 0
+    bytes_written: int = 0
+    max_queue_depth: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "bytes_written": self.bytes_written,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class ArtifactSink:
+    def __init__(
+        self,
+        *,
+        mode: str = ARTIFACT_SINK_MODE,
+        log_dir: str = ARTIFACT_LOG_DIR,
+        sample_rate: float = ARTIFACT_SAMPLE_RATE,
+        queue_size: int = ARTIFACT_QUEUE_SIZE,
+        batch_size: int = ARTIFACT_BATCH_SIZE,
+        flush_interval: float = ARTIFACT_FLUSH_INTERVAL,
+        run_id: Optional[str] = None,
+    ) -> None:
+        if mode not in SINK_MODES:
+            logger.warning(f"⚠️  Unknown ARTIFACT_SINK_MODE {mode!r}; using 'log'")
+            mode = "log"
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.run_id = run_id or (
+            f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        )
+        self.log_path = os.path.join(log_dir, f"{self.run_id}.jsonl.gz")
+        self.index_path = os.path.join(log_dir, f"{self.run_id}.index.jsonl")
+        self.stats = ArtifactSinkStats()
+
+        self._seq = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.Task] = None
+        # Serializes batch writes between the writer thread and the atexit flush
+        self._write_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Submitting
+    # ------------------------------------------------------------------
+
+    def _keeps(self, direction_id: str) -> bool:
+        if self.mode == "off":
+            return False
+        if self.mode != "sampled":
+            return True
+        bucket = int(hashlib.sha256(direction_id.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < self.sample_rate
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            if self._queue is not None:
+                # Previous loop is gone (another asyncio.run); write what it left behind
+                self._write_batch(self._take_all())
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._writer = loop.create_task(self._run_writer(self._queue))
+        return self._queue
+
+    async def submit(
+        self,
+        data: Any,
+        base_dir: str,
+        direction_id: str,
+        artifact_type: str,
+        suffix: str = "",
+        *,
+        kind: str = "json",
+    ) -> str:
+        """
+        Queue one artifact. Returns its reference ("<log>#<seq>" in log modes, the
+        target path in "files" mode, "" if it won't be written).
+        """
+        self.stats.submitted += 1
+        direction_id = str(direction_id)
+        if not self._keeps(direction_id):
+            self.stats.skipped += 1
+            return ""
+
+        self._seq += 1
+        record = ArtifactRecord(
+            seq=self._seq,
+            kind=kind,
+            base_dir=os.fspath(base_dir),
+            direction_id=direction_id,
+            artifact_type=artifact_type,
+            suffix=suffix,
+            created_at=time.time(),
+            # Snapshot now: models can still be mutated by the caller after this returns
+            payload=_normalize(data) if kind == "json" else str(data),
+        )
+        if self.mode == "files":
+            extension = "json" if kind == "json" else "txt"
+            record.path = os.path.join(
+                record.base_dir, direction_id, _legacy_filename(artifact_type, suffix, extension)
+            )
+            ref = record.path
+        else:
+            ref = f"{self.log_path}{REF_SEPARATOR}{record.seq}"
+
+        queue = self._ensure_writer()
+        await queue.put(record)
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, queue.qsize())
+        return ref
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _take_all(self) -> List[ArtifactRecord]:
+        records: List[ArtifactRecord] = []
+        while self._queue is not None and not self._queue.empty():
+            records.append(self._queue.get_nowait())
+        return records
+
+    async def _run_writer(self, queue: asyncio.Queue) -> None:
+        batch: List[ArtifactRecord] = []
+        try:
+            while True:
+                record = await queue.get()
+                if record is None:
+                    return
+                batch = [record]
+                deadline = time.monotonic() + self.flush_interval
+                stop = False
+                while len(batch) < self.batch_size:
+                    try:
+                        nxt = queue.get_nowait() if queue.qsize() else await asyncio.wait_for(
+                            queue.get(), max(0.0, deadline - time.monotonic())
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                    if nxt is None:
+                        stop = True
+                        break
+                    batch.append(nxt)
+                pending, batch = batch, []
+                await asyncio.to_thread(self._write_batch, pending)
+                if stop:
+                    return
+        except asyncio.CancelledError:
+            # Loop shutting down (asyncio.run cancels leftover tasks): don't lose the
+            # batch being collected
+            self._write_batch(batch)
+            raise
+
+    def _write_batch(self, batch: List[ArtifactRecord]) -> None:
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                if self.mode == "files":
+                    self._write_files(batch)
+                else:
+                    self._append_log(batch)
+                self.stats.written += len(batch)
+                self.stats.batches += 1
+            except Exception as e:
+                self.stats.failed += len(batch)
+                logger.error(f"Failed to write {len(batch)} artifacts: {e}")
+
+    def _append_log(self, batch: List[ArtifactRecord]) -> None:
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        lines: List[bytes] = []
+        for r in batch:
+            entry = {**r.header(), "data": r.payload}
+            line = json.dumps(entry, default=str, ensure_ascii=False, separators=(",", ":"))
+            lines.append(line.encode("utf-8"))
+        member = gzip.compress(b"\n".join(lines) + b"\n", compresslevel=6)
+
+        with open(self.log_path, "ab") as f:
+            offset = f.tell()
+            f.write(member)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for line_no, r in enumerate(batch):
+                f.write(
+                    json.dumps(
+                        {**r.header(), "offset": offset, "length": len(member), "line": line_no},
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                )
+        self.stats.bytes_written += len(member)
+
+    def _write_files(self, batch: List[ArtifactRecord]) -> None:
+        for r in batch:
+            os.makedirs(os.path.dirname(r.path), exist_ok=True)
+            with open(r.path, "w", encoding="utf-8") as f:
+                if r.kind == "json":
+                    f.write(json.dumps(r.payload, indent=2, default=str, ensure_ascii=False))
+                else:
+                    f.write(r.payload)
+                self.stats.bytes_written += f.tell()
+
+    # ------------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        """Write everything queued and stop the writer (a later submit restarts it)."""
+        if self._queue is None or self._writer is None:
+            return
+        if self._loop is asyncio.get_running_loop() and not self._writer.done():
+            await self._queue.put(None)
+            await self._writer
+        # Records queued after the writer stopped (or left by another loop)
+        await asyncio.to_thread(self._write_batch, self._take_all())
+        self._queue = None
+        self._writer = None
+        self._loop = None
+        target = f" -> {self.log_path}" if self.stats.batches and self.mode != "files" else ""
+        logger.info(f"📚 Artifacts ({self.mode}): {self.stats.as_dict()}{target}")
+
+    def flush_sync(self) -> None:
+        """Last-resort flush from atexit: write whatever is still queued, without a loop."""
+        leftovers = [r for r in self._take_all() if r is not None]
+        if leftovers:
+            self._write_batch(leftovers)
+
+
+_sink: Optional[ArtifactSink] = None
+
+
+def get_artifact_sink() -> ArtifactSink:
+    global _sink
+    if _sink is None:
+        _sink = ArtifactSink()
+    return _sink
+
+
+async def close_artifact_sink() -> None:
+    if _sink is not None:
+        await _sink.close()
+
+
+@atexit.register
+def _flush_artifact_sink_at_exit() -> None:
+    if _sink is not None:
+        _sink.flush_sync()
+
+
+# ----------------------------------------------------------------------
+# Reading a run log
+# ----------------------------------------------------------------------
+
+def iter_run_log(log_path: str) -> Iterator[Dict[str, Any]]:
+    """Every record of a run log, in write order."""
+    with gzip.open(log_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_artifact(ref: str) -> Any:
+    """The payload behind a "<log>#<seq>" ref (one gzip member, found via the index) or a path."""
+    if REF_SEPARATOR not in ref:
+        with open(ref, "r", encoding="utf-8") as f:
+            return json.load(f) if ref.endswith(".json") else f.read()
+
+    log_path, seq_str = ref.rsplit(REF_SEPARATOR, 1)
+    seq = int(seq_str)
+    index_path = log_path[: -len(".jsonl.gz")] + ".index.jsonl"
+    with open(index_path, "r", encoding="utf-8") as f:
+        entry = next((e for e in map(json.loads, f) if e["seq"] == seq), None)
+    if entry is None:
+        raise KeyError(ref)
+    with open(log_path, "rb") as f:
+        f.seek(entry["offset"])
+        member = zlib.decompressobj(wbits=31).decompress(f.read(entry["length"]))
+    return json.loads(member.splitlines()[entry["line"]])["data"]
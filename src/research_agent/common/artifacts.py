@@ -1,15 +1,14 @@
 # common/artifacts.py
 
-import json
 import os
-import uuid
-from datetime import datetime
-from typing import Any, Union, Mapping
+from typing import Any, Union
 
 import aiofiles
 import aiofiles.os
 import logging
 
+from research_agent.common.artifact_sink import get_artifact_sink
+
 PathLike = Union[str, os.PathLike]
 
 logger = logging.getLogger(__name__)
@@ -35,34 +34,6 @@ async def ensure_directory_exists(path: PathLike) -> None:
         logger.warning(f"Could not create directory {dir_path}: {e}")
 
 
-def _build_artifact_filename(
-    artifact_type: str,
-    suffix: str = "",
-    extension: str = "json",
-) -> str:
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{suffix}"
-    return f"{filename}.{extension}"
-
-
-def _normalize_json_data(data: Any) -> Mapping[str, Any]:
-    """
-    Convert various object types into JSON-serializable dicts.
-    """
-    if hasattr(data, "model_dump"):  # Pydantic v2
-        return data.model_dump()
-    if hasattr(data, "dict"):  # Pydantic v1 or similar
-        return data.dict()  # type: ignore[no-any-return]
-    if isinstance(data, dict):
-        return data
-    # Fallback: store string representation
-    return {"content": str(data)}
-
-
 async def save_json_artifact(
     data: Any,
     base_dir: PathLike,
@@ -71,7 +42,7 @@ async def save_json_artifact(
     suffix: str = "",
 ) -> str:
     """
-    Save a JSON artifact to disk with structured naming.
+    Queue a JSON artifact on the background artifact sink (see common/artifact_sink.py).
 
     Args:
         data: Data to serialize (dict, Pydantic model, or JSON-serializable object)
@@ -81,36 +52,12 @@ async def save_json_artifact(
         suffix: Optional suffix for additional context
 
     Returns:
-        The file path where the artifact was saved, or "" on failure.
+        The artifact reference (run-log ref or file path), or "" if it won't be written.
     """
-    filename = _build_artifact_filename(
-        artifact_type=artifact_type,
-        suffix=suffix,
-        extension="json",
+    return await get_artifact_sink().submit(
+        data, os.fspath(base_dir), direction_id, artifact_type, suffix, kind="json"
     )
 
-    filepath = os.path.join(os.fspath(base_dir), direction_id, filename)
-
-    await ensure_directory_exists(filepath)
-
-    json_data = _normalize_json_data(data)
-
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(
-                json.dumps(
-                    json_data,
-                    indent=2,
-                    default=str,
-                    ensure_ascii=False,
-                )
-            )
-        logger.debug(f"Saved JSON artifact: {filepath}")
-        return filepath
-    except Exception as e:
-        logger.error(f"Failed to save JSON artifact {filepath}: {e}")
-        return ""
-
 
 async def save_text_artifact(
     content: str,
@@ -120,7 +67,7 @@ async def save_text_artifact(
     suffix: str = "",
 ) -> str:
     """
-    Save a text artifact to disk.
+    Queue a text artifact on the background artifact sink.
 
     Args:
         content: Text content to save
@@ -130,23 +77,8 @@ async def save_text_artifact(
         suffix: Optional suffix
 
     Returns:
-        The file path where the artifact was saved, or "" on failure.
+        The artifact reference (run-log ref or file path), or "" if it won't be written.
     """
-    filename = _build_artifact_filename(
-        artifact_type=artifact_type,
-        suffix=suffix,
-        extension="txt",
+    return await get_artifact_sink().submit(
+        content, os.fspath(base_dir), direction_id, artifact_type, suffix, kind="text"
     )
-
-    filepath = os.path.join(os.fspath(base_dir), direction_id, filename)
-
-    await ensure_directory_exists(filepath)
-
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(content)
-        logger.debug(f"Saved text artifact: {filepath}")
-        return filepath
-    except Exception as e:
-        logger.error(f"Failed to save text artifact {filepath}: {e}")
-        return ""
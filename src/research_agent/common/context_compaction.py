@@ -0,0 +1,152 @@
+# common/context_compaction.py
+
+"""
+Context-window compaction for tool-calling loops.
+
+Tool loops append every ToolMessage to state (operator.add), and each model call
+resends the full history. Once the history passes a token budget, older tool
+results are swapped for short stubs before sending:
+
+1. Tool results that precede the latest intermediate summary (e.g.
+   `write_evidence_summary_tool`) are compacted first. Their findings are already
+   consolidated in that summary, whose arguments stay in the history.
+2. If the history is still over budget, every tool result outside the rolling
+   window of recent turns is compacted.
+
+State is never modified; only the list that is sent to the model changes. The
+ToolMessages themselves are kept, with the same tool_call_id, so every tool call
+still has a response.
+
+Usage:
+    result = compact_tool_history(
+        messages,
+        token_budget=24_000,
+        keep_recent_turns=4,
+        summary_tool_name="write_evidence_summary_tool",
+    )
+    ai_msg = await model.ainvoke([system, *result.messages])
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+
+@dataclass
+class CompactionResult:
+    messages: List[BaseMessage]
+    tokens_before: int
+    tokens_after: int
+    compacted_tool_messages: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Cheap token estimate (chars/4 plus per-message overhead); good enough for budgeting."""
+    return count_tokens_approximately(list(messages)) if messages else 0
+
+
+def _stub(msg: ToolMessage, summary_tool_name: Optional[str]) -> ToolMessage:
+    content = str(msg.content)
+    where = (
+        f"the {summary_tool_name} summaries above"
+        if summary_tool_name
+        else "your earlier notes"
+    )
+    return msg.model_copy(
+        update={
+            "content": (
+                f"[Compacted {msg.name or 'tool'} result ({len(content):,} chars). "
+                f"Findings are consolidated in {where}; re-run the tool if you need the raw output.]"
+            )
+        }
+    )
+
+
+def _summary_digest(messages: Sequence[BaseMessage], summary_tool_name: str) -> Optional[SystemMessage]:
+    """List the intermediate summaries written so far (topic + confidence) so the model can lean on them."""
+    lines: List[str] = []
+    for msg in messages:
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls or []:
+            if tc.get("name") != summary_tool_name:
+                continue
+            args = tc.get("args") or {}
+            topic = args.get("topic_focus") or "(untitled)"
+            confidence = args.get("confidence")
+            suffix = f" (confidence {confidence})" if confidence is not None else ""
+            lines.append(f"- {topic}{suffix}")
+    if not lines:
+        return None
+    return SystemMessage(
+        content=(
+            "Older raw tool outputs were compacted to save context. "
+            "Intermediate summaries written so far:\n" + "\n".join(lines)
+        )
+    )
+
+
+def compact_tool_history(
+    messages: Sequence[BaseMessage],
+    *,
+    token_budget: int,
+    keep_recent_turns: int = 4,
+    summary_tool_name: Optional[str] = None,
+) -> CompactionResult:
+    """
+    Return the history to send, compacted if it exceeds `token_budget` tokens.
+
+    A "turn" starts at each AIMessage; the last `keep_recent_turns` turns are never
+    touched, and neither are the results of `summary_tool_name` itself.
+    """
+    history = list(messages)
+    tokens_before = estimate_tokens(history)
+    if tokens_before <= token_budget:
+        return CompactionResult(history, tokens_before, tokens_before)
+
+    ai_positions = [i for i, m in enumerate(history) if isinstance(m, AIMessage)]
+    if keep_recent_turns <= 0:
+        window_start = len(history)
+    elif len(ai_positions) >= keep_recent_turns:
+        window_start = ai_positions[-keep_recent_turns]
+    else:
+        window_start = 0
+
+    last_summary = max(
+        (i for i, m in enumerate(history) if isinstance(m, ToolMessage) and summary_tool_name and m.name == summary_tool_name),
+        default=-1,
+    )
+
+    def candidates(limit: int) -> List[int]:
+        return [
+            i
+            for i, m in enumerate(history[:limit])
+            if isinstance(m, ToolMessage) and not (summary_tool_name and m.name == summary_tool_name)
+        ]
+
+    compacted: List[BaseMessage] = list(history)
+    count = 0
+    # Phase 1: results already consolidated by a later summary; Phase 2: anything outside the window
+    limits = ([min(last_summary, window_start)] if last_summary >= 0 else []) + [window_start]
+    for limit in limits:
+        for i in candidates(limit):
+            if compacted[i] is history[i]:
+                compacted[i] = _stub(history[i], summary_tool_name)
+                count += 1
+        if estimate_tokens(compacted) <= token_budget:
+            break
+
+    if count and summary_tool_name:
+        digest = _summary_digest(history, summary_tool_name)
+        if digest is not None:
+            # After the leading system prompt, if there is one
+            at = 1 if compacted and isinstance(compacted[0], SystemMessage) else 0
+            compacted.insert(at, digest)
+
+    return CompactionResult(compacted, tokens_before, estimate_tokens(compacted), count)
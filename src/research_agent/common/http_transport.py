@@ -0,0 +1,225 @@
+# common/http_transport.py
+
+"""
+Shared, tuned httpx transport for the generated GraphQL client (and anything else
+that speaks HTTP to our own backend).
+
+The ariadne-codegen `AsyncBaseClient` builds a bare `httpx.AsyncClient` per instance,
+so every module that makes a client gets its own cold connection pool, no retries
+and uncompressed request bodies. This module keeps ONE process-wide connection pool
+and wraps it with:
+
+- explicit pool limits and keep-alive expiry
+- optional HTTP/2 (only when the `h2` package is installed)
+- gzip request bodies above a size threshold (mutation payloads with nested
+  products/media links are several KB); gzip responses via Accept-Encoding
+- retries with full-jitter exponential backoff on connect / pool-acquire errors
+  (never once the request may have been sent), on 5xx for idempotent methods, and
+  on 503 with Retry-After for any method (the server refused it); Retry-After is
+  honoured up to HTTP_RETRY_AFTER_MAX seconds
+
+Each caller still gets its own `httpx.AsyncClient` (headers/auth differ per caller);
+they all share the pool, and closing one of them does not close the pool.
+
+Usage:
+    gql = Client(url=url, headers=headers, http_client=make_http_client(headers=headers))
+    ...
+    await close_shared_transport()   # at process shutdown
+
+Env overrides: HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY,
+HTTP_TIMEOUT, HTTP2_ENABLED, HTTP_GZIP_MIN_BYTES (0 disables), HTTP_MAX_RETRIES,
+HTTP_RETRY_AFTER_MAX.
+"""
+
+import asyncio
+import gzip
+import importlib.util
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+# A 5xx proves the request was sent; only these methods are safe to replay after one
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failures before the request left this process; a read/write error or timeout
+# mid-request may mean a POST mutation already ran, so those are not retried
+RETRYABLE_TRANSPORT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class HttpTransportConfig:
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 60.0
+    timeout: float = 60.0
+    http2: bool = False
+    gzip_min_bytes: int = 2048
+    max_retries: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+    retry_after_max: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "HttpTransportConfig":
+        wants_http2 = os.getenv("HTTP2_ENABLED", "").lower() in ("1", "true", "yes")
+        return cls(
+            max_connections=_env_int("HTTP_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int("HTTP_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            timeout=_env_float("HTTP_TIMEOUT", cls.timeout),
+            http2=wants_http2 and importlib.util.find_spec("h2") is not None,
+            gzip_min_bytes=_env_int("HTTP_GZIP_MIN_BYTES", cls.gzip_min_bytes),
+            max_retries=_env_int("HTTP_MAX_RETRIES", cls.max_retries),
+            retry_after_max=_env_float("HTTP_RETRY_AFTER_MAX", cls.retry_after_max),
+        )
+
+
+def _retry_after_seconds(response: httpx.Response, cap: float) -> Optional[float]:
+    raw = response.headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        delay = float(raw)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(raw).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    # Never let the server park a worker for longer than `cap`
+    return min(max(0.0, delay), cap)
+
+
+def _should_retry_status(request: httpx.Request, response: httpx.Response) -> bool:
+    if response.status_code not in RETRYABLE_STATUS_CODES:
+        return False
+    if request.method.upper() in IDEMPOTENT_METHODS:
+        return True
+    # 503 + Retry-After: the server declined the request, so replaying a POST is safe
+    return response.status_code == 503 and "retry-after" in response.headers
+
+
+class TunedTransport(httpx.AsyncBaseTransport):
+    """Pooled transport with gzip request bodies and jittered retries."""
+
+    def __init__(self, config: HttpTransportConfig, *, shared: bool = False) -> None:
+        self.config = config
+        self.shared = shared
+        self._pool = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=config.http2,
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform(0, min(cap, base * 2^attempt))
+        cap = min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    async def _compressed(self, request: httpx.Request) -> httpx.Request:
+        if self.config.gzip_min_bytes <= 0 or "content-encoding" in request.headers:
+            return request
+        body = await request.aread()
+        if len(body) < self.config.gzip_min_bytes:
+            return request
+        headers = httpx.Headers(request.headers)
+        headers["Content-Encoding"] = "gzip"
+        headers.pop("Content-Length", None)
+        return httpx.Request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=gzip.compress(body, compresslevel=5),
+            extensions=request.extensions,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request = await self._compressed(request)
+        attempt = 0
+        while True:
+            try:
+                response = await self._pool.handle_async_request(request)
+            except RETRYABLE_TRANSPORT_ERRORS as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"⚠️  HTTP {type(e).__name__} on {request.url.host}, "
+                    f"retry {attempt + 1} in {delay:.2f}s"
+                )
+            else:
+                retry = _should_retry_status(request, response)
+                if not retry or attempt >= self.config.max_retries:
+                    return response
+                retry_after = _retry_after_seconds(response, self.config.retry_after_max)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                logger.warning(
+                    f"⚠️  HTTP {response.status_code} from {request.url.host}, "
+                    f"retry {attempt + 1} in {delay:.2f}s"
+                )
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        # The shared pool outlives individual clients; see close_shared_transport()
+        if not self.shared:
+            await self._pool.aclose()
+
+    async def close_pool(self) -> None:
+        await self._pool.aclose()
+
+
+_shared_transport: Optional[TunedTransport] = None
+
+
+def get_shared_transport() -> TunedTransport:
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = TunedTransport(HttpTransportConfig.from_env(), shared=True)
+    return _shared_transport
+
+
+def make_http_client(headers: Optional[Mapping[str, str]] = None) -> httpx.AsyncClient:
+    """A cheap per-caller client (own headers) over the process-wide pooled transport."""
+    transport = get_shared_transport()
+    merged = {"Accept-Encoding": "gzip"}
+    merged.update(headers or {})
+    return httpx.AsyncClient(
+        transport=transport,
+        headers=merged,
+        timeout=transport.config.timeout,
+    )
+
+
+async def close_shared_transport() -> None:
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.close_pool()
+        _shared_transport = None
@@ -0,0 +1,237 @@
+# common/map_reduce_summary.py
+
+"""
+Size-aware summarization of formatted search / scrape results
+(format_tavily_search_response, format_tavily_extract_response,
+format_firecrawl_search_response, ...).
+
+Small inputs keep the single-shot path: one structured call with the caller's
+prompt. Inputs over SUMMARY_SINGLE_SHOT_MAX_CHARS (e.g. include_raw_content or
+full-page markdown) are map-reduced instead:
+
+- split per source ("[Result N]" blocks, one "=== Firecrawl Scrape Result ===" per
+  page); a source that is itself too big is cut at paragraph boundaries, each piece
+  keeping the source's Title/URL header so citations survive
+- pack sources into chunks of up to SUMMARY_MAP_CHUNK_CHARS and summarize the
+  chunks concurrently (at most SUMMARY_MAP_CONCURRENCY at once) with the same
+  prompt and schema
+- reduce the partial summaries with SUMMARY_REDUCE_PROMPT into the same schema
+  (hierarchically if they are still too large); citations are the union of the
+  partial citations, deduplicated by URL
+
+Usage:
+    summary = await summarize_results(
+        formatted_results,
+        prompt=TAVILY_SUMMARY_PROMPT,
+        schema=TavilyResultsSummary,
+        model=summary_model,
+    )
+
+Env overrides: SUMMARY_SINGLE_SHOT_MAX_CHARS, SUMMARY_MAP_CHUNK_CHARS,
+SUMMARY_MAP_CONCURRENCY.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from research_agent.common.agent_registry import get_agent
+from research_agent.prompts.summary_prompts import SUMMARY_REDUCE_PROMPT
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SINGLE_SHOT_MAX_CHARS = int(os.getenv("SUMMARY_SINGLE_SHOT_MAX_CHARS", "60000"))
+SUMMARY_MAP_CHUNK_CHARS = int(os.getenv("SUMMARY_MAP_CHUNK_CHARS", "40000"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+S = TypeVar("S", bound=BaseModel)
+
+# Lines that start a new source in the formatted tool output
+_SOURCE_START_RE = re.compile(
+    r"^(?:\[Result \d+\]|=== Firecrawl Scrape Result ===)\s*$", re.MULTILINE
+)
+# Header lines copied onto every piece of a split source
+_HEADER_FIELD_RE = re.compile(
+    r"^(?:\[Result \d+\]|=== Firecrawl Scrape Result ==="
+    r"|Title:|URL:|Score:|Published date:|Description:)"
+)
+
+
+def split_sources(text: str) -> Tuple[str, List[str]]:
+    """(preamble, [source block, ...]) for a formatted results string."""
+    starts = [m.start() for m in _SOURCE_START_RE.finditer(text)]
+    if not starts:
+        return "", [text]
+    preamble = text[: starts[0]].strip()
+    bounds = starts + [len(text)]
+    return preamble, [text[bounds[i]: bounds[i + 1]].strip() for i in range(len(starts))]
+
+
+def _split_oversized_source(source: str, max_chars: int) -> List[str]:
+    header_lines: List[str] = []
+    for line in source.splitlines():
+        if not _HEADER_FIELD_RE.match(line):
+            break
+        header_lines.append(line)
+    header = "\n".join(header_lines)
+    body = source[len(header):].strip()
+    budget = max(1000, max_chars - len(header) - 50)
+
+    pieces: List[str] = []
+    current = ""
+    for para in re.split(r"\n\s*\n", body):
+        while len(para) > budget:
+            # A single huge paragraph (or markdown without blank lines): hard cut
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(para[:budget])
+            para = para[budget:]
+        if current and len(current) + len(para) + 2 > budget:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{para}" if current else para
+    if current:
+        pieces.append(current)
+
+    prefix = f"{header}\n" if header else ""
+    return [
+        f"{prefix}(part {i}/{len(pieces)})\n{piece}" for i, piece in enumerate(pieces, start=1)
+    ]
+
+
+def make_chunks(text: str, max_chars: int = SUMMARY_MAP_CHUNK_CHARS) -> List[str]:
+    """Pack whole sources into chunks of up to `max_chars` (splitting ones that don't fit alone)."""
+    preamble, sources = split_sources(text)
+    units: List[str] = []
+    for source in sources:
+        if len(source) > max_chars:
+            units.extend(_split_oversized_source(source, max_chars))
+        else:
+            units.append(source)
+
+    # Keep short context (e.g. "Search query: ...") on every chunk
+    prefix = f"{preamble}\n\n" if preamble and len(preamble) < 1000 else ""
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) + 2 > max_chars:
+            chunks.append(prefix + current)
+            current = ""
+        current = f"{current}\n\n{unit}" if current else unit
+    if current:
+        chunks.append(prefix + current)
+    return chunks
+
+
+async def _summarize_once(
+    prompt: str, model: Any, response_format: Any, name: Optional[str]
+) -> Any:
+    agent = get_agent(model, response_format=response_format, name=name)
+    response = await agent.ainvoke({"messages": [{"role": "user", "content": prompt}]})
+    return response["structured_response"]
+
+
+def _merge_citations(summaries: Sequence[BaseModel]) -> List[Any]:
+    merged: List[Any] = []
+    seen = set()
+    for s in summaries:
+        for c in getattr(s, "citations", None) or []:
+            url = (getattr(c, "url", "") or "").strip().rstrip("/")
+            if url in seen:
+                continue
+            seen.add(url)
+            merged.append(c)
+    return merged
+
+
+def _render_partial(i: int, summary: BaseModel) -> str:
+    lines = [f"[Part {i}]", getattr(summary, "summary", ""), "", "Sources:"]
+    for c in getattr(summary, "citations", None) or []:
+        lines.append(f"- {getattr(c, 'title', '')} | {getattr(c, 'url', '')}")
+    return "\n".join(lines)
+
+
+async def summarize_results(
+    formatted_results: str,
+    *,
+    prompt: str,
+    schema: Type[S],
+    model: Any,
+    response_format: Any = None,
+    name: Optional[str] = None,
+    single_shot_max_chars: int = SUMMARY_SINGLE_SHOT_MAX_CHARS,
+    chunk_chars: int = SUMMARY_MAP_CHUNK_CHARS,
+    concurrency: int = SUMMARY_MAP_CONCURRENCY,
+) -> S:
+    """
+    Summarize formatted results into `schema` (e.g. TavilyResultsSummary).
+
+    `prompt` is the single-shot template with a {search_results} slot; it is also
+    used for every map chunk. `response_format` defaults to `schema` (pass e.g.
+    ProviderStrategy(schema) to keep a caller's structured-output strategy).
+    """
+    response_format = response_format if response_format is not None else schema
+
+    if len(formatted_results) <= single_shot_max_chars:
+        return await _summarize_once(
+            prompt.format(search_results=formatted_results), model, response_format, name
+        )
+
+    chunks = make_chunks(formatted_results, chunk_chars)
+    logger.info(
+        f"🧩 Map-reduce summary: {len(formatted_results)} chars -> {len(chunks)} chunk(s) "
+        f"(concurrency {concurrency})"
+    )
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def call(llm_prompt: str) -> S:
+        async with sem:
+            return await _summarize_once(llm_prompt, model, response_format, name)
+
+    partials: List[S] = list(
+        await asyncio.gather(*(call(prompt.format(search_results=c)) for c in chunks))
+    )
+    return await _reduce(partials, schema, call, single_shot_max_chars)
+
+
+async def _reduce(
+    partials: List[S],
+    schema: Type[S],
+    call: Callable[[str], Awaitable[S]],
+    max_chars: int,
+) -> S:
+    if len(partials) == 1:
+        return partials[0]
+
+    rendered = [_render_partial(i, p) for i, p in enumerate(partials, start=1)]
+    if sum(len(r) + 2 for r in rendered) > max_chars and len(partials) > 2:
+        # Still too large for one reduce prompt: reduce in groups, then reduce the groups
+        groups: List[List[S]] = []
+        current: List[S] = []
+        size = 0
+        for p, r in zip(partials, rendered, strict=True):
+            if current and size + len(r) > max_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(p)
+            size += len(r) + 2
+        if current:
+            groups.append(current)
+        if len(groups) < len(partials):
+            reduced = list(
+                await asyncio.gather(*(_reduce(g, schema, call, max_chars) for g in groups))
+            )
+            return await _reduce(reduced, schema, call, max_chars)
+
+    joined = "\n\n".join(rendered)
+    merged = await call(SUMMARY_REDUCE_PROMPT.format(partial_summaries=joined))
+    # Citations come from the map outputs, not from the reduce call (which may drop some)
+    citations = _merge_citations(partials)
+    return schema.model_validate(
+        {**merged.model_dump(), "citations": [c.model_dump() for c in citations]}
+    )
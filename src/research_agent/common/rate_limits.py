@@ -0,0 +1,418 @@
+# common/rate_limits.py
+
+"""
+Process-wide adaptive scheduler for external providers (OpenAI, Tavily, Firecrawl,
+NCBI) and for the research-direction fan-out.
+
+Every provider gets an `AdaptiveLimiter`: a token bucket (requests/second + burst)
+plus a concurrency limit. Both adapt AIMD-style from what we observe:
+
+- success with acceptable latency -> additive increase (concurrency +1 per "window",
+  rate creeps back toward its configured ceiling)
+- 429 / rate-limit error          -> multiplicative decrease (concurrency and rate halved)
+- latency far above target        -> gentle multiplicative decrease
+
+A throttle on any provider also shrinks the "research_directions" lane, so fewer
+directions run at once while we are being pushed back.
+
+Usage:
+    async with rate_limited("tavily"):
+        result = await client.search(...)
+
+    config = {"callbacks": [LLMConcurrencyBudget()]}  # covers every chat-model call in the run
+
+Limits can be overridden with env vars, e.g. RATE_LIMIT_TAVILY_RPS=2,
+RATE_LIMIT_TAVILY_BURST=4, RATE_LIMIT_TAVILY_CONCURRENCY=6.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Literal, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+Provider = Literal["openai", "tavily", "firecrawl", "ncbi", "research_directions"]
+
+DIRECTIONS_LANE = "research_directions"
+
+
+@dataclass(frozen=True)
+class LimiterConfig:
+    rate: Optional[float]           # requests/second ceiling; None = no token bucket
+    burst: int                      # bucket capacity
+    max_concurrency: int            # hard ceiling for the adaptive concurrency limit
+    initial_concurrency: int        # where AIMD starts
+    target_latency: Optional[float] = None  # seconds; None = latency does not matter
+
+
+DEFAULT_LIMITER_CONFIGS: Dict[str, LimiterConfig] = {
+    "openai": LimiterConfig(
+        rate=8.0, burst=16, max_concurrency=24, initial_concurrency=8, target_latency=60.0
+    ),
+    "tavily": LimiterConfig(
+        rate=4.0, burst=8, max_concurrency=12, initial_concurrency=4, target_latency=15.0
+    ),
+    "firecrawl": LimiterConfig(
+        rate=2.0, burst=4, max_concurrency=8, initial_concurrency=3, target_latency=30.0
+    ),
+    # NCBI allows 3 req/s without an API key, 10 with one.
+    "ncbi": LimiterConfig(
+        rate=10.0 if os.getenv("NCBI_API_KEY") else 3.0,
+        burst=3,
+        max_concurrency=6,
+        initial_concurrency=3,
+        target_latency=10.0,
+    ),
+    # Replaces the old fixed MAX_PARALLEL_DIRECTIONS=2.
+    DIRECTIONS_LANE: LimiterConfig(rate=None, burst=1, max_concurrency=8, initial_concurrency=3),
+}
+
+_FALLBACK_CONFIG = LimiterConfig(rate=5.0, burst=5, max_concurrency=8, initial_concurrency=4)
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={raw!r}")
+        return default
+
+
+def _config_from_env(name: str, base: LimiterConfig) -> LimiterConfig:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    max_concurrency = int(_env_number(f"{prefix}_CONCURRENCY", base.max_concurrency))
+    return LimiterConfig(
+        rate=_env_number(f"{prefix}_RPS", base.rate) if base.rate is not None else None,
+        burst=max(1, int(_env_number(f"{prefix}_BURST", base.burst))),
+        max_concurrency=max(1, max_concurrency),
+        initial_concurrency=max(1, min(base.initial_concurrency, max_concurrency)),
+        target_latency=base.target_latency,
+    )
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Best-effort detection of provider push-back (HTTP 429 / quota errors) across SDKs."""
+    for attr in ("status", "status_code", "code"):
+        if getattr(error, attr, None) == 429:
+            return True
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None) == 429:
+        return True
+    name = type(error).__name__.lower()
+    if "ratelimit" in name or "usagelimit" in name or "toomanyrequests" in name:
+        return True
+    # Only phrases; a bare "429" also shows up in ids, token counts and URLs
+    text = str(error).lower()
+    return "rate limit" in text or "too many requests" in text
+
+
+# -----------------------------------------------------------------------------
+# Adaptive limiter
+# -----------------------------------------------------------------------------
+
+class AsyncTokenBucket:
+    """Classic token bucket: `rate` tokens/second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until `tokens` are available and take them. Returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate if self.rate > 0 else 1.0
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """Token bucket + AIMD concurrency limit for one provider (or lane)."""
+
+    def __init__(self, name: str, config: LimiterConfig) -> None:
+        self.name = name
+        self.config = config
+        self.limit = float(config.initial_concurrency)
+        self.in_flight = 0
+        self.bucket = AsyncTokenBucket(config.rate, config.burst) if config.rate else None
+        self._cond = asyncio.Condition()
+
+        self.calls = 0
+        self.throttles = 0
+        self.errors = 0
+        self.wait_seconds = 0.0
+        self.latency_ewma: Optional[float] = None
+
+    # --- AIMD ----------------------------------------------------------------
+
+    def _increase(self) -> None:
+        # +1 per "window" of `limit` successes
+        step = 1.0 / max(self.limit, 1.0)
+        self.limit = min(float(self.config.max_concurrency), self.limit + step)
+        if self.bucket is not None and self.config.rate:
+            self.bucket.rate = min(self.config.rate, self.bucket.rate + self.config.rate * 0.05)
+
+    def _decrease(self, factor: float) -> None:
+        self.limit = max(1.0, self.limit * factor)
+        if self.bucket is not None and self.config.rate:
+            self.bucket.rate = max(self.config.rate * 0.1, self.bucket.rate * factor)
+
+    def on_throttle(self) -> None:
+        self.throttles += 1
+        self._decrease(0.5)
+        logger.warning(
+            f"🐢 {self.name} throttled: concurrency→{self.limit:.1f}"
+            + (f", rate→{self.bucket.rate:.2f}/s" if self.bucket else "")
+        )
+
+    def _observe(self, latency: float, throttled: bool, error: bool) -> None:
+        if throttled:
+            self.on_throttle()
+            return
+        if error:
+            self.errors += 1
+            return
+
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+        target = self.config.target_latency
+        if target is None or latency <= target:
+            self._increase()
+        elif latency > 3 * target:
+            self._decrease(0.9)
+
+    def reconfigure(self, config: LimiterConfig) -> None:
+        """Apply new caps in place; slots already held are still released here."""
+        self.config = config
+        self.limit = float(config.initial_concurrency)
+        if config.rate:
+            if self.bucket is None:
+                self.bucket = AsyncTokenBucket(config.rate, config.burst)
+            else:
+                self.bucket.rate = config.rate
+                self.bucket.capacity = config.burst
+        else:
+            self.bucket = None
+
+    # --- acquire / release ---------------------------------------------------
+
+    async def acquire(self) -> float:
+        """Wait for a concurrency slot and a token. Returns seconds waited."""
+        start = time.perf_counter()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        if self.bucket is not None:
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                await self._release_slot()
+                raise
+        waited = time.perf_counter() - start
+        self.wait_seconds += waited
+        self.calls += 1
+        return waited
+
+    async def _release_slot(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    async def release(
+        self, latency: float, *, throttled: bool = False, error: bool = False
+    ) -> None:
+        self._observe(latency, throttled, error)
+        await self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "rate": round(self.bucket.rate, 2) if self.bucket else None,
+            "calls": self.calls,
+            "throttles": self.throttles,
+            "errors": self.errors,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Process-wide scheduler
+# -----------------------------------------------------------------------------
+
+class ProviderScheduler:
+    """Holds one AdaptiveLimiter per provider/lane; shared by all graphs in the process."""
+
+    def __init__(self, configs: Optional[Dict[str, LimiterConfig]] = None) -> None:
+        self._configs = dict(configs or DEFAULT_LIMITER_CONFIGS)
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, name: str) -> AdaptiveLimiter:
+        lim = self._limiters.get(name)
+        if lim is None:
+            base = self._configs.get(name, _FALLBACK_CONFIG)
+            lim = AdaptiveLimiter(name, _config_from_env(name, base))
+            self._limiters[name] = lim
+        return lim
+
+    def configure(self, name: str, **overrides: Any) -> AdaptiveLimiter:
+        """
+        Override a limiter's config (e.g. `configure("openai", max_concurrency=12)`).
+        An existing limiter is updated in place, so calls in flight keep releasing
+        into the same slot accounting.
+        """
+        base = self._configs.get(name, _FALLBACK_CONFIG)
+        fields = {**base.__dict__, **overrides}
+        fields["initial_concurrency"] = min(
+            fields["initial_concurrency"], fields["max_concurrency"]
+        )
+        config = LimiterConfig(**fields)
+        self._configs[name] = config
+        lim = self._limiters.get(name)
+        if lim is None:
+            return self.limiter(name)
+        lim.reconfigure(_config_from_env(name, config))
+        return lim
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[AdaptiveLimiter]:
+        """Run a block under the provider's concurrency + rate limit, feeding back the outcome."""
+        lim = self.limiter(name)
+        waited = await lim.acquire()
+        if waited > 0.5:
+            logger.debug(f"⏳ {name}: waited {waited:.2f}s for a slot")
+        start = time.perf_counter()
+        try:
+            yield lim
+        except asyncio.CancelledError:
+            await lim.release(time.perf_counter() - start, error=True)
+            raise
+        except Exception as e:
+            throttled = is_rate_limit_error(e)
+            await lim.release(time.perf_counter() - start, throttled=throttled, error=True)
+            if throttled and name != DIRECTIONS_LANE:
+                self.limiter(DIRECTIONS_LANE).on_throttle()
+            raise
+        else:
+            await lim.release(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: lim.stats() for name, lim in self._limiters.items()}
+
+    def log_stats(self, level: int = logging.INFO) -> None:
+        for name, s in self.stats().items():
+            logger.log(level, f"🚦 SCHEDULER [{name}] {s}")
+
+
+scheduler = ProviderScheduler()
+
+
+def rate_limited(provider: str) -> Any:
+    """`async with rate_limited("tavily"): ...` — shorthand for scheduler.slot(provider)."""
+    return scheduler.slot(provider)
+
+
+def direction_slot() -> Any:
+    """Slot in the adaptive research-direction lane (shared by evidence + entity subgraphs)."""
+    return scheduler.slot(DIRECTIONS_LANE)
+
+
+# -----------------------------------------------------------------------------
+# LLM calls via callbacks
+# -----------------------------------------------------------------------------
+
+class LLMConcurrencyBudget(AsyncCallbackHandler):
+    """
+    Routes every chat-model call in a run through the scheduler's "openai" limiter.
+
+    Slots are acquired in on_chat_model_start / on_llm_start and released in
+    on_llm_end / on_llm_error (keyed by run_id, so never released twice); rate-limit
+    errors shrink the limiter exactly like tool-side 429s do.
+    """
+
+    raise_error = True  # propagate cancellation while waiting for a slot
+
+    def __init__(
+        self,
+        max_concurrent_calls: Optional[int] = None,
+        provider: str = "openai",
+        scheduler_: Optional[ProviderScheduler] = None,
+    ) -> None:
+        super().__init__()
+        self.provider = provider
+        self.scheduler = scheduler_ or scheduler
+        if max_concurrent_calls is not None:
+            self.scheduler.configure(
+                provider,
+                max_concurrency=max_concurrent_calls,
+                initial_concurrency=max_concurrent_calls,
+            )
+        # run_id -> (limiter the slot came from, start time)
+        self._started: Dict[UUID, Tuple[AdaptiveLimiter, float]] = {}
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LLMConcurrencyBudget":
+        # Run configs get deep-copied (e.g. with_checkpoint_ns); the budget must stay shared.
+        return self
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        return self.scheduler.limiter(self.provider)
+
+    async def _acquire(self, run_id: UUID) -> None:
+        limiter = self.limiter
+        await limiter.acquire()
+        self._started[run_id] = (limiter, time.perf_counter())
+
+    async def _release(self, run_id: UUID, *, throttled: bool = False, error: bool = False) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        limiter, start = started
+        await limiter.release(time.perf_counter() - start, throttled=throttled, error=error)
+        if throttled:
+            self.scheduler.limiter(DIRECTIONS_LANE).on_throttle()
+
+    async def on_chat_model_start(
+        self, serialized: Any, messages: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        await self._acquire(run_id)
+
+    async def on_llm_start(
+        self, serialized: Any, prompts: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        await self._acquire(run_id)
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        await self._release(run_id)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        await self._release(run_id, throttled=is_rate_limit_error(error), error=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.limiter.stats()
@@ -0,0 +1,343 @@
+# common/research_aggregation.py
+
+"""
+Builds the "aggregated research content" block that output nodes send to the
+(expensive) structured-result model, without repeating the same text.
+
+The same synthesis usually reaches the output node two or three times: as the
+intermediate-summary JSON file in `file_refs`, as the compact note that
+write_*_summary_tool also appends to `research_notes`, and as the Tavily/Firecrawl
+summaries the tools append to notes. This module:
+
+- reads `file_refs` concurrently and renders JSON summaries as plain "key: value"
+  text (no indentation / quoting overhead)
+- drops exact duplicates (hash of normalized text) and near-duplicates (word
+  shingles: Jaccard similarity or containment in an already-kept fragment)
+- ranks fragments by confidence (parsed from the summary / note), source
+  (structured summary files first) and recency, and keeps the best ones that fit
+  a token budget (the last one may be truncated)
+- emits the kept fragments in their original order under the usual section headers
+
+Usage:
+    content, stats = await aggregate_research_content(
+        file_refs,
+        notes,
+        read=read_file,
+        files_header="=== INTERMEDIATE EVIDENCE SUMMARIES (from files) ===",
+    )
+    logger.info(f"Aggregation: {stats.as_dict()}")
+
+Env overrides: RESEARCH_AGGREGATION_TOKEN_BUDGET, RESEARCH_AGGREGATION_NEAR_DUP.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+AGGREGATION_TOKEN_BUDGET = int(os.getenv("RESEARCH_AGGREGATION_TOKEN_BUDGET", "24000"))
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("RESEARCH_AGGREGATION_NEAR_DUP", "0.8"))
+
+NOTES_HEADER = "=== RESEARCH NOTES ==="
+SHINGLE_SIZE = 5
+DEFAULT_CONFIDENCE = 0.5
+# Don't bother truncating a fragment into less than this many tokens
+MIN_TRUNCATED_TOKENS = 200
+FILE_READ_CONCURRENCY = 16
+
+_WORD_RE = re.compile(r"\w+")
+_CONFIDENCE_RE = re.compile(r"confidence\W{0,4}(\d+(?:\.\d+)?)(\s*%)?", re.IGNORECASE)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Same chars/4 heuristic the tool-loop compaction uses."""
+    return (len(text) + 3) // 4
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return frozenset({hash(" ".join(words))}) if words else frozenset()
+    return frozenset(hash(" ".join(words[i:i + size])) for i in range(len(words) - size + 1))
+
+
+def _render_json(value: Any, indent: str = "") -> str:
+    """Render a JSON summary as compact readable lines."""
+    if isinstance(value, dict):
+        lines = []
+        for k, v in value.items():
+            if v in (None, "", [], {}):
+                continue
+            children = v.values() if isinstance(v, dict) else v
+            if isinstance(v, (dict, list)) and any(isinstance(x, (dict, list)) for x in children):
+                lines.append(f"{indent}{k}:")
+                lines.append(_render_json(v, indent + "  "))
+            elif isinstance(v, list):
+                lines.append(f"{indent}{k}: " + "; ".join(str(x) for x in v))
+            elif isinstance(v, dict):
+                lines.append(f"{indent}{k}: " + json.dumps(v, ensure_ascii=False, default=str))
+            else:
+                lines.append(f"{indent}{k}: {v}")
+        return "\n".join(lines)
+    if isinstance(value, list):
+        return "\n".join(
+            f"{indent}- " + _render_json(x, indent + "  ").lstrip()
+            if isinstance(x, (dict, list))
+            else f"{indent}- {x}"
+            for x in value
+        )
+    return f"{indent}{value}"
+
+
+@dataclass
+class Fragment:
+    text: str
+    source: str                 # "file" | "note"
+    order: int                  # position in the run; higher = more recent
+    label: str = ""
+    confidence: float = DEFAULT_CONFIDENCE
+    tokens: int = 0
+    shingles: FrozenSet[int] = field(default_factory=frozenset)
+
+    def render(self) -> str:
+        return f"--- File: {self.label} ---\n{self.text}" if self.source == "file" else self.text
+
+
+@dataclass
+class AggregationStats:
+    fragments: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    dropped_for_budget: int = 0
+    truncated: int = 0
+    unreadable_files: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_in - self.tokens_out)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fragments": self.fragments,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "dropped_for_budget": self.dropped_for_budget,
+            "truncated": self.truncated,
+            "unreadable_files": self.unreadable_files,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+def _normalize_confidence(value: float, percent: bool = False) -> float:
+    """0-1 scale: explicit percentages and values in (1, 100] are read as percent."""
+    if value != value:  # NaN
+        return DEFAULT_CONFIDENCE
+    if percent or 1.0 < value <= 100.0:
+        value /= 100.0
+    return min(1.0, max(0.0, value))
+
+
+def _confidence_of(text: str, parsed: Optional[Any] = None) -> float:
+    if isinstance(parsed, dict):
+        value = parsed.get("confidence")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return _normalize_confidence(float(value))
+    m = _CONFIDENCE_RE.search(text)
+    if m:
+        return _normalize_confidence(float(m.group(1)), percent=bool(m.group(2)))
+    return DEFAULT_CONFIDENCE
+
+
+def _file_fragment(path: str, raw: str, order: int) -> Fragment:
+    parsed: Optional[Any] = None
+    text = raw
+    if path.endswith(".json"):
+        try:
+            parsed = json.loads(raw)
+            text = _render_json(parsed)
+        except ValueError:
+            pass
+    return Fragment(
+        text=text.strip(),
+        source="file",
+        order=order,
+        label=path,
+        confidence=_confidence_of(raw, parsed),
+    )
+
+
+async def _read_files(
+    file_refs: Sequence[str],
+    read: Callable[[str], Awaitable[str]],
+    stats: AggregationStats,
+) -> List[Tuple[str, Optional[str]]]:
+    sem = asyncio.Semaphore(FILE_READ_CONCURRENCY)
+
+    async def one(path: str) -> Tuple[str, Optional[str]]:
+        async with sem:
+            try:
+                return path, await read(path)
+            except FileNotFoundError:
+                logger.warning(f"    File not found: {path}")
+            except Exception as e:
+                logger.warning(f"    Error reading {path}: {e}")
+            stats.unreadable_files += 1
+            return path, None
+
+    return await asyncio.gather(*(one(p) for p in file_refs))
+
+
+def _is_near_duplicate(frag: Fragment, kept: Sequence[Fragment], threshold: float) -> bool:
+    if not frag.shingles:
+        return False
+    for other in kept:
+        if not other.shingles:
+            continue
+        overlap = len(frag.shingles & other.shingles)
+        if not overlap:
+            continue
+        jaccard = overlap / len(frag.shingles | other.shingles)
+        containment = overlap / len(frag.shingles)
+        if jaccard >= threshold or containment >= threshold:
+            return True
+    return False
+
+
+def _truncate_to_tokens(text: str, tokens: int) -> str:
+    cut = text[: max(0, tokens * 4 - 20)]
+    # Prefer cutting at a paragraph / line boundary
+    for sep in ("\n\n", "\n", ". "):
+        idx = cut.rfind(sep)
+        if idx > len(cut) // 2:
+            cut = cut[:idx]
+            break
+    return cut.rstrip() + "\n…[truncated]"
+
+
+def select_fragments(
+    fragments: Sequence[Fragment],
+    *,
+    budget_tokens: int = AGGREGATION_TOKEN_BUDGET,
+    near_duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    stats: Optional[AggregationStats] = None,
+) -> List[Fragment]:
+    """Dedupe, rank and budget fragments; returns the kept ones in their original order."""
+    stats = stats or AggregationStats()
+    seen_hashes: set = set()
+    unique: List[Fragment] = []
+    for frag in fragments:
+        if not frag.text:
+            continue
+        digest = hashlib.sha256(_normalize(frag.text).encode("utf-8")).hexdigest()
+        if digest in seen_hashes:
+            stats.exact_duplicates += 1
+            continue
+        seen_hashes.add(digest)
+        frag.tokens = frag.tokens or estimate_text_tokens(frag.render())
+        frag.shingles = frag.shingles or _shingles(frag.text)
+        unique.append(frag)
+
+    # Best first: confident, structured summaries, then most recent
+    ranked = sorted(
+        unique,
+        key=lambda f: (round(f.confidence, 2), f.source == "file", f.order),
+        reverse=True,
+    )
+
+    kept: List[Fragment] = []
+    remaining = budget_tokens
+    for frag in ranked:
+        if _is_near_duplicate(frag, kept, near_duplicate_threshold):
+            stats.near_duplicates += 1
+            continue
+        if frag.tokens <= remaining:
+            kept.append(frag)
+            remaining -= frag.tokens
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            header_tokens = frag.tokens - estimate_text_tokens(frag.text)
+            text = _truncate_to_tokens(frag.text, remaining - header_tokens - 5)
+            trimmed = Fragment(
+                text=text, source=frag.source, order=frag.order, label=frag.label,
+                confidence=frag.confidence, shingles=frag.shingles,
+            )
+            trimmed.tokens = estimate_text_tokens(trimmed.render())
+            kept.append(trimmed)
+            remaining -= trimmed.tokens
+            stats.truncated += 1
+        else:
+            stats.dropped_for_budget += 1
+
+    return sorted(kept, key=lambda f: f.order)
+
+
+async def aggregate_research_content(
+    file_refs: Sequence[str],
+    notes: Sequence[str],
+    *,
+    read: Callable[[str], Awaitable[str]],
+    files_header: str,
+    budget_tokens: int = AGGREGATION_TOKEN_BUDGET,
+    near_duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> Tuple[str, AggregationStats]:
+    """
+    Build the deduplicated, budgeted aggregated content for an output node.
+
+    Returns ("", stats) when nothing was collected; callers keep their own
+    placeholder text for that case.
+    """
+    stats = AggregationStats()
+    fragments: List[Fragment] = []
+
+    # Files and notes are each appended in chronological order; files come from the
+    # summary tools, which also append their note at the same moment, so interleave
+    # them by position to approximate recency across both lists
+    file_contents = await _read_files(list(dict.fromkeys(file_refs)), read, stats)
+    total = max(len(file_contents), len(notes), 1)
+    for i, (path, raw) in enumerate(file_contents):
+        if raw is not None:
+            fragments.append(_file_fragment(path, raw, order=int(i * 1000 / total)))
+    for i, note in enumerate(notes):
+        if note and note.strip():
+            fragments.append(
+                Fragment(
+                    text=note.strip(),
+                    source="note",
+                    order=int(i * 1000 / total),
+                    confidence=_confidence_of(note),
+                )
+            )
+
+    stats.fragments = len(fragments)
+    stats.tokens_in = sum(estimate_text_tokens(f.render()) for f in fragments)
+
+    kept = select_fragments(
+        fragments,
+        budget_tokens=budget_tokens,
+        near_duplicate_threshold=near_duplicate_threshold,
+        stats=stats,
+    )
+
+    sections: List[str] = []
+    kept_files = [f.render() for f in kept if f.source == "file"]
+    kept_notes = [f.render() for f in kept if f.source == "note"]
+    if kept_files:
+        sections.append(f"{files_header}\n\n" + "\n\n".join(kept_files) + "\n\n")
+    if kept_notes:
+        sections.append(f"{NOTES_HEADER}\n\n" + "\n\n---\n\n".join(kept_notes))
+    content = "".join(sections)
+    stats.tokens_out = estimate_text_tokens(content)
+    return content, stats
@@ -0,0 +1,463 @@
+# common/response_cache.py
+
+"""
+Content-addressed response cache for paid / slow external API calls
+(Tavily search/extract/map, Firecrawl scrapes, ...).
+
+Entries are keyed on a namespace (e.g. 'tavily_search') plus the normalized
+request parameters, and expire after a per-namespace TTL. Two backends are
+provided and can be stacked:
+
+- InMemoryLRUBackend: bounded, process-local, fastest.
+- SQLiteBackend: on-disk, shared across runs / processes on the same machine.
+  The file is opened on first use; default paths live under RESPONSE_CACHE_DIR.
+
+Usage:
+    cache = ResponseCache([InMemoryLRUBackend(), SQLiteBackend("cache.sqlite3")])
+    result = await cache.get_or_fetch(
+        "tavily_search",
+        {"query": query, "max_results": 5},
+        lambda: client.search(query=query, max_results=5),
+    )
+    cache.log_stats()
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Union,
+)
+
+PathLike = Union[str, os.PathLike]
+
+logger = logging.getLogger(__name__)
+
+# Where the default on-disk caches go (absolute, so it does not depend on the cwd)
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "research_agent",
+)
+
+
+def default_cache_path(filename: str) -> str:
+    return os.path.join(RESPONSE_CACHE_DIR, filename)
+
+
+# -----------------------------------------------------------------------------
+# Entries + stats
+# -----------------------------------------------------------------------------
+
+@dataclass
+class CacheEntry:
+    value: Any
+    created_at: float
+    expires_at: Optional[float]  # None = never expires
+    fetch_seconds: float = 0.0   # how long the original (uncached) call took
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0           # waited on an identical in-flight fetch (not a hit)
+    errors: int = 0
+    fetch_seconds: float = 0.0   # wall time spent on real (paid) calls
+    saved_seconds: float = 0.0   # estimated latency avoided by cache hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+            "fetch_seconds": round(self.fetch_seconds, 3),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+# -----------------------------------------------------------------------------
+# Key normalization
+# -----------------------------------------------------------------------------
+
+def normalize_text(s: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share a key."""
+    return " ".join((s or "").strip().split()).lower()
+
+
+def normalize_url(url: str) -> str:
+    """Strip whitespace, a trailing slash and the fragment from a URL."""
+    u = (url or "").strip()
+    if "#" in u:
+        u = u.split("#", 1)[0]
+    return u.rstrip("/")
+
+
+def make_cache_key(namespace: str, params: Mapping[str, Any]) -> str:
+    """
+    Build a stable key from a namespace and request params.
+
+    Params are serialized as sorted JSON, so dict ordering does not matter.
+    Callers are responsible for normalizing values (see normalize_text/normalize_url).
+    """
+    payload = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# -----------------------------------------------------------------------------
+# Backends
+# -----------------------------------------------------------------------------
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    async def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryLRUBackend:
+    """
+    Bounded in-process LRU. Not shared across processes. Values are copied in and
+    out, so callers can't mutate each other's results.
+    """
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        self._data.move_to_end(key)
+        return replace(entry, value=copy.deepcopy(entry.value))
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._data[key] = replace(entry, value=copy.deepcopy(entry.value))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """
+    On-disk backend using a single SQLite file.
+
+    Values must be JSON-serializable. All sqlite calls run in a worker thread
+    so the event loop is never blocked on disk I/O. The directory and file are
+    created on first use, not at construction.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds self._lock
+        if self._conn is None:
+            dir_path = os.path.dirname(self.path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    fetch_seconds REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get_sync(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, created_at, expires_at, fetch_seconds "
+                "FROM response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at, expires_at, fetch_seconds = row
+        return CacheEntry(
+            value=json.loads(value),
+            created_at=created_at,
+            expires_at=expires_at,
+            fetch_seconds=fetch_seconds,
+        )
+
+    def _set_sync(self, key: str, entry: CacheEntry) -> None:
+        value = json.dumps(entry.value, default=str, ensure_ascii=False)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, value, created_at, expires_at, fetch_seconds) VALUES (?, ?, ?, ?, ?)",
+                (key, value, entry.created_at, entry.expires_at, entry.fetch_seconds),
+            )
+            conn.commit()
+
+    def _delete_sync(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows. Returns the number of rows removed."""
+        with self._lock:
+            conn = self._connection()
+            cur = conn.execute(
+                "DELETE FROM response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            conn.commit()
+            return cur.rowcount
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await asyncio.to_thread(self._set_sync, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete_sync, key)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# -----------------------------------------------------------------------------
+# Cache front-end
+# -----------------------------------------------------------------------------
+
+@dataclass
+class ResponseCache:
+    """
+    Tiered cache: backends are checked in order, and a hit in a later (slower)
+    backend is promoted into the earlier ones.
+
+    Concurrent identical requests are coalesced: only one fetch runs and the
+    other callers await its result.
+    """
+
+    backends: Sequence[CacheBackend]
+    ttls: Dict[str, Optional[float]] = field(default_factory=dict)  # namespace -> seconds
+    default_ttl: Optional[float] = 24 * 3600
+    enabled: bool = True
+
+    def __post_init__(self) -> None:
+        self._stats: Dict[str, CacheStats] = {}
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    # --- stats ---------------------------------------------------------------
+
+    def stats_for(self, namespace: str) -> CacheStats:
+        if namespace not in self._stats:
+            self._stats[namespace] = CacheStats()
+        return self._stats[namespace]
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {ns: s.as_dict() for ns, s in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        self._stats.clear()
+
+    def log_stats(self, level: int = logging.INFO) -> None:
+        for ns, s in self._stats.items():
+            logger.log(
+                level,
+                f"💾 CACHE [{ns}] hits={s.hits} misses={s.misses} coalesced={s.coalesced} "
+                f"hit_rate={s.hit_rate:.0%} paid_calls_saved={s.hits + s.coalesced} "
+                f"saved≈{s.saved_seconds:.1f}s fetch={s.fetch_seconds:.1f}s",
+            )
+
+    # --- core ----------------------------------------------------------------
+
+    def ttl_for(self, namespace: str) -> Optional[float]:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    async def _lookup(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        for idx, backend in enumerate(self.backends):
+            try:
+                entry = await backend.get(key)
+            except Exception as e:
+                logger.warning(f"Cache backend {type(backend).__name__} get failed: {e}")
+                continue
+            if entry is None:
+                continue
+            if entry.is_expired(now):
+                try:
+                    await backend.delete(key)
+                except Exception as e:
+                    logger.warning(f"Cache backend {type(backend).__name__} delete failed: {e}")
+                continue
+            # Promote into faster tiers; a failed promotion is still a hit
+            for faster in self.backends[:idx]:
+                try:
+                    await faster.set(key, entry)
+                except Exception as e:
+                    logger.warning(f"Cache backend {type(faster).__name__} set failed: {e}")
+            return entry
+        return None
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        for backend in self.backends:
+            try:
+                await backend.set(key, entry)
+            except Exception as e:
+                logger.warning(f"Cache backend {type(backend).__name__} set failed: {e}")
+
+    async def get(self, namespace: str, params: Mapping[str, Any]) -> Optional[Any]:
+        """Return a cached value (or None) without fetching. Does not touch stats."""
+        entry = await self._lookup(make_cache_key(namespace, params))
+        return entry.value if entry is not None else None
+
+    async def set(
+        self,
+        namespace: str,
+        params: Mapping[str, Any],
+        value: Any,
+        fetch_seconds: float = 0.0,
+    ) -> None:
+        now = time.time()
+        ttl = self.ttl_for(namespace)
+        await self._store(
+            make_cache_key(namespace, params),
+            CacheEntry(
+                value=value,
+                created_at=now,
+                expires_at=(now + ttl) if ttl is not None else None,
+                fetch_seconds=fetch_seconds,
+            ),
+        )
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        params: Mapping[str, Any],
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for (namespace, params), or call `fetch()`,
+        store its result and return it. Exceptions from `fetch` are not cached.
+
+        `accept(value)` can reject a cached value (e.g. past a freshness window);
+        it is then treated as a miss, and `fetch` may still read it via `get()`.
+        """
+        if not self.enabled:
+            return await fetch()
+
+        stats = self.stats_for(namespace)
+        key = make_cache_key(namespace, params)
+
+        entry = await self._lookup(key)
+        if entry is not None and (accept is None or accept(entry.value)):
+            stats.hits += 1
+            stats.saved_seconds += entry.fetch_seconds
+            logger.debug(f"💾 CACHE HIT [{namespace}] {key[-12:]}")
+            return entry.value
+
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not inflight.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # The leader was cancelled, not us: the first waiter to wake takes over
+                continue
+            stats.coalesced += 1
+            return copy.deepcopy(value)
+
+        stats.misses += 1
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        start = time.perf_counter()
+        try:
+            try:
+                value = await fetch()
+            except Exception as e:
+                stats.errors += 1
+                future.set_exception(e)
+                # Mark retrieved so an un-awaited future does not log a warning
+                future.exception()
+                raise
+            # Waiters get the value before the (possibly slow or failing) backend write
+            future.set_result(value)
+            elapsed = time.perf_counter() - start
+            stats.fetch_seconds += elapsed
+            await self.set(namespace, params, value, fetch_seconds=elapsed)
+        finally:
+            if not future.done():
+                # Cancelled mid-fetch: waiters see a cancelled future and re-run the fetch
+                future.cancel()
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        return value
+
+
+def build_response_cache(
+    sqlite_path: Optional[PathLike] = None,
+    *,
+    ttls: Optional[Dict[str, Optional[float]]] = None,
+    max_memory_entries: int = 2048,
+    enabled: bool = True,
+) -> ResponseCache:
+    """
+    Convenience constructor: in-memory LRU in front of an optional SQLite file
+    (opened on first use; failures there are logged and the memory tier still works).
+    """
+    backends: List[CacheBackend] = [InMemoryLRUBackend(max_entries=max_memory_entries)]
+    if sqlite_path:
+        backends.append(SQLiteBackend(sqlite_path))
+    return ResponseCache(backends=backends, ttls=dict(ttls or {}), enabled=enabled)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: per-call overhead of `create_agent(...)` vs the build-once registry.
+
+Runs offline. It uses a fake chat model, so only agent construction plus the
+LangGraph plumbing of one invoke is measured, not model latency.
+
+    python -m research_agent.common.run_agent_registry_benchmark [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from research_agent.common.agent_registry import clear_agent_registry, get_agent
+
+
+class _BenchSummary(BaseModel):
+    summary: str
+    key_findings: List[str]
+
+
+def _fake_model() -> GenericFakeChatModel:
+    # Endless stream of plain replies; the structured-output step is never reached
+    return GenericFakeChatModel(messages=iter(lambda: AIMessage(content="ok"), None))
+
+
+def _print_header(title: str) -> None:
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+async def _time_calls(fn: Callable[[], Awaitable[None]], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> float:
+    median = statistics.median(samples)
+    p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+    print(f"{label:<34} median={median:8.3f} ms   p95={p95:8.3f} ms   n={len(samples)}")
+    return median
+
+
+async def amain() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    model = _fake_model()
+    payload = {"messages": [{"role": "user", "content": "summarize"}]}
+
+    _print_header("1) Agent construction only")
+
+    async def build_fresh() -> None:
+        create_agent(model, response_format=_BenchSummary)
+
+    async def build_cached() -> None:
+        get_agent(model, response_format=_BenchSummary)
+
+    clear_agent_registry()
+    before = _report("create_agent per call", await _time_calls(build_fresh, iterations))
+    after = _report("get_agent (registry)", await _time_calls(build_cached, iterations))
+    print(f"→ construction speedup: {before / max(after, 1e-9):,.0f}x")
+
+    _print_header("2) Construction + one invoke (fake model, no structured output)")
+
+    async def invoke_fresh() -> None:
+        await create_agent(model).ainvoke(payload)
+
+    async def invoke_cached() -> None:
+        await get_agent(model).ainvoke(payload)
+
+    clear_agent_registry()
+    before = _report("create_agent + ainvoke", await _time_calls(invoke_fresh, iterations))
+    after = _report("get_agent + ainvoke", await _time_calls(invoke_cached, iterations))
+    print(f"→ per-call overhead saved: {before - after:.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
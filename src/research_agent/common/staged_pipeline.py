@@ -0,0 +1,252 @@
+# common/staged_pipeline.py
+
+"""
+Small multi-stage async pipeline: bounded queues between stages, a separate
+worker count per stage, per-item failure isolation and per-stage stats.
+
+Each stage is an async function `item -> item | None`. Returning None drops the
+item (e.g. "already done, nothing left to do"); raising records a failure for
+that item and the pipeline keeps going. Because every queue is bounded, a slow
+stage back-pressures the ones before it instead of piling up work in memory,
+while cheap I/O stages overlap with the slow (LLM) ones.
+
+Usage:
+    report = await run_pipeline(
+        jobs,
+        [
+            Stage("fetch", fetch, workers=8),
+            Stage("summarize", summarize, workers=4),
+            Stage("store", store, workers=2),
+        ],
+        key=lambda job: job.url,
+    )
+    print(report.summary())
+
+The episode summary workflows share one stage layout; `summary_stages` wires it
+with the SUMMARY_PIPELINE_* worker counts:
+
+    stages = summary_stages(
+        fetch=fetch,
+        summarize=summarize,
+        save_initial=save_initial,
+        final_summary=final_summary,
+        mongo_update=mongo_update,
+        after=[Stage("embed", embed, workers=1)],
+    )
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Summary pipeline workers per stage kind (LLM stages are the slow ones) and queue
+# bound between stages
+PIPELINE_IO_WORKERS = int(os.getenv("SUMMARY_PIPELINE_IO_WORKERS", "8"))
+PIPELINE_LLM_WORKERS = int(os.getenv("SUMMARY_PIPELINE_LLM_WORKERS", "4"))
+PIPELINE_STORE_WORKERS = int(os.getenv("SUMMARY_PIPELINE_STORE_WORKERS", "2"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("SUMMARY_PIPELINE_QUEUE_SIZE", "4"))
+
+# Marks the end of a queue; one per downstream worker
+_DONE = object()
+
+
+@dataclass
+class Stage(Generic[T]):
+    name: str
+    fn: Callable[[T], Awaitable[Optional[T]]]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0        # summed over workers
+    max_queue_depth: int = 0         # deepest backlog waiting in front of this stage
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    @property
+    def active_seconds(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    @property
+    def items_per_second(self) -> float:
+        return self.processed / self.active_seconds if self.active_seconds else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Busy time / (workers x active time): ~1.0 means this stage is the bottleneck."""
+        capacity = self.workers * self.active_seconds
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "active_seconds": round(self.active_seconds, 3),
+            "items_per_second": round(self.items_per_second, 3),
+            "utilization": round(self.utilization, 3),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class PipelineReport(Generic[T]):
+    stages: List[StageStats]
+    completed: List[T] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Pipeline: {len(self.completed)} completed, {len(self.failures)} failed"
+            f" in {self.seconds:.2f}s"
+        ]
+        for s in self.stages:
+            lines.append(
+                f"  {s.name:<16} x{s.workers:<2} {s.processed:>4} done {s.dropped:>4} skipped"
+                f" {s.failed:>3} failed  {s.items_per_second:>6.2f}/s"
+                f"  util {s.utilization:>4.0%}  max queue {s.max_queue_depth}"
+            )
+        for k, err in self.failures.items():
+            lines.append(f"  ⚠️  {k}: {err}")
+        return "\n".join(lines)
+
+
+def summary_stages(
+    *,
+    fetch: Callable[[T], Awaitable[Optional[T]]],
+    summarize: Callable[[T], Awaitable[Optional[T]]],
+    save_initial: Callable[[T], Awaitable[Optional[T]]],
+    final_summary: Callable[[T], Awaitable[Optional[T]]],
+    mongo_update: Callable[[T], Awaitable[Optional[T]]],
+    mongo_workers: int = PIPELINE_STORE_WORKERS,
+    after: Sequence[Stage[T]] = (),
+) -> List[Stage[T]]:
+    """
+    fetch (I/O) -> summarize (LLM) -> save initial outputs -> final summary (LLM)
+    -> Mongo update, followed by any `after` stages.
+    """
+    return [
+        Stage("fetch", fetch, workers=PIPELINE_IO_WORKERS),
+        Stage("summarize", summarize, workers=PIPELINE_LLM_WORKERS),
+        Stage("save_initial", save_initial, workers=PIPELINE_STORE_WORKERS),
+        Stage("final_summary", final_summary, workers=PIPELINE_LLM_WORKERS),
+        Stage("mongo_update", mongo_update, workers=mongo_workers),
+        *after,
+    ]
+
+
+async def run_pipeline(
+    items: Iterable[T],
+    stages: Sequence[Stage[T]],
+    *,
+    key: Callable[[T], str] = str,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> PipelineReport[T]:
+    """
+    Push `items` through `stages` in order and return once every item has left
+    the pipeline (completed, dropped or failed).
+    """
+    if not stages:
+        raise ValueError("run_pipeline needs at least one stage")
+
+    start = time.perf_counter()
+    stats = [StageStats(s.name, max(1, s.workers)) for s in stages]
+    report: PipelineReport[T] = PipelineReport(stages=stats)
+    # queues[i] feeds stage i; the last stage's output is collected directly
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in stages]
+
+    async def put(i: int, item: Any) -> None:
+        await queues[i].put(item)
+        if item is not _DONE:
+            stats[i].max_queue_depth = max(stats[i].max_queue_depth, queues[i].qsize())
+
+    remaining = [s.workers for s in stats]
+
+    async def worker(i: int) -> None:
+        stage, st = stages[i], stats[i]
+        while True:
+            item = await queues[i].get()
+            if item is _DONE:
+                break
+            t0 = time.perf_counter()
+            if st.first_start is None:
+                st.first_start = t0
+            try:
+                out = await stage.fn(item)
+            except Exception as e:
+                st.failed += 1
+                report.failures[f"{stage.name}:{key(item)}"] = f"{type(e).__name__}: {e}"
+                logger.warning(
+                    f"⚠️  Stage {stage.name} failed for {key(item)}: {type(e).__name__}: {e}"
+                )
+                out = None
+            else:
+                if out is None:
+                    st.dropped += 1
+                else:
+                    st.processed += 1
+            finally:
+                t1 = time.perf_counter()
+                st.busy_seconds += t1 - t0
+                st.last_end = t1
+
+            if out is not None:
+                if i + 1 < len(stages):
+                    await put(i + 1, out)
+                else:
+                    report.completed.append(out)
+
+        remaining[i] -= 1
+        if remaining[i] == 0 and i + 1 < len(stages):
+            for _ in range(stats[i + 1].workers):
+                await put(i + 1, _DONE)
+
+    async def feed() -> None:
+        for item in items:
+            await put(0, item)
+        for _ in range(stats[0].workers):
+            await put(0, _DONE)
+
+    tasks = [asyncio.create_task(feed())]
+    for i, st in enumerate(stats):
+        tasks.extend(asyncio.create_task(worker(i)) for _ in range(st.workers))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    report.seconds = time.perf_counter() - start
+    return report
@@ -12,6 +12,13 @@ This module implements a hierarchical LangGraph system for entity research:
    - Iterates through research directions (GUEST, BUSINESS, PRODUCT, COMPOUND, PLATFORM)
    - Invokes ResearchDirectionSubGraph for each direction
 
+Execution modes (state["execution_mode"], default from ENTITY_RESEARCH_MODE):
+   - "parallel":   bundles run concurrently (bounded by max_concurrent_bundles) and,
+                   within a bundle, directions run as soon as their dependencies in
+                   DIRECTION_DEPENDENCIES finish (bounded by the shared direction lane)
+   - "sequential": the original one-bundle / one-direction-at-a-time loops
+   Either way final_reports / file_refs are merged in bundle order, then queue order.
+
 3. ResearchDirectionSubGraph (Leaf Level)
    - Performs actual research for one direction (e.g., GUEST research)
    - Generates todos, uses LLM + tools loop, synthesizes final report
@@ -28,12 +35,14 @@ from langgraph.graph.state import CompiledStateGraph
 from langchain.tools import BaseTool 
 from langgraph.prebuilt import ToolNode 
 from typing_extensions import TypedDict, Annotated  
-from typing import List, Dict, Any, Optional, Sequence, Literal, Union
+from typing import List, Dict, Any, Optional, Sequence, Literal, Tuple, Union
 from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, ToolMessage, AnyMessage, AIMessage
 from langchain_openai import ChatOpenAI  
 from pydantic import BaseModel, Field  
 import operator   
-from langchain.agents import create_agent  
+import asyncio
+import os
+from research_agent.common.agent_registry import get_agent
 from datetime import datetime 
 from dotenv import load_dotenv 
 from langchain.agents.structured_output import ProviderStrategy 
@@ -79,6 +88,7 @@ from research_agent.human_upgrade.prompts.synthesis_prompts import (
 
 
 from research_agent.human_upgrade.logger import logger
+from research_agent.common.rate_limits import direction_slot
 from research_agent.human_upgrade.utils.artifacts import save_json_artifact, save_text_artifact
 
 from research_agent.clients.langsmith_client import pull_prompt_from_langsmith 
@@ -113,6 +123,25 @@ from research_agent.human_upgrade.base_models import gpt_4_1, gpt_5_mini, gpt_5_
 load_dotenv() 
 
 
+ExecutionMode = Literal["parallel", "sequential"]
+
+ENTITY_RESEARCH_MODE: ExecutionMode = (
+    "sequential" if os.getenv("ENTITY_RESEARCH_MODE", "parallel").lower() == "sequential" else "parallel"
+)
+MAX_CONCURRENT_BUNDLES: int = int(os.getenv("ENTITY_MAX_CONCURRENT_BUNDLES", "3"))
+
+# Direction DAG within a bundle: a direction starts once every direction it depends on
+# has finished (GUEST research lands files the others can read back).
+# Directions missing from a bundle's queue are ignored.
+DIRECTION_DEPENDENCIES: Dict[DirectionType, Tuple[DirectionType, ...]] = {
+    "GUEST": (),
+    "BUSINESS": ("GUEST",),
+    "PRODUCT": ("GUEST",),
+    "COMPOUND": ("GUEST",),
+    "PLATFORM": ("GUEST",),
+}
+
+
 # ========================================================================
 # STATE DEFINITIONS
 # ========================================================================
@@ -124,6 +153,9 @@ class EntityIntelResearchParentState(TypedDict, total=False):
     bundle_index: int
     completed_bundle_ids: List[str]
 
+    execution_mode: ExecutionMode
+    max_concurrent_bundles: int
+
     # optional rollups
     file_refs: Annotated[List[FileReference], operator.add]   
     structured_outputs: Annotated[List[BaseModel], operator.add] 
@@ -143,6 +175,7 @@ class EntityIntelResearchBundleState(TypedDict, total=False):
     direction_queue: List[Literal["GUEST", "BUSINESS", "PRODUCT", "COMPOUND", "PLATFORM"]]  
 
     direction_index: int 
+    execution_mode: ExecutionMode
 
     file_refs: Annotated[List[FileReference], operator.add]   
 
@@ -231,11 +264,13 @@ async def load_bundles_node(
         raise ValueError("ParentGraph requires state['bundles'] (EntityBundlesListFinal)")
 
     n: int = len(bundles_list.bundles)
-    logger.info(f"🧭 BundlesParentGraph loaded {n} bundles")
+    mode: ExecutionMode = state.get("execution_mode") or ENTITY_RESEARCH_MODE
+    logger.info(f"🧭 BundlesParentGraph loaded {n} bundles (mode={mode})")
 
     return {
         "bundle_index": 0,
         "completed_bundle_ids": [],
+        "execution_mode": mode,
     } 
 
 
@@ -249,6 +284,16 @@ def has_next_bundle(
     return "run_bundle" if idx < len(bundles_list.bundles) else "done" 
 
 
+def route_bundles(
+    state: EntityIntelResearchParentState,
+) -> Literal["run_bundles_parallel", "run_bundle", "done"]:
+    """Entry routing: fan out all bundles at once in parallel mode, else start the loop."""
+    nxt = has_next_bundle(state)
+    if nxt == "run_bundle" and state.get("execution_mode", ENTITY_RESEARCH_MODE) == "parallel":
+        return "run_bundles_parallel"
+    return nxt
+
+
 
 
 async def finalize_parent_node(
@@ -273,20 +318,7 @@ async def run_bundle_node(
     logger.info(f"📦 ParentGraph invoking BundleResearchSubGraph {idx+1}/{len(bundles_list.bundles)}: {bundle_id}")
 
     # Invoke the bundle subgraph
-    bundle_state: EntityIntelResearchBundleState = {
-        "episode": state.get("episode", {}),
-        "bundle": bundle,
-        "bundle_id": bundle_id,
-        "direction_queue": [],
-        "direction_index": 0,
-        "messages": [],
-        "file_refs": [],
-        "structured_outputs": [],
-        "final_reports": [],
-        "llm_calls": state.get("llm_calls", 0),
-        "tool_calls": state.get("tool_calls", 0),
-        "steps_taken": state.get("steps_taken", 0),
-    }
+    bundle_state: EntityIntelResearchBundleState = make_bundle_state(state, bundle)
 
     bundle_out = await BundleResearchSubGraph.ainvoke(bundle_state)
 
@@ -310,25 +342,106 @@ async def run_bundle_node(
     } 
 
 
+def make_bundle_state(
+    state: EntityIntelResearchParentState,
+    bundle: EntityBundleDirectionsFinal,
+) -> EntityIntelResearchBundleState:
+    return {
+        "episode": state.get("episode", {}),
+        "bundle": bundle,
+        "bundle_id": bundle.bundleId,
+        "direction_queue": [],
+        "direction_index": 0,
+        "execution_mode": state.get("execution_mode", ENTITY_RESEARCH_MODE),
+        "messages": [],
+        "file_refs": [],
+        "structured_outputs": [],
+        "final_reports": [],
+        "llm_calls": state.get("llm_calls", 0),
+        "tool_calls": state.get("tool_calls", 0),
+        "steps_taken": state.get("steps_taken", 0),
+    }
+
+
+async def run_bundles_parallel_node(
+    state: EntityIntelResearchParentState
+) -> EntityIntelResearchParentState:
+    """
+    Run every bundle concurrently (at most max_concurrent_bundles at a time).
+
+    Bundles are independent, so the only shared limits are the bundle semaphore and
+    the process-wide scheduler lanes. Outputs are merged in bundle order so the
+    result does not depend on completion order. Any bundle failure cancels the rest.
+    """
+    bundles_list: EntityBundlesListFinal | None = state.get("bundles")
+    if bundles_list is None:
+        raise ValueError("Missing bundles")
+
+    bundles: List[EntityBundleDirectionsFinal] = list(bundles_list.bundles)
+    max_concurrent: int = max(1, state.get("max_concurrent_bundles") or MAX_CONCURRENT_BUNDLES)
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    logger.info(f"📦 ParentGraph running {len(bundles)} bundles in parallel (max_concurrent={max_concurrent})")
+
+    async def run_one(idx: int, bundle: EntityBundleDirectionsFinal) -> Dict[str, Any]:
+        async with semaphore:
+            logger.info(f"📦 Bundle {idx+1}/{len(bundles)} started: {bundle.bundleId}")
+            return await BundleResearchSubGraph.ainvoke(make_bundle_state(state, bundle))
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_one(i, b)) for i, b in enumerate(bundles)]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from eg
+
+    completed: List[str] = list(state.get("completed_bundle_ids", []))
+    file_refs: List[FileReference] = []
+    final_reports: List[FileReference] = []
+    messages: List[Any] = []
+    # Every bundle starts from the parent's counters, so add up what each one spent
+    counters: Dict[str, int] = {k: state.get(k, 0) for k in ("llm_calls", "tool_calls", "steps_taken")}
+    for bundle, task in zip(bundles, tasks, strict=True):
+        bundle_out: Dict[str, Any] = task.result()
+        completed.append(bundle.bundleId)
+        file_refs.extend(bundle_out.get("file_refs", []))
+        final_reports.extend(bundle_out.get("final_reports", []))
+        messages.extend(bundle_out.get("messages", []))
+        for k in counters:
+            counters[k] += bundle_out.get(k, state.get(k, 0)) - state.get(k, 0)
+
+    return {
+        "bundle_index": len(bundles),
+        "completed_bundle_ids": completed,
+        "file_refs": file_refs,
+        "final_reports": final_reports,
+        **counters,
+        "messages": messages,
+    }
+
+
 # -----------------------------
 # Parent Graph - Wire up nodes and edges
 # -----------------------------
 
 research_parent_graph_builder.add_node("load_bundles", load_bundles_node)
 research_parent_graph_builder.add_node("run_bundle", run_bundle_node)
+research_parent_graph_builder.add_node("run_bundles_parallel", run_bundles_parallel_node)
 research_parent_graph_builder.add_node("finalize_parent", finalize_parent_node)
 
 research_parent_graph_builder.set_entry_point("load_bundles")
 
 research_parent_graph_builder.add_conditional_edges(
     "load_bundles",
-    has_next_bundle,
+    route_bundles,
     {
+        "run_bundles_parallel": "run_bundles_parallel",
         "run_bundle": "run_bundle",
         "done": "finalize_parent",
     },
 )
 
+research_parent_graph_builder.add_edge("run_bundles_parallel", "finalize_parent")
+
 # After each bundle, loop again
 research_parent_graph_builder.add_conditional_edges(
     "run_bundle",
@@ -440,6 +553,16 @@ def has_next_direction(
     return "run_direction" if idx < len(queue) else "done"
 
 
+def route_directions(
+    state: EntityIntelResearchBundleState,
+) -> Literal["run_directions_parallel", "run_direction", "done"]:
+    """Entry routing: run the direction DAG in parallel mode, else start the loop."""
+    nxt = has_next_direction(state)
+    if nxt == "run_direction" and state.get("execution_mode", ENTITY_RESEARCH_MODE) == "parallel":
+        return "run_directions_parallel"
+    return nxt
+
+
 async def run_direction_node(
     state: EntityIntelResearchBundleState,
 ) -> EntityIntelResearchBundleState:
@@ -450,20 +573,30 @@ async def run_direction_node(
     if bundle is None:
         raise ValueError("Missing bundle in BundleResearchSubGraph state")
 
-    bundle_id: str = state.get("bundle_id") or bundle.bundleId
     queue: List[DirectionType] = state.get("direction_queue", [])
     idx: int = state.get("direction_index", 0)
 
     if idx >= len(queue):
         raise ValueError("direction_index out of range")
 
-    direction_type: DirectionType = queue[idx]
+    return await run_single_direction(state, bundle, queue[idx], idx, len(queue))
+
+
+async def run_single_direction(
+    state: EntityIntelResearchBundleState,
+    bundle: EntityBundleDirectionsFinal,
+    direction_type: DirectionType,
+    idx: int,
+    total: int,
+) -> EntityIntelResearchBundleState:
+    """Invoke ResearchDirectionSubGraph for one direction and return the bundle-state delta."""
+    bundle_id: str = state.get("bundle_id") or bundle.bundleId
     plan: Dict[str, Any] = select_direction_plan(bundle, direction_type)
 
     # Stable run_id per direction invocation
     run_id: str = f"{bundle_id}:{direction_type}"
 
-    logger.info(f"➡️  Bundle {bundle_id}: running direction {idx+1}/{len(queue)} {direction_type}")
+    logger.info(f"➡️  Bundle {bundle_id}: running direction {idx+1}/{total} {direction_type}")
 
     # Build the direction subgraph state
     direction_state: EntityIntelResearchDirectionState = {
@@ -511,6 +644,56 @@ async def run_direction_node(
     }
 
 
+async def run_directions_parallel_node(
+    state: EntityIntelResearchBundleState,
+) -> EntityIntelResearchBundleState:
+    """
+    Run the bundle's directions as a DAG (see DIRECTION_DEPENDENCIES).
+
+    Each direction waits for its dependencies, then takes a slot in the shared
+    research-direction lane, so concurrency stays bounded across all bundles.
+    Results are merged in queue order; a failing direction cancels its siblings.
+    """
+    bundle: EntityBundleDirectionsFinal | None = state.get("bundle")
+    if bundle is None:
+        raise ValueError("Missing bundle in BundleResearchSubGraph state")
+
+    queue: List[DirectionType] = state.get("direction_queue", [])
+    finished: Dict[DirectionType, asyncio.Event] = {d: asyncio.Event() for d in queue}
+
+    async def run_one(idx: int, direction_type: DirectionType) -> EntityIntelResearchBundleState:
+        for dep in DIRECTION_DEPENDENCIES.get(direction_type, ()):
+            if dep in finished and dep != direction_type:
+                await finished[dep].wait()
+        try:
+            async with direction_slot():
+                return await run_single_direction(state, bundle, direction_type, idx, len(queue))
+        finally:
+            finished[direction_type].set()
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_one(i, d)) for i, d in enumerate(queue)]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from eg
+
+    file_refs: List[FileReference] = []
+    messages: List[BaseMessage] = []
+    final_reports: List[FileReference] = []
+    for task in tasks:
+        out: EntityIntelResearchBundleState = task.result()
+        file_refs.extend(out.get("file_refs", []))
+        messages.extend(out.get("messages", []))
+        final_reports.extend(out.get("final_reports", []))
+
+    return {
+        "file_refs": file_refs,
+        "messages": messages,
+        "final_reports": final_reports,
+        "direction_index": len(queue),
+    }
+
+
 async def advance_direction_index_node(
     state: EntityIntelResearchBundleState,
 ) -> EntityIntelResearchBundleState:
@@ -531,6 +714,7 @@ async def finalize_bundle_research_node(
 
 research_subgraph_builder.add_node("init_bundle", init_bundle_research_node)
 research_subgraph_builder.add_node("run_direction", run_direction_node)
+research_subgraph_builder.add_node("run_directions_parallel", run_directions_parallel_node)
 research_subgraph_builder.add_node("advance_direction", advance_direction_index_node)
 research_subgraph_builder.add_node("finalize_bundle", finalize_bundle_research_node)
 
@@ -538,10 +722,16 @@ research_subgraph_builder.set_entry_point("init_bundle")
 
 research_subgraph_builder.add_conditional_edges(
     "init_bundle",
-    has_next_direction,
-    {"run_direction": "run_direction", "done": "finalize_bundle"},
+    route_directions,
+    {
+        "run_directions_parallel": "run_directions_parallel",
+        "run_direction": "run_direction",
+        "done": "finalize_bundle",
+    },
 )
 
+research_subgraph_builder.add_edge("run_directions_parallel", "finalize_bundle")
+
 research_subgraph_builder.add_edge("run_direction", "advance_direction")
 
 research_subgraph_builder.add_conditional_edges(
@@ -625,7 +815,7 @@ async def generate_todos_node(state: EntityIntelResearchDirectionState) -> Entit
     
     logger.info(f"🧠 Generating TodoList for {direction_type} in bundle {bundle_id}")
     
-    todo_agent: CompiledStateGraph = create_agent(
+    todo_agent: CompiledStateGraph = get_agent(
         gpt_5_mini,
         response_format=ProviderStrategy(TodoListOutput), 
         name="todo_list_generation_agent",
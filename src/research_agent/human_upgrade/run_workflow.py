@@ -133,6 +133,8 @@ async def run_research_agent_workflow(entity_intel_subgraph, episode_url: str):
 
 
     logger.info("✅ Graph run complete")
+    from research_agent.agent_tools.tavily_functions import tavily_response_cache
+    tavily_response_cache.log_stats()
   
 
   
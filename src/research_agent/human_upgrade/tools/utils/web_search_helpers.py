@@ -1,4 +1,4 @@
-from langchain.agents import create_agent 
+from research_agent.common.map_reduce_summary import summarize_results
 from typing import List 
 
 from langchain_openai import ChatOpenAI
@@ -16,18 +16,15 @@ async def summarize_tavily_web_search(
     """Summarize Tavily search results."""
     logger.info(f"📝 Summarizing Tavily search results (input length: {len(search_results)} chars)")
     
-    agent_instructions = TAVILY_SUMMARY_PROMPT.format(search_results=search_results) 
-    web_search_summary_agent = create_agent( 
-        model, 
-        response_format=ProviderStrategy(TavilyResultsSummary),  
+    # Single call for normal-sized results; chunked map-reduce for oversized ones
+    summary = await summarize_results(
+        search_results,
+        prompt=TAVILY_SUMMARY_PROMPT,
+        schema=TavilyResultsSummary,
+        model=model,
+        response_format=ProviderStrategy(TavilyResultsSummary),
         name="tavily_summary_agent",
-    )   
-
-    web_search_summary_agent_response = await web_search_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
     )
-
-    summary = web_search_summary_agent_response["structured_response"]
     logger.info(f"✅ Tavily summary complete: {len(summary.citations)} citations found")
     
     await save_json_artifact(summary, "test_run", "tavily_summary")
@@ -42,18 +39,14 @@ async def summarize_tavily_extract(
     """Summarize Tavily extract results."""
     logger.info(f"📝 Summarizing Tavily extract results (input length: {len(extract_results)} chars)")
     
-    agent_instructions = TAVILY_SUMMARY_PROMPT.format(search_results=extract_results)
-    extract_summary_agent = create_agent(
-        model,
+    summary = await summarize_results(
+        extract_results,
+        prompt=TAVILY_SUMMARY_PROMPT,
+        schema=TavilyResultsSummary,
+        model=model,
         response_format=ProviderStrategy(TavilyResultsSummary),
         name="tavily_extract_summary_agent",
     )
-
-    extract_summary_agent_response = await extract_summary_agent.ainvoke(
-        {"messages": [{"role": "user", "content": agent_instructions}]}
-    )
-
-    summary = extract_summary_agent_response["structured_response"]
     logger.info(f"✅ Tavily extract summary complete: {len(summary.citations)} citations found")
     
     await save_json_artifact(summary, "test_run", "tavily_extract_summary")
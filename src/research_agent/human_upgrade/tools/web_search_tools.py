@@ -10,6 +10,7 @@ from research_agent.agent_tools.tavily_functions import (
     tavily_map,
     format_tavily_extract_response,
     format_tavily_map_response,
+    tavily_response_cache,
 )   
 from research_agent.human_upgrade.structured_outputs.sources_and_search_summary_outputs import TavilyCitation
 from research_agent.human_upgrade.tools.utils.runtime_helpers import increment_steps, write_citations
@@ -69,6 +70,7 @@ async def _tavily_search_impl(
         topic=topic,
         include_images=include_images,
         include_raw_content=include_raw_content,
+        cache=tavily_response_cache,
     )
     
     await save_json_artifact(
@@ -108,6 +110,7 @@ async def _tavily_extract_impl(
         include_images=include_images,
         include_favicon=include_favicon,
         format=format,
+        cache=tavily_response_cache,
     )
     
     await save_json_artifact(
@@ -142,6 +145,7 @@ async def _tavily_map_impl(
         max_depth=max_depth,
         max_breadth=max_breadth,
         limit=limit,
+        cache=tavily_response_cache,
     )
     
     discovered_urls = map_results.get("results", [])
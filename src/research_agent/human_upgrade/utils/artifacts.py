@@ -1,10 +1,10 @@
 from datetime import datetime 
 import os
-import uuid
-import json
 import aiofiles
+import aiofiles.os
 from typing import Any
 
+from research_agent.common import artifacts as common_artifacts
 from research_agent.human_upgrade.logger import logger
 
 
@@ -64,38 +64,10 @@ async def save_json_artifact(
     artifact_type: str,
     suffix: str = "",
 ) -> str:
-    """Save a JSON artifact to disk with structured naming."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{sanitize_filename(suffix)}"
-    filename = sanitize_filename(filename) + ".json"
-    
-    filepath = os.path.join(ENTITY_INTEL_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    # Convert to JSON-serializable format
-    if hasattr(data, "model_dump"):
-        json_data = data.model_dump()
-    elif hasattr(data, "dict"):
-        json_data = data.dict()
-    elif isinstance(data, dict):
-        json_data = data
-    else:
-        json_data = {"content": str(data)}
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(json_data, indent=2, default=str, ensure_ascii=False))
-        logger.debug(f"Saved artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
+    """Queue a JSON artifact on the background artifact sink."""
+    return await common_artifacts.save_json_artifact(
+        data, ENTITY_INTEL_OUTPUT_DIR, direction_id, artifact_type, sanitize_filename(suffix)
+    )
 
 
 async def save_text_artifact(
@@ -104,26 +76,7 @@ async def save_text_artifact(
     artifact_type: str,
     suffix: str = "",
 ) -> str:
-    """Save a text artifact to disk."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = str(uuid.uuid4())[:8]
-    
-    filename = f"{artifact_type}_{timestamp}_{short_uuid}"
-    if suffix:
-        filename += f"_{sanitize_filename(suffix)}"
-    filename = sanitize_filename(filename) + ".txt"
-    
-    filepath = os.path.join(ENTITY_INTEL_OUTPUT_DIR, direction_id, filename)
-    
-    await ensure_directory_exists(filepath)
-    
-    try:
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(content)
-        logger.debug(f"Saved text artifact: {filepath}")
-    except Exception as e:
-        logger.error(f"Failed to save text artifact {filepath}: {e}")
-        return ""
-    
-    return filepath
-
+    """Queue a text artifact on the background artifact sink."""
+    return await common_artifacts.save_text_artifact(
+        content, ENTITY_INTEL_OUTPUT_DIR, direction_id, artifact_type, sanitize_filename(suffix)
+    )
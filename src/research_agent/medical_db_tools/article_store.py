@@ -0,0 +1,169 @@
+# medical_db_tools/article_store.py
+
+"""
+Local, persistent store for PubMed / PMC records keyed by PMID / PMCID.
+
+Articles are effectively immutable once published, so every abstract, ESummary
+document and parsed PMC full text we pull from NCBI is kept on disk (SQLite, zlib
+compressed). The eutils helpers in `pub_med_tools` consult the store first and only
+send the missing IDs to NCBI, in one batched call.
+
+Usage:
+    store = PubMedArticleStore(".cache/pubmed_articles.sqlite3")
+    cached = await store.get_many(ABSTRACT, ["31234567", "29876543"])
+    await store.put_many(ABSTRACT, {"31234567": "..."})
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Literal, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+ArticleKind = Literal["esummary", "abstract", "pmc_sections"]
+
+ESUMMARY: ArticleKind = "esummary"
+ABSTRACT: ArticleKind = "abstract"
+PMC_SECTIONS: ArticleKind = "pmc_sections"  # JSON of jats_parser.PmcArticleSections
+
+# SQLite caps host parameters per statement (999 on older builds)
+_SQL_BATCH = 500
+
+
+@dataclass
+class ArticleStoreStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+class PubMedArticleStore:
+    """
+    SQLite-backed store of raw NCBI records, one row per (kind, article id).
+
+    All sqlite calls run in a worker thread so the event loop never blocks on disk.
+    `max_age` (seconds) optionally treats older rows as missing, e.g. to refresh
+    ESummary metadata during a long-running backfill.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        max_age: Optional[float] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.max_age = max_age
+        self.enabled = enabled
+        self.stats = ArticleStoreStats()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            dir_path = os.path.dirname(self.path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    kind TEXT NOT NULL,
+                    article_id TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (kind, article_id)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get_many_sync(self, kind: ArticleKind, ids: list[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        min_fetched_at = time.time() - self.max_age if self.max_age is not None else None
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(ids), _SQL_BATCH):
+                chunk = ids[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT article_id, payload, fetched_at FROM articles "
+                    f"WHERE kind = ? AND article_id IN ({placeholders})",
+                    (kind, *chunk),
+                ).fetchall()
+                for article_id, payload, fetched_at in rows:
+                    if min_fetched_at is not None and fetched_at < min_fetched_at:
+                        continue
+                    found[article_id] = zlib.decompress(payload).decode("utf-8")
+        return found
+
+    def _put_many_sync(self, kind: ArticleKind, items: Mapping[str, str]) -> None:
+        now = time.time()
+        rows = [
+            (kind, article_id, zlib.compress(text.encode("utf-8")), now)
+            for article_id, text in items.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO articles (kind, article_id, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    async def get_many(self, kind: ArticleKind, ids: Iterable[str]) -> Dict[str, str]:
+        """Return {article_id: payload} for the IDs already stored (missing IDs are omitted)."""
+        wanted = list(dict.fromkeys(str(i) for i in ids))
+        if not self.enabled or not wanted:
+            return {}
+        try:
+            found = await asyncio.to_thread(self._get_many_sync, kind, wanted)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Article store read failed ({kind}): {e}")
+            found = {}
+        self.stats.hits += len(found)
+        self.stats.misses += len(wanted) - len(found)
+        return found
+
+    async def put_many(self, kind: ArticleKind, items: Mapping[str, str]) -> None:
+        if not self.enabled or not items:
+            return
+        try:
+            await asyncio.to_thread(self._put_many_sync, kind, dict(items))
+            self.stats.writes += len(items)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Article store write failed ({kind}): {e}")
+
+    def log_stats(self, level: int = logging.INFO) -> None:
+        logger.log(level, f"📚 PUBMED ARTICLE STORE {self.stats.as_dict()}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,390 @@
+# medical_db_tools/jats_parser.py
+
+"""
+Incremental JATS parser for PMC EFetch full text.
+
+PMC returns a <pmc-articleset> of JATS <article> documents that are often several
+megabytes each. Instead of stripping tags from the whole string and truncating
+(which mostly keeps front matter), `PmcSectionsParser` is fed the response chunk by
+chunk (xml.etree XMLPullParser), keeps only the parts the summarizer needs
+(abstract, methods, results, discussion, conclusions, tables), stops collecting
+once each section's character cap is reached, and clears elements as it goes so
+memory stays bounded to roughly one paragraph.
+
+Usage:
+    parser = PmcSectionsParser()
+    async for chunk in response.content.iter_chunked(65536):
+        for article in parser.feed(chunk):
+            ...
+    articles = parser.close()   # any remaining completed articles
+
+    text = format_pmc_article_sections(articles, max_chars=12000)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Union
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+logger = logging.getLogger(__name__)
+
+# Sections kept, in the order they are presented to the summarizer
+# ("body" = unlabelled body text, e.g. review articles without IMRaD headings)
+SECTION_ORDER: tuple[str, ...] = ("abstract", "results", "discussion", "conclusions", "methods", "tables", "body")
+
+# Share of an article's character budget per section (unused share flows down SECTION_ORDER)
+SECTION_BUDGET_SHARES: Dict[str, float] = {
+    "abstract": 0.20,
+    "results": 0.30,
+    "discussion": 0.20,
+    "conclusions": 0.05,
+    "methods": 0.15,
+    "tables": 0.10,
+    "body": 0.0,
+}
+
+# Parse-time caps per section. Text beyond these is never accumulated.
+DEFAULT_SECTION_CHAR_CAPS: Dict[str, int] = {
+    "abstract": 4000,
+    "results": 8000,
+    "discussion": 6000,
+    "conclusions": 2000,
+    "methods": 4000,
+    "tables": 4000,
+    "body": 6000,
+}
+
+_SEC_TYPE_KINDS: Dict[str, str] = {
+    "methods": "methods",
+    "materials|methods": "methods",
+    "materials": "methods",
+    "subjects": "methods",
+    "results": "results",
+    "discussion": "discussion",
+    "results|discussion": "results",
+    "conclusions": "conclusions",
+    "intro": "other",
+    "introduction": "other",
+    "supplementary-material": "other",
+}
+
+_TITLE_KINDS: tuple[tuple[re.Pattern, str], ...] = (
+    (re.compile(r"\b(method|materials?|patients and|participants|study design|experimental)", re.I), "methods"),
+    (re.compile(r"\bresults?\b|\bfindings\b", re.I), "results"),
+    (re.compile(r"\bdiscussion\b", re.I), "discussion"),
+    (re.compile(r"\bconclu", re.I), "conclusions"),
+    (re.compile(r"\bintroduction\b|\bbackground\b", re.I), "other"),
+)
+
+# Block-level elements whose full text is collected on their end event
+_TEXT_BLOCKS = {"p", "title", "caption", "tr", "list-item", "def"}
+# Subtrees we never want (references, figures, author notes, ...)
+_SKIPPED = {
+    "ref-list", "fig", "fn-group", "ack", "glossary", "app-group", "notes",
+    "disp-formula", "sub-article", "response",
+}
+
+_WS = re.compile(r"\s+")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def _text(elem: Element) -> str:
+    return _WS.sub(" ", "".join(elem.itertext())).strip()
+
+
+@dataclass
+class PmcArticleSections:
+    pmcid: Optional[str] = None
+    title: Optional[str] = None
+    doi: Optional[str] = None
+    sections: Dict[str, List[str]] = field(default_factory=dict)
+    chars: Dict[str, int] = field(default_factory=dict)
+    truncated: bool = False
+
+    def text(self, section: str) -> str:
+        return "\n".join(self.sections.get(section, []))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "pmcid": self.pmcid,
+            "title": self.title,
+            "doi": self.doi,
+            "sections": self.sections,
+            "truncated": self.truncated,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "PmcArticleSections":
+        sections: Dict[str, List[str]] = dict(data.get("sections") or {})  # type: ignore[arg-type]
+        return cls(
+            pmcid=data.get("pmcid"),  # type: ignore[arg-type]
+            title=data.get("title"),  # type: ignore[arg-type]
+            doi=data.get("doi"),  # type: ignore[arg-type]
+            sections=sections,
+            chars={k: sum(len(p) for p in v) for k, v in sections.items()},
+            truncated=bool(data.get("truncated")),
+        )
+
+
+class PmcSectionsParser:
+    """
+    Streaming <pmc-articleset> -> [PmcArticleSections].
+
+    `feed()` accepts bytes or str and returns the articles completed by that chunk.
+    A malformed document ends parsing; whatever was completed is kept.
+    """
+
+    def __init__(self, section_char_caps: Optional[Dict[str, int]] = None) -> None:
+        self.caps: Dict[str, int] = dict(section_char_caps or DEFAULT_SECTION_CHAR_CAPS)
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._current: Optional[PmcArticleSections] = None
+        self._article_depth = 0
+        # One entry per open container (<abstract>, <sec>, <table-wrap>, skipped subtrees)
+        self._kinds: List[Optional[str]] = []
+        self._containers: List[str] = []
+        self._in_front = False
+        self._row_depth = 0
+        self.failed = False
+
+    # --- section bookkeeping -------------------------------------------------
+
+    def _effective_kind(self) -> Optional[str]:
+        for kind in reversed(self._kinds):
+            if kind is not None:
+                return kind
+        return None
+
+    def _full(self, kind: str) -> bool:
+        article = self._current
+        return article is not None and article.chars.get(kind, 0) >= self.caps.get(kind, 0)
+
+    def _add(self, kind: str, text: str) -> None:
+        article = self._current
+        if article is None or not text or kind not in self.caps:
+            return
+        used = article.chars.get(kind, 0)
+        room = self.caps[kind] - used
+        if room <= 0:
+            article.truncated = True
+            return
+        if len(text) > room:
+            text = text[:room].rsplit(" ", 1)[0] + " …"
+            article.truncated = True
+        article.sections.setdefault(kind, []).append(text)
+        article.chars[kind] = used + len(text)
+
+    # --- events --------------------------------------------------------------
+
+    def _on_start(self, elem: Element) -> None:
+        tag = _local(elem.tag)
+        if tag == "article":
+            self._article_depth += 1
+            if self._article_depth == 1:
+                self._current = PmcArticleSections()
+                self._kinds.clear()
+                self._containers.clear()
+            return
+        if self._current is None:
+            return
+        if tag == "front":
+            self._in_front = True
+        elif tag == "tr":
+            self._row_depth += 1
+        elif tag == "body":
+            self._containers.append(tag)
+            self._kinds.append("body")
+        elif tag in _SKIPPED:
+            self._containers.append(tag)
+            self._kinds.append("skip")
+        elif tag == "abstract":
+            abstract_type = (elem.get("abstract-type") or "").lower()
+            self._containers.append(tag)
+            # Graphical/teaser abstracts add little; keep the main abstract only
+            self._kinds.append("skip" if abstract_type in ("graphical", "teaser", "toc") else "abstract")
+        elif tag == "table-wrap":
+            self._containers.append(tag)
+            self._kinds.append("tables")
+        elif tag == "sec":
+            sec_type = (elem.get("sec-type") or "").lower()
+            self._containers.append(tag)
+            self._kinds.append(_SEC_TYPE_KINDS.get(sec_type))
+
+    def _on_end(self, elem: Element) -> Optional[PmcArticleSections]:
+        tag = _local(elem.tag)
+        article = self._current
+
+        if tag == "article":
+            self._article_depth -= 1
+            elem.clear()
+            if self._article_depth == 0 and article is not None:
+                self._current = None
+                return article
+            return None
+        if article is None:
+            return None
+
+        if self._in_front:
+            if tag == "article-id":
+                id_type = (elem.get("pub-id-type") or "").lower()
+                value = (elem.text or "").strip()
+                if id_type in ("pmc", "pmcid", "pmc-uid") and not article.pmcid:
+                    article.pmcid = value[3:] if value.upper().startswith("PMC") else value
+                elif id_type == "doi" and not article.doi:
+                    article.doi = value
+            elif tag == "article-title" and not article.title:
+                article.title = _text(elem)
+
+        if self._containers and tag == self._containers[-1]:
+            self._containers.pop()
+            self._kinds.pop()
+            elem.clear()
+            return None
+
+        if tag == "front":
+            self._in_front = False
+            elem.clear()
+            return None
+
+        if tag == "tr":
+            self._row_depth -= 1
+        elif self._row_depth > 0 or tag not in _TEXT_BLOCKS:
+            return None  # cell contents are collected with their row
+
+        kind = self._effective_kind()
+        if tag == "title" and self._containers and self._containers[-1] == "sec" and self._kinds[-1] is None:
+            # Unlabelled body <sec>: classify by its title, else inherit the parent's kind
+            # (sub-headings inside an abstract or table stay where they are)
+            title = _text(elem)
+            if kind in (None, "body"):
+                for pattern, title_kind in _TITLE_KINDS:
+                    if pattern.search(title):
+                        self._kinds[-1] = title_kind
+                        break
+            kind = self._effective_kind()
+            if kind and kind not in ("other", "skip") and not self._full(kind):
+                self._add(kind, f"## {title}")
+            elem.clear()
+            return None
+
+        if kind is None or kind in ("other", "skip") or self._full(kind):
+            if kind is not None and kind not in ("other", "skip"):
+                article.truncated = True
+            elem.clear()
+            return None
+
+        if tag == "tr":
+            cells = [_text(cell) for cell in elem if _local(cell.tag) in ("td", "th")]
+            text = " | ".join(c for c in cells if c)
+        elif tag == "title" and kind == "abstract":
+            text = f"## {_text(elem)}"
+        else:
+            text = _text(elem)
+        self._add(kind, text)
+        elem.clear()
+        return None
+
+    # --- public API ----------------------------------------------------------
+
+    def _drain(self) -> List[PmcArticleSections]:
+        done: List[PmcArticleSections] = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._on_start(elem)
+            else:
+                article = self._on_end(elem)
+                if article is not None:
+                    done.append(article)
+        return done
+
+    def feed(self, chunk: Union[bytes, str]) -> List[PmcArticleSections]:
+        if self.failed:
+            return []
+        try:
+            self._parser.feed(chunk)
+        except ParseError as e:
+            logger.warning(f"⚠️  PMC XML parse error, keeping completed articles: {e}")
+            self.failed = True
+        return self._drain()
+
+    def close(self) -> List[PmcArticleSections]:
+        done: List[PmcArticleSections] = []
+        if not self.failed:
+            try:
+                self._parser.close()
+            except ParseError as e:
+                logger.warning(f"⚠️  PMC XML ended early: {e}")
+            done = self._drain()
+        if self._current is not None and self._current.sections:
+            done.append(self._current)  # partial last article (truncated/failed stream)
+            self._current.truncated = True
+            self._current = None
+        return done
+
+
+def parse_pmc_articleset(chunks: Union[str, bytes, Iterable[Union[str, bytes]]], **kwargs) -> List[PmcArticleSections]:
+    """Parse a complete (or chunked) PMC EFetch response in one call."""
+    parser = PmcSectionsParser(**kwargs)
+    articles: List[PmcArticleSections] = []
+    for chunk in [chunks] if isinstance(chunks, (str, bytes)) else chunks:
+        articles.extend(parser.feed(chunk))
+    articles.extend(parser.close())
+    return articles
+
+
+def _allocate_budget(article: PmcArticleSections, budget: int) -> Dict[str, int]:
+    """Split `budget` chars across sections by share; unused share flows down SECTION_ORDER."""
+    # Rendered lengths (paragraphs joined with "\n"), not the raw `chars` tally
+    lengths = {k: len(article.text(k)) for k in SECTION_ORDER}
+    alloc = {k: min(lengths[k], int(budget * SECTION_BUDGET_SHARES.get(k, 0))) for k in SECTION_ORDER}
+    leftover = budget - sum(alloc.values())
+    for k in SECTION_ORDER:
+        if leftover <= 0:
+            break
+        extra = min(leftover, lengths[k] - alloc[k])
+        alloc[k] += extra
+        leftover -= extra
+    return alloc
+
+
+def format_pmc_article_sections(
+    articles: List[PmcArticleSections],
+    *,
+    max_chars: Optional[int] = None,
+) -> str:
+    """
+    Render parsed articles as labelled sections, splitting `max_chars` evenly across
+    articles and by SECTION_BUDGET_SHARES within each article.
+    """
+    if not articles:
+        return "No parsable PMC full text returned."
+
+    per_article = (max_chars // len(articles)) if max_chars else None
+    blocks: List[str] = []
+    for idx, article in enumerate(articles, start=1):
+        header = f"[Article {idx}] PMCID: PMC{article.pmcid}" if article.pmcid else f"[Article {idx}]"
+        lines: List[str] = [header]
+        if article.title:
+            lines.append(f"Title: {article.title}")
+        if article.doi:
+            lines.append(f"DOI: {article.doi}")
+
+        alloc = _allocate_budget(article, per_article) if per_article else None
+        for kind in SECTION_ORDER:
+            text = article.text(kind)
+            if not text:
+                continue
+            if alloc is not None:
+                if alloc[kind] <= 0:
+                    continue
+                if len(text) > alloc[kind]:
+                    text = text[: alloc[kind]].rsplit(" ", 1)[0] + " ...[section truncated]"
+            lines.append("")
+            lines.append(f"### {kind.capitalize()}")
+            lines.append(text)
+        blocks.append("\n".join(lines))
+
+    return "\n\n".join(blocks)
@@ -1,20 +1,54 @@
 from __future__ import annotations
+import asyncio
+import time
 import aiohttp
-from typing import Any, Dict, List, Optional, Sequence
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 import json   
+import logging
+import os
 import re 
 from dotenv import load_dotenv  
 from langchain.tools import tool, ToolRuntime 
 from pydantic import BaseModel, Field  
-from langchain.agents import create_agent  
+from research_agent.common.agent_registry import get_agent
 from langchain_openai import ChatOpenAI  
 from research_agent.prompts.summary_prompts import PUBMED_SUMMARY_PROMPT, PMC_SUMMARY_PROMPT
+from research_agent.common.rate_limits import DIRECTIONS_LANE, scheduler
+from research_agent.medical_db_tools.article_store import (
+    ABSTRACT,
+    ESUMMARY,
+    PMC_SECTIONS,
+    PubMedArticleStore,
+)
+from research_agent.medical_db_tools.jats_parser import (
+    PmcArticleSections,
+    PmcSectionsParser,
+    format_pmc_article_sections,
+    parse_pmc_articleset,
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 NCBI_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 DEFAULT_TOOL = "human-upgrade-app"
 
+# esummary/efetch page size; results larger than this are paged via the history server
+PUBMED_HISTORY_BATCH_SIZE = 200
+NCBI_MAX_RETRIES = 3
+
+PUBMED_ARTICLE_STORE_PATH = os.getenv(
+    "PUBMED_ARTICLE_STORE_PATH", os.path.join(".cache", "pubmed_articles.sqlite3")
+)
+
+# Shared article store used by the literature tools. Set PUBMED_ARTICLE_STORE_DISABLED=1 to bypass.
+pubmed_article_store: PubMedArticleStore = PubMedArticleStore(
+    PUBMED_ARTICLE_STORE_PATH,
+    enabled=os.getenv("PUBMED_ARTICLE_STORE_DISABLED", "").lower() not in ("1", "true", "yes"),
+)
+
 # ---------------------------------------------------------------------------
 # HTTP SESSION MANAGEMENT
 # ---------------------------------------------------------------------------
@@ -45,10 +79,51 @@ async def close_http_session() -> None:
 
 
 
+def _rate_limit_trace_config(provider: str = "ncbi") -> aiohttp.TraceConfig:
+    """
+    Route every request made through a session via the scheduler's `provider` limiter
+    (NCBI: 3 req/s, 10 with an API key). A slot is taken on request start and given
+    back on end/exception, reporting 429s so the limiter backs off.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params) -> None:
+        if getattr(ctx, "started_at", None) is not None:
+            return  # redirect hop of a request that already holds a slot
+        await scheduler.limiter(provider).acquire()
+        ctx.started_at = time.perf_counter()
+
+    async def _release(ctx, *, throttled: bool = False, error: bool = False) -> None:
+        started_at = getattr(ctx, "started_at", None)
+        if started_at is None:
+            return
+        ctx.started_at = None
+        await scheduler.limiter(provider).release(
+            time.perf_counter() - started_at, throttled=throttled, error=error
+        )
+        if throttled:
+            scheduler.limiter(DIRECTIONS_LANE).on_throttle()
+
+    async def on_request_end(session, ctx, params) -> None:
+        status = params.response.status
+        await _release(ctx, throttled=status == 429, error=status >= 400)
+
+    async def on_request_exception(session, ctx, params) -> None:
+        await _release(ctx, error=True)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
 async def get_http_session() -> aiohttp.ClientSession:
     """
     Return a shared aiohttp.ClientSession, creating it if necessary.
     Call this from tools or other async functions that need HTTP.
+
+    Every request on this session goes through the process-wide NCBI limiter,
+    so concurrent tools/directions share one request budget.
     """
     global _http_session
     if _http_session is None or _http_session.closed: 
@@ -61,6 +136,7 @@ async def get_http_session() -> aiohttp.ClientSession:
             timeout=timeout, 
             connector=connector, 
             raise_for_status=False, # let caller handle errors
+            trace_configs=[_rate_limit_trace_config("ncbi")],
         )
 
     return _http_session
@@ -73,9 +149,38 @@ async def _eutils_get(
     params: Dict[str, Any],
 ) -> str:
     url = f"{NCBI_BASE_URL}/{util}.fcgi"
-    async with session.get(url, params=params, timeout=30) as resp:
-        resp.raise_for_status()
-        return await resp.text()  # caller can decide to parse JSON or XML
+    for attempt in range(NCBI_MAX_RETRIES + 1):
+        async with session.get(url, params=params, timeout=30) as resp:
+            if resp.status == 429 and attempt < NCBI_MAX_RETRIES:
+                # The limiter has already halved its rate; back off before retrying
+                await asyncio.sleep(2 ** attempt)
+                continue
+            resp.raise_for_status()
+            return await resp.text()  # caller can decide to parse JSON or XML
+    raise RuntimeError("unreachable")
+
+
+async def _eutils_stream(
+    session: aiohttp.ClientSession,
+    util: str,
+    params: Dict[str, Any],
+    *,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Like `_eutils_get`, but yields the body in chunks. Close the generator early
+    (e.g. `async with aclosing(...)` + break) to stop downloading.
+    """
+    url = f"{NCBI_BASE_URL}/{util}.fcgi"
+    for attempt in range(NCBI_MAX_RETRIES + 1):
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+            if resp.status == 429 and attempt < NCBI_MAX_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+                continue
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
+            return
 
 # ---------------------------------------------------------------------------
 # RAW PUBMED/PMC HELPERS
@@ -152,17 +257,54 @@ def format_pubmed_esearch(
     return "\n".join(lines).strip()
 
 
+def _id_or_history_params(
+    ids: Sequence[str],
+    webenv: Optional[str],
+    query_key: Optional[str],
+    retstart: int,
+    retmax: Optional[int],
+) -> Dict[str, Any]:
+    """Select records either by explicit IDs or by a history-server page (WebEnv/QueryKey)."""
+    if webenv and query_key:
+        params: Dict[str, Any] = {"WebEnv": webenv, "query_key": query_key, "retstart": retstart}
+        if retmax is not None:
+            params["retmax"] = retmax
+        return params
+    return {"id": ",".join(ids)}
+
+
+def _history_page(
+    webenv: Optional[str],
+    query_key: Optional[str],
+    retstart: int,
+    retmax: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """History-server page kwargs for the store paths, or None when paging by ID."""
+    if not (webenv and query_key):
+        return None
+    return {"webenv": webenv, "query_key": query_key, "retstart": retstart, "retmax": retmax}
+
+
 async def pubmed_esummary(
     session: aiohttp.ClientSession,
-    ids: Sequence[str],
+    ids: Sequence[str] = (),
     api_key: Optional[str] = None,
     email: Optional[str] = None,
+    *,
+    webenv: Optional[str] = None,
+    query_key: Optional[str] = None,
+    retstart: int = 0,
+    retmax: Optional[int] = None,
+    store: Optional[PubMedArticleStore] = None,
 ) -> Dict[str, Any]:
-    if not ids:
+    if not ids and not (webenv and query_key):
         return {}
+    if store is not None and ids:
+        history = _history_page(webenv, query_key, retstart, retmax)
+        return await _pubmed_esummary_via_store(session, ids, api_key, email, store, history)
     params = {
         "db": "pubmed",
-        "id": ",".join(ids),
+        **_id_or_history_params(ids, webenv, query_key, retstart, retmax),
         "retmode": "json",
         "tool": DEFAULT_TOOL,
     }
@@ -175,6 +317,39 @@ async def pubmed_esummary(
     return json.loads(text)
 
 
+async def _pubmed_esummary_via_store(
+    session: aiohttp.ClientSession,
+    ids: Sequence[str],
+    api_key: Optional[str],
+    email: Optional[str],
+    store: PubMedArticleStore,
+    history: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    ESummary with per-PMID documents served from the store; only pages with missing
+    PMIDs hit NCBI (by ID, or as the `history` page when one is given).
+    """
+    cached = await store.get_many(ESUMMARY, ids)
+    missing = [i for i in ids if i not in cached]
+
+    fresh: Dict[str, str] = {}
+    if missing:
+        if history is not None:
+            fetched = await pubmed_esummary(session, (), api_key, email, **history)
+        else:
+            fetched = await pubmed_esummary(session, missing, api_key, email)
+        result = fetched.get("result", {})
+        for uid in result.get("uids") or []:
+            doc = result.get(uid)
+            if uid in missing and isinstance(doc, dict) and "error" not in doc:
+                fresh[uid] = json.dumps(doc, ensure_ascii=False)
+        await store.put_many(ESUMMARY, fresh)
+
+    docs = {**cached, **fresh}
+    uids = [i for i in dict.fromkeys(ids) if i in docs]
+    return {"result": {"uids": uids, **{uid: json.loads(docs[uid]) for uid in uids}}}
+
+
 def format_pubmed_esummary(
     esummary_result: Dict[str, Any],
     *,
@@ -230,19 +405,30 @@ def format_pubmed_esummary(
 
 async def pubmed_efetch_abstracts(
     session: aiohttp.ClientSession,
-    ids: Sequence[str],
+    ids: Sequence[str] = (),
     api_key: Optional[str] = None,
     email: Optional[str] = None,
+    *,
+    webenv: Optional[str] = None,
+    query_key: Optional[str] = None,
+    retstart: int = 0,
+    retmax: Optional[int] = None,
+    store: Optional[PubMedArticleStore] = None,
 ) -> str:
     """
     Returns plain-text abstracts concatenated together (PubMed EFetch).
+    Pass either `ids` or a history-server page (`webenv`/`query_key`/`retstart`/`retmax`).
+    With a `store`, abstracts already on disk are reused and only missing PMIDs are fetched.
     """
-    if not ids:
+    if not ids and not (webenv and query_key):
         return ""
+    if store is not None and ids:
+        history = _history_page(webenv, query_key, retstart, retmax)
+        return await _pubmed_efetch_abstracts_via_store(session, ids, api_key, email, store, history)
 
     params = {
         "db": "pubmed",
-        "id": ",".join(ids),
+        **_id_or_history_params(ids, webenv, query_key, retstart, retmax),
         "rettype": "abstract",
         "retmode": "text",  # text abstracts; you can also use xml
         "tool": DEFAULT_TOOL,
@@ -255,6 +441,60 @@ async def pubmed_efetch_abstracts(
     return await _eutils_get(session, "efetch", params)
 
 
+_ABSTRACT_RECORD_SPLIT = re.compile(r"\n{3,}(?=\d+\.\s)")
+_ABSTRACT_RECORD_NUMBER = re.compile(r"^\d+\.\s*")
+_ABSTRACT_PMID = re.compile(r"^PMID:\s*(\d+)", re.MULTILINE)
+
+
+def _split_abstract_records(abstracts_text: str) -> tuple[Dict[str, str], List[str]]:
+    """
+    Split EFetch text abstracts ("1. Journal...\n\n...PMID: 123\n\n\n2. ...") into
+    ({pmid: record}, [records without a PMID]), with the leading list number removed.
+    """
+    records: Dict[str, str] = {}
+    unkeyed: List[str] = []
+    for raw in _ABSTRACT_RECORD_SPLIT.split(abstracts_text.strip()):
+        record = _ABSTRACT_RECORD_NUMBER.sub("", raw.strip(), count=1)
+        if not record:
+            continue
+        match = _ABSTRACT_PMID.search(record)
+        if match:
+            records[match.group(1)] = record
+        else:
+            unkeyed.append(record)
+    return records, unkeyed
+
+
+async def _pubmed_efetch_abstracts_via_store(
+    session: aiohttp.ClientSession,
+    ids: Sequence[str],
+    api_key: Optional[str],
+    email: Optional[str],
+    store: PubMedArticleStore,
+    history: Optional[Dict[str, Any]] = None,
+) -> str:
+    cached = await store.get_many(ABSTRACT, ids)
+    missing = [i for i in ids if i not in cached]
+
+    fresh: Dict[str, str] = {}
+    unkeyed: List[str] = []
+    if missing:
+        if history is not None:
+            fetched_text = await pubmed_efetch_abstracts(session, (), api_key, email, **history)
+        else:
+            fetched_text = await pubmed_efetch_abstracts(session, missing, api_key, email)
+        split, unkeyed = _split_abstract_records(fetched_text)
+        fresh = {pmid: rec for pmid, rec in split.items() if pmid in missing}
+        await store.put_many(ABSTRACT, fresh)
+        if unkeyed:
+            # No PMID line to key them by: passed through below, but not cached
+            logger.warning(f"⚠️  {len(unkeyed)} EFetch abstract record(s) without a PMID; not cached")
+
+    records = {**cached, **fresh}
+    ordered = [records[i] for i in dict.fromkeys(ids) if i in records] + unkeyed
+    return "\n\n\n".join(f"{n}. {rec}" for n, rec in enumerate(ordered, start=1))
+
+
 def format_pubmed_efetch_abstracts(
     pmids: List[str],
     abstracts_text: str,
@@ -374,65 +614,197 @@ async def pmc_efetch_fulltext_xml(
     return await _eutils_get(session, "efetch", params)
 
 
-def _strip_xml_tags(xml: str) -> str:
-    """
-    Naive XML tag stripper: remove <...> and collapse whitespace.
+def _normalize_pmcid(pmc_id: str) -> str:
+    """"PMC1234567" and "1234567" (esearch UIDs) refer to the same article."""
+    pmc_id = str(pmc_id).strip()
+    return pmc_id[3:] if pmc_id.upper().startswith("PMC") else pmc_id
+
+
+async def pmc_efetch_fulltext_sections(
+    session: aiohttp.ClientSession,
+    ids: Sequence[str],
+    api_key: Optional[str] = None,
+    email: Optional[str] = None,
+    *,
+    store: Optional[PubMedArticleStore] = None,
+    section_char_caps: Optional[Dict[str, int]] = None,
+) -> List[PmcArticleSections]:
     """
-    no_tags = re.sub(r"<[^>]+>", " ", xml)
-    return re.sub(r"\s+", " ", no_tags).strip()
+    PMC full text as parsed sections (abstract / methods / results / discussion /
+    conclusions / tables), in the order of `ids`.
 
+    The EFetch response is streamed through `PmcSectionsParser`, so the XML is never
+    held in memory as a whole, text beyond each section cap is never accumulated,
+    and the download stops as soon as every requested article has been parsed.
+    With a `store`, parsed articles are kept per PMCID and only missing IDs are fetched.
+    """
+    keys = list(dict.fromkeys(_normalize_pmcid(i) for i in ids))
+    if not keys:
+        return []
 
-def format_pmc_efetch_fulltext_xml(
+    cached: Dict[str, str] = await store.get_many(PMC_SECTIONS, keys) if store is not None else {}
+    articles: Dict[str, PmcArticleSections] = {
+        k: PmcArticleSections.from_dict(json.loads(v)) for k, v in cached.items()
+    }
+    missing = [k for k in keys if k not in articles]
+
+    unkeyed: List[PmcArticleSections] = []
+    if missing:
+        params = {
+            "db": "pmc",
+            "id": ",".join(missing),
+            "rettype": "full",
+            "retmode": "xml",
+            "tool": DEFAULT_TOOL,
+        }
+        if email:
+            params["email"] = email
+        if api_key:
+            params["api_key"] = api_key
+
+        parser = PmcSectionsParser(section_char_caps)
+        parsed: List[PmcArticleSections] = []
+        async with aclosing(_eutils_stream(session, "efetch", params)) as chunks:
+            async for chunk in chunks:
+                parsed.extend(parser.feed(chunk))
+                if len(parsed) >= len(missing):
+                    break  # every requested article is complete; skip the rest of the body
+        if len(parsed) < len(missing):
+            parsed.extend(parser.close())
+
+        fresh: Dict[str, str] = {}
+        for article in parsed:
+            if article.pmcid in missing and article.pmcid not in articles:
+                articles[article.pmcid] = article
+                if section_char_caps is None:  # only default-cap parses are shared via the store
+                    fresh[article.pmcid] = json.dumps(article.to_dict(), ensure_ascii=False)
+            else:
+                unkeyed.append(article)
+        if store is not None:
+            await store.put_many(PMC_SECTIONS, fresh)
+
+    return [articles[k] for k in keys if k in articles] + unkeyed
+
+
+def _format_pmc_fulltext(
     pmc_ids: List[str],
-    xml_text: str,
+    articles: List[PmcArticleSections],
     *,
     max_chars: Optional[int] = None,
 ) -> str:
-    """
-    Format PMC fulltext XML into a plain-text chunk for LLM summarization.
-    """
-    text = _strip_xml_tags(xml_text)
-    if max_chars is not None and len(text) > max_chars:
-        text = text[:max_chars] + " ...[full text truncated]"
-
     lines: List[str] = []
     lines.append("=== PMC Full Text (EFetch) ===")
     if pmc_ids:
         lines.append("PMC IDs: " + ", ".join(pmc_ids))
     lines.append("")
-    lines.append(text)
+    lines.append(format_pmc_article_sections(articles, max_chars=max_chars))
 
     return "\n".join(lines).strip()
 
 
+def format_pmc_efetch_fulltext_xml(
+    pmc_ids: List[str],
+    xml_text: str,
+    *,
+    max_chars: Optional[int] = None,
+) -> str:
+    """
+    Format PMC fulltext XML into a plain-text chunk for LLM summarization.
+
+    Each article is parsed into labelled sections and `max_chars` is split across
+    articles and sections, so results/discussion are not crowded out by front matter.
+    """
+    return _format_pmc_fulltext(pmc_ids, parse_pmc_articleset(xml_text), max_chars=max_chars)
+
+
 # ---------------------------------------------------------------------------
 # HIGH-LEVEL CHUNK FOR PUBMED (SEARCH + SUMMARY + ABSTRACTS)
 # ---------------------------------------------------------------------------
 
+def _merge_esummary_pages(pages: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge paged ESummary JSON responses into one `{"result": {"uids": [...], uid: {...}}}`."""
+    uids: List[str] = []
+    merged: Dict[str, Any] = {}
+    for page in pages:
+        result = page.get("result", {})
+        for uid in result.get("uids") or []:
+            if uid not in merged:
+                uids.append(uid)
+                merged[uid] = result.get(uid) or {}
+    return {"result": {"uids": uids, **merged}}
+
+
+async def pubmed_fetch_summaries_and_abstracts(
+    session: aiohttp.ClientSession,
+    pmids: Sequence[str],
+    *,
+    webenv: Optional[str] = None,
+    query_key: Optional[str] = None,
+    batch_size: int = PUBMED_HISTORY_BATCH_SIZE,
+    store: Optional[PubMedArticleStore] = None,
+) -> tuple[Dict[str, Any], str]:
+    """
+    ESummary + EFetch for `pmids`, issued concurrently and paged in `batch_size` chunks.
+
+    Both only depend on the PMID list, so every page of both runs at once; the shared
+    session's NCBI limiter keeps the request rate in bounds. With WebEnv/QueryKey
+    the pages are requested from the history server instead of re-sending IDs.
+    Pages are merged in PMID order. With a `store`, stored articles are served from
+    disk and only pages with missing PMIDs go to NCBI.
+    """
+    use_history = bool(webenv and query_key)
+    pages = [(start, list(pmids[start:start + batch_size])) for start in range(0, len(pmids), batch_size)]
+
+    def page_kwargs(start: int, page_ids: List[str]) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"ids": page_ids, "store": store}
+        if use_history:
+            kwargs.update(webenv=webenv, query_key=query_key, retstart=start, retmax=len(page_ids))
+        return kwargs
+
+    summary_pages, abstract_pages = await asyncio.gather(
+        asyncio.gather(*(pubmed_esummary(session, **page_kwargs(s, p)) for s, p in pages)),
+        asyncio.gather(*(pubmed_efetch_abstracts(session, **page_kwargs(s, p)) for s, p in pages)),
+    )
+    abstracts_text = "\n\n".join(t.strip() for t in abstract_pages if t.strip())
+    return _merge_esummary_pages(summary_pages), abstracts_text
+
+
 async def pubmed_search_summarizable_chunk(
     session: aiohttp.ClientSession,
     term: str,
     *,
     max_results: int = 5,
+    batch_size: int = PUBMED_HISTORY_BATCH_SIZE,
+    store: Optional[PubMedArticleStore] = None,
 ) -> str:
     """
-    End-to-end helper: PubMed search -> summaries -> abstracts,
+    End-to-end helper: PubMed search -> summaries + abstracts (concurrently),
     formatted as a single string ready for LLM summarization.
+
+    Result sets larger than `batch_size` are stored on the NCBI history server and
+    paged from there.
     """
     # 1) Search
-    es = await pubmed_esearch(session, term, retmax=max_results)
+    use_history = max_results > batch_size
+    es = await pubmed_esearch(session, term, retmax=max_results, use_history=use_history)
     es_formatted = format_pubmed_esearch(es, max_ids=max_results)
 
-    pmids = (es.get("esearchresult", {}).get("idlist") or [])[:max_results]
+    er = es.get("esearchresult", {})
+    pmids = (er.get("idlist") or [])[:max_results]
     if not pmids:
         return es_formatted  # nothing more to do
 
-    # 2) Summaries (metadata)
-    summary = await pubmed_esummary(session, pmids)
+    # 2) + 3) Summaries (metadata) and abstracts (text) only need the PMIDs
+    summary, abstracts_text = await pubmed_fetch_summaries_and_abstracts(
+        session,
+        pmids,
+        webenv=er.get("webenv") if use_history else None,
+        query_key=er.get("querykey") if use_history else None,
+        batch_size=batch_size,
+        store=store,
+    )
     summary_formatted = format_pubmed_esummary(summary, max_articles=max_results)
 
-    # 3) Abstracts (text)
-    abstracts_text = await pubmed_efetch_abstracts(session, pmids)
     abstracts_formatted = format_pubmed_efetch_abstracts(
         pmids,
         abstracts_text,
@@ -457,16 +829,17 @@ async def pmc_fulltext_summarizable_chunk(
     *,
     max_results: int = 3,
     max_chars: int = 12000,
+    store: Optional[PubMedArticleStore] = None,
 ) -> str:
     """
-    End-to-end helper: PMC search -> fulltext XML -> plain-text fulltext,
+    End-to-end helper: PMC search -> streamed fulltext sections -> plain text,
     formatted as a single string ready for LLM summarization.
 
     This is analogous to `pubmed_search_summarizable_chunk`, but uses:
       - pmc_esearch
       - format_pmc_esearch
-      - pmc_efetch_fulltext_xml
-      - format_pmc_efetch_fulltext_xml
+      - pmc_efetch_fulltext_sections
+      - format_pmc_article_sections
     """
     # 1) Search in PMC
     es = await pmc_esearch(session, term, retmax=max_results)
@@ -477,13 +850,13 @@ async def pmc_fulltext_summarizable_chunk(
         # No IDs: just return the search summary (still useful context)
         return es_formatted
 
-    # 2) Fulltext XML
-    xml_text = await pmc_efetch_fulltext_xml(session, pmc_ids)
+    # 2) Fulltext, streamed and parsed into per-article sections
+    articles = await pmc_efetch_fulltext_sections(session, pmc_ids, store=store)
 
-    # 3) Plain-text fulltext, truncated for safety
-    fulltext_formatted = format_pmc_efetch_fulltext_xml(
+    # 3) Plain-text sections, budgeted per article/section
+    fulltext_formatted = _format_pmc_fulltext(
         pmc_ids,
-        xml_text,
+        articles,
         max_chars=max_chars,
     )
 
@@ -526,14 +899,14 @@ async def summarize_pubmed_results(
     
 ) -> PubMedResultsSummary:
     """
-    Use an LLM (summary_model) + create_agent to turn the raw PubMed block
+    Use an LLM (summary_model) + a registry-cached agent to turn the raw PubMed block
     into a structured PubMedResultsSummary.
     """
    
 
     agent_instructions = summary_prompt.format(search_results=search_results)
 
-    pubmed_summary_agent = create_agent(
+    pubmed_summary_agent = get_agent(
         pubmed_summary_model,
         response_format=PubMedResultsSummary,
     )
@@ -562,7 +935,7 @@ async def summarize_pmc_results(
     """  
 
     agent_instructions = prompt_template.format(search_results=fulltext_block)
-    summary_agent = create_agent(
+    summary_agent = get_agent(
         pubmed_summary_model,
         response_format=PubMedResultsSummary,
     )
@@ -687,6 +1060,7 @@ async def pubmed_literature_search_tool(
         session,
         term=query,
         max_results=max_results,
+        store=pubmed_article_store,
     )
 
     # 2) Summarize via LLM into structured output
@@ -760,6 +1134,7 @@ async def pmc_fulltext_literature_tool(
         term=query,
         max_results=max_results,
         max_chars=max_chars,
+        store=pubmed_article_store,
     )
 
     # 4) Summarize via LLM into structured output
@@ -201,6 +201,8 @@ Notes:
 - Use formats=["markdown"] for clean text extraction.
 - Focus on a small number of high-information pages rather than scraping
   the entire site.
+- When you already have 2+ URLs to read, use firecrawl_batch_scrape_tool
+  (up to 10 URLs, one step, one combined summary) instead of repeated scrapes.
 
 ───────────────────────────────────────────────────────────────────────────────
 5) wikipedia_search_tool
@@ -148,6 +148,8 @@ When to use:
 Notes:
 - Prefer formats=["markdown"] for clean text.
 - Do not scrape large numbers of similar pages; choose the most informative ones.
+- When you already have 2+ URLs to read, use firecrawl_batch_scrape_tool
+  (up to 10 URLs, one step, one combined summary) instead of repeated scrapes.
 
 ───────────────────────────────────────────────────────────────────────────────
 5) wikipedia_search_tool
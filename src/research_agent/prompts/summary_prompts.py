@@ -110,6 +110,34 @@ Here is the scraped content you must analyze:
 """
 
 
+SUMMARY_REDUCE_PROMPT = """
+You are a research assistant for the Human Upgrade research pipeline.
+
+The search / scrape results below were too large to summarize in one pass, so they
+were split into parts and each part was summarized separately. You will receive
+those partial summaries, each followed by the sources it covered.
+
+Your tasks:
+
+1. SUMMARY
+   - Merge the partial summaries into ONE coherent summary of all the results,
+     as if you had read every source yourself.
+   - Remove repetition across parts; keep every distinct mechanism, finding, claim,
+     protocol, number and point of disagreement.
+   - Do NOT add information that is not in the partial summaries.
+
+2. CITATIONS
+   - Return one citation per distinct source URL listed below, copying the url,
+     title and other fields exactly. Do NOT invent sources.
+
+Here are the partial summaries you must merge:
+
+-------------------- PARTIAL SUMMARIES BEGIN --------------------
+{partial_summaries}
+-------------------- PARTIAL SUMMARIES END ----------------------
+"""
+
+
 PMC_SUMMARY_PROMPT = """
 You are summarizing biomedical literature using full-text articles from PubMed Central (PMC).
 
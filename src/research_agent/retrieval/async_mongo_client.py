@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import os 
-from typing import Dict, Any, List, Optional
-from pymongo import AsyncMongoClient 
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Sequence
+from pymongo import AsyncMongoClient, UpdateOne
 from bson.objectid import ObjectId
 from bson.errors import InvalidId
 from pymongo.asynchronous.database import AsyncDatabase  # type: ignore[import]
@@ -52,20 +53,70 @@ episodes_collection: AsyncCollection = _humanupgrade_db["episodes"]
 
 
 EpisodeDoc = Dict[str, Any]
+Projection = Mapping[str, Any]
+
+EPISODE_SCAN_BATCH_SIZE = int(os.getenv("EPISODE_SCAN_BATCH_SIZE", "500"))
+EPISODE_BULK_WRITE_CHUNK = int(os.getenv("EPISODE_BULK_WRITE_CHUNK", "500"))
+
+
+# --- Projections (per use-case) --- #
+# Episodes carry large text fields (summaryDetailed, webPageSummary, ...); fetch
+# only what the caller reads. Pass projection=None for the full document.
+
+# URL + S3 pointers (listing, backfill scans, transcript prefetch)
+EPISODE_POINTERS_PROJECTION: Projection = {
+    "episodePageUrl": 1,
+    "episodeTranscriptUrl": 1,
+    "s3TranscriptUrl": 1,
+}
+
+# Inputs to the transcript summarization workflows
+EPISODE_SUMMARY_INPUT_PROJECTION: Projection = {
+    **EPISODE_POINTERS_PROJECTION,
+    "webPageSummary": 1,
+}
+
+# Reading / repairing the stored summary
+EPISODE_SUMMARY_DETAILED_PROJECTION: Projection = {
+    "episodePageUrl": 1,
+    "summaryDetailed": 1,
+}
+
+# Parent research graph initial state
+EPISODE_RESEARCH_PROJECTION: Projection = {
+    **EPISODE_SUMMARY_INPUT_PROJECTION,
+    "episodeNumber": 1,
+}
+
+
+def _as_object_id(episode_id: Any) -> Any:
+    """ObjectId for ObjectId-like values, else the value as-is (non-ObjectId _id)."""
+    try:
+        return ObjectId(episode_id)
+    except (InvalidId, TypeError):
+        return episode_id
+
 
 async def get_episodes(
     limit: int = 50,
-    offset: int = 0,
+    after_id: Optional[Any] = None,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Projection] = None,
 ) -> List[EpisodeDoc]:
     """
-    Fetch a page of episodes using limit/offset pagination.
+    Fetch a page of episodes in _id order using keyset pagination.
+
+    Pass the last `_id` of the previous page as `after_id` for the next one (an
+    indexed range seek, unlike skip/offset which re-reads every skipped doc).
     """
+    filt: Dict[str, Any] = dict(query or {})
+    if after_id is not None:
+        filt["_id"] = {"$gt": _as_object_id(after_id)}
     cursor = (
         episodes_collection
-        .find({})
-        .skip(offset)
-        .limit(limit)
+        .find(filt, projection)
         .sort("_id", 1)
+        .limit(limit)
     )
 
     episodes: List[EpisodeDoc] = []
@@ -73,19 +124,78 @@ async def get_episodes(
         episodes.append(doc)
     return episodes  
 
+
+async def iter_episodes(
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Projection] = EPISODE_POINTERS_PROJECTION,
+    batch_size: int = EPISODE_SCAN_BATCH_SIZE,
+) -> AsyncIterator[EpisodeDoc]:
+    """
+    Stream every episode matching `query` in _id order, one keyset page at a time.
+
+    Memory stays at one page regardless of collection size, and no cursor is held
+    open between pages (safe for long per-episode work inside the loop).
+
+    Usage:
+        async for ep in iter_episodes({"summaryDetailed": {"$exists": False}}):
+            ...
+    """
+    after_id: Optional[Any] = None
+    while True:
+        page = await get_episodes(limit=batch_size, after_id=after_id, query=query, projection=projection)
+        for doc in page:
+            yield doc
+        if len(page) < batch_size:
+            return
+        after_id = page[-1]["_id"]
+
+
 async def get_episodes_by_urls( 
-    urls: list[str]
+    urls: list[str],
+    projection: Optional[Projection] = None,
 ) -> List[Dict[str, Any]]: 
     query: Dict[str, Any] = {"episodePageUrl": {"$in": urls}}
-    cursor = episodes_collection.find(query)
+    cursor = episodes_collection.find(query, projection)
     episodes: List[Dict[str, Any]] = []
     async for doc in cursor:
         episodes.append(doc)
     return episodes   
 
+async def get_episode_page_urls(
+    query: Optional[Dict[str, Any]] = None,
+    limit: int = 0,
+) -> List[str]:
+    """
+    Return episodePageUrl for every episode matching `query` (all episodes if None),
+    in _id order. Only the URL field is fetched.
+    """
+    cursor = (
+        episodes_collection
+        .find(query or {}, {"episodePageUrl": 1})
+        .sort("_id", 1)
+        .limit(limit)
+    )
+    urls: List[str] = []
+    async for doc in cursor:
+        url = doc.get("episodePageUrl")
+        if url:
+            urls.append(url)
+    return urls
+
+
+async def get_summarized_episode_ids(urls: list[str]) -> set[Any]:
+    """_ids of the episodes among `urls` that already have a non-empty summaryDetailed (ids only)."""
+    cursor = episodes_collection.find(
+        {"episodePageUrl": {"$in": urls}, "summaryDetailed": {"$nin": [None, ""]}},
+        {"_id": 1},
+    )
+    return {doc["_id"] async for doc in cursor}
+
+
 async def get_episode(
     episode_id: Optional[str] = None,
     episode_page_url: Optional[str] = None,
+    projection: Optional[Projection] = None,
 ) -> Optional[EpisodeDoc]:
     """
     Fetch a single episode by MongoDB _id or by episodePageUrl.
@@ -105,4 +215,95 @@ async def get_episode(
     else:
         query = {"episodePageUrl": episode_page_url}
 
-    return await episodes_collection.find_one(query)
\ No newline at end of file
+    return await episodes_collection.find_one(query, projection)
+
+
+# --- Bulk writes --- #
+
+@dataclass
+class BulkUpdateStats:
+    requested: int = 0
+    matched: int = 0
+    modified: int = 0
+    round_trips: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested,
+            "matched": self.matched,
+            "modified": self.modified,
+            "round_trips": self.round_trips,
+        }
+
+
+async def bulk_set_episode_fields(
+    updates: Mapping[Any, Mapping[str, Any]],
+    chunk_size: int = EPISODE_BULK_WRITE_CHUNK,
+) -> BulkUpdateStats:
+    """
+    `$set` different fields on many episodes with unordered bulk_write calls
+    (one round trip per `chunk_size` episodes instead of one update_one each).
+
+    `updates` maps episode _id (ObjectId or its string) -> fields to set.
+    """
+    stats = BulkUpdateStats(requested=len(updates))
+    ops: Sequence[UpdateOne] = [
+        UpdateOne({"_id": _as_object_id(episode_id)}, {"$set": dict(fields)})
+        for episode_id, fields in updates.items()
+        if fields
+    ]
+    for start in range(0, len(ops), chunk_size):
+        result = await episodes_collection.bulk_write(list(ops[start:start + chunk_size]), ordered=False)
+        stats.matched += result.matched_count
+        stats.modified += result.modified_count
+        stats.round_trips += 1
+    return stats
+
+
+class EpisodeUpdateBuffer:
+    """
+    Collects per-episode `$set`s and writes them with `bulk_set_episode_fields`
+    every `flush_every` episodes (and on `flush()`), so long-running loops don't
+    pay one round trip per episode but also don't hold all results until the end.
+
+    Usage:
+        updates = EpisodeUpdateBuffer(flush_every=10)
+        try:
+            for ep in episodes:
+                ...
+                await updates.set(ep["_id"], {"summaryDetailed": text})
+        finally:
+            await updates.flush()
+    """
+
+    def __init__(self, flush_every: int = 25) -> None:
+        self.flush_every = max(1, flush_every)
+        self.stats = BulkUpdateStats()
+        self._pending: Dict[Any, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def set(self, episode_id: Any, fields: Mapping[str, Any]) -> None:
+        # Later sets for the same episode merge into (and override) earlier ones
+        self._pending.setdefault(_as_object_id(episode_id), {}).update(fields)
+        if len(self._pending) >= self.flush_every:
+            await self.flush()
+
+    async def flush(self) -> BulkUpdateStats:
+        if not self._pending:
+            return self.stats
+        pending, self._pending = self._pending, {}
+        try:
+            result = await bulk_set_episode_fields(pending)
+        except BaseException:
+            # Keep the unwritten updates (newer sets win) so a retry can flush them
+            for episode_id, fields in self._pending.items():
+                pending.setdefault(episode_id, {}).update(fields)
+            self._pending = pending
+            raise
+        self.stats.requested += result.requested
+        self.stats.matched += result.matched
+        self.stats.modified += result.modified
+        self.stats.round_trips += result.round_trips
+        return self.stats
@@ -1,23 +1,43 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Tuple
+import hashlib
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import os
 from urllib.parse import urlparse
 
 import aioboto3
+import aiofiles
+import aiofiles.os
+from botocore.config import Config
 from mypy_boto3_s3 import S3Client
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 AWS_PROFILE = os.getenv("AWS_PROFILE")
 AWS_REGION = os.getenv("AWS_REGION")
 
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 
+# Optional S3-compatible endpoint (e.g. a local moto server: http://127.0.0.1:5000)
+AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")
+
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+
+# Transcripts are immutable once uploaded, so they are cached on disk keyed by
+# bucket/key + ETag. Set TRANSCRIPT_CACHE_DIR="" to disable.
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join(".cache", "transcripts"))
+# Once the cache holds more than this many bytes, the least recently used
+# entries are deleted. 0 = unbounded.
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(2 * 1024**3)))
+
 
 @asynccontextmanager
 async def get_s3_client() -> AsyncIterator[S3Client]:
@@ -35,16 +55,77 @@ async def get_s3_client() -> AsyncIterator[S3Client]:
         async with get_s3_client() as s3:
             resp = await s3.list_buckets()
     """
+    async with _new_session().client("s3", **_client_kwargs()) as client:
+        yield client
+
+
+def _new_session() -> aioboto3.Session:
     # Session will use any combination of profile + explicit keys + region.
-    session = aioboto3.Session(
+    return aioboto3.Session(
         profile_name=AWS_PROFILE or None,
         aws_access_key_id=AWS_ACCESS_KEY_ID or None,
         aws_secret_access_key=AWS_SECRET_ACCESS_KEY or None,
         region_name=AWS_REGION or None,
     )
 
-    async with session.client("s3") as client:
-        yield client
+
+def _client_kwargs() -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "config": Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
+    }
+    if AWS_S3_ENDPOINT_URL:
+        kwargs["endpoint_url"] = AWS_S3_ENDPOINT_URL
+    return kwargs
+
+
+# -----------------------------------------------------------------------------
+# Long-lived pooled client
+# -----------------------------------------------------------------------------
+
+_shared_stack: Optional[AsyncExitStack] = None
+_shared_client: Optional[S3Client] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_lock: Optional[asyncio.Lock] = None
+
+
+async def get_shared_s3_client() -> S3Client:
+    """
+    Return the process-wide S3 client, creating it on first use.
+
+    One session + one connection pool (S3_MAX_POOL_CONNECTIONS) for the whole run,
+    instead of a new session/client (and TLS handshake) per object. The client is
+    bound to the running event loop; a new loop gets a new client.
+
+    Call `close_shared_s3_client()` at shutdown.
+    """
+    global _shared_stack, _shared_client, _shared_loop, _shared_lock
+    loop = asyncio.get_running_loop()
+    if _shared_client is not None and _shared_loop is loop:
+        return _shared_client
+    if _shared_lock is None or _shared_loop is not loop:
+        _shared_lock = asyncio.Lock()
+        _shared_loop = loop
+        _shared_client = None
+        _shared_stack = None
+    async with _shared_lock:
+        if _shared_client is None:
+            stack = AsyncExitStack()
+            _shared_client = await stack.enter_async_context(
+                _new_session().client("s3", **_client_kwargs())
+            )
+            _shared_stack = stack
+    return _shared_client
+
+
+async def close_shared_s3_client() -> None:
+    global _shared_stack, _shared_client, _shared_loop, _shared_lock
+    stack = _shared_stack
+    _shared_stack = _shared_client = _shared_loop = _shared_lock = None
+    if stack is not None:
+        await stack.aclose()
 
 
 def parse_s3_url(s3_url: str) -> Tuple[str, str]:
@@ -72,20 +153,234 @@ def parse_s3_url(s3_url: str) -> Tuple[str, str]:
     return bucket, key
 
 
+# -----------------------------------------------------------------------------
+# On-disk transcript cache
+# -----------------------------------------------------------------------------
+
+@dataclass
+class TranscriptCacheStats:
+    hits: int = 0
+    misses: int = 0
+    head_requests: int = 0
+    bytes_downloaded: int = 0
+    coalesced: int = 0
+    evicted: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "head_requests": self.head_requests,
+            "bytes_downloaded": self.bytes_downloaded,
+            "coalesced": self.coalesced,
+            "evicted": self.evicted,
+        }
+
+
+class TranscriptCache:
+    """
+    Content-addressed on-disk cache: sha256(bucket/key@etag) -> <cache_dir>/<digest>.txt
+
+    A cheap HEAD gives the current ETag; if that file exists it is read from disk,
+    otherwise the object is streamed to a temp file and renamed into place (so a
+    crashed download never leaves a half-written entry). A re-uploaded object gets
+    a new ETag and therefore a new entry. ETags verified in this process are
+    remembered, so repeated reads of one object cost one HEAD.
+
+    The directory is bounded by `max_bytes`: hits refresh an entry's mtime and,
+    when a download pushes the total over the bound, the oldest entries go first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = TRANSCRIPT_CACHE_DIR,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir or None
+        self.max_bytes = max(0, max_bytes)
+        self.stats = TranscriptCacheStats()
+        self._etags: Dict[Tuple[str, str], str] = {}
+        # One download per object even when several readers race
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Running size of the directory; None until the first scan
+        self._total_bytes: Optional[int] = None
+
+    def path_for(self, bucket: str, key: str, etag: str) -> str:
+        digest = hashlib.sha256(f"{bucket}/{key}@{etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir or "", f"{digest}.txt")
+
+    async def _head_etag(self, s3: S3Client, bucket: str, key: str) -> str:
+        cached = self._etags.get((bucket, key))
+        if cached is not None:
+            return cached
+        self.stats.head_requests += 1
+        resp = await s3.head_object(Bucket=bucket, Key=key)
+        etag = resp["ETag"].strip('"')
+        self._etags[(bucket, key)] = etag
+        return etag
+
+    async def _download(self, s3: S3Client, bucket: str, key: str, etag: str) -> str:
+        """Stream the object to disk (IfMatch pins it to the ETag we keyed on); return its path."""
+        path = self.path_for(bucket, key, etag)
+        await aiofiles.os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{id(asyncio.current_task())}.tmp"
+        resp = await s3.get_object(Bucket=bucket, Key=key, IfMatch=etag)
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in resp["Body"].iter_chunks():
+                    size += len(chunk)
+                    await f.write(chunk)
+            await aiofiles.os.replace(tmp_path, path)
+        except BaseException:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
+        finally:
+            resp["Body"].close()
+        self.stats.misses += 1
+        self.stats.bytes_downloaded += size
+        await self._account(path, size)
+        return path
+
+    async def _account(self, path: str, size: int) -> None:
+        """Add a fresh entry to the running total and evict if it crossed max_bytes."""
+        if not self.max_bytes:
+            return
+        if self._total_bytes is None:
+            # The first scan already includes the entry just written
+            self._total_bytes = await asyncio.to_thread(self._scan_bytes)
+        else:
+            self._total_bytes += size
+        if self._total_bytes > self.max_bytes:
+            freed, removed = await asyncio.to_thread(self._evict, path)
+            self._total_bytes -= freed
+            self.stats.evicted += removed
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) for every finished entry in the cache dir."""
+        out: List[Tuple[float, int, str]] = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".txt"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                out.append((st.st_mtime, st.st_size, entry.path))
+        return out
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: str) -> Tuple[int, int]:
+        """Delete least recently used entries (never `keep`) until under max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        freed = removed = 0
+        for _, size, path in entries:
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            freed += size
+            removed += 1
+        if removed:
+            logger.info(f"🧹 Transcript cache: evicted {removed} file(s), {freed} bytes")
+        return freed, removed
+
+    async def ensure_cached(self, s3: S3Client, bucket: str, key: str) -> str:
+        """Make sure the current version of bucket/key is on disk; return its path."""
+        task = asyncio.current_task()
+        while True:
+            etag = await self._head_etag(s3, bucket, key)
+            path = self.path_for(bucket, key, etag)
+            if await aiofiles.os.path.exists(path):
+                self.stats.hits += 1
+                if self.max_bytes:
+                    # Mark as recently used so eviction keeps it
+                    await asyncio.to_thread(os.utime, path)
+                return path
+
+            inflight = self._inflight.get((bucket, key))
+            if inflight is None:
+                break
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: take over the download
+                if not inflight.cancelled() or (task is not None and task.cancelling()):
+                    raise
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[(bucket, key)] = fut
+        try:
+            path = await self._download(s3, bucket, key, etag)
+            fut.set_result(path)
+            return path
+        except Exception as e:
+            self._etags.pop((bucket, key), None)
+            fut.set_exception(e)
+            # Nobody else may be waiting; don't warn about a never-retrieved exception
+            fut.exception()
+            raise
+        finally:
+            if not fut.done():
+                # Cancelled mid-download: waiters retry and one becomes the leader
+                fut.cancel()
+            self._inflight.pop((bucket, key), None)
+
+    async def read_text(self, s3: S3Client, bucket: str, key: str) -> str:
+        path = await self.ensure_cached(s3, bucket, key)
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return await f.read()
+        except FileNotFoundError:
+            # Evicted between the existence check and the read; fetch it again
+            path = await self.ensure_cached(s3, bucket, key)
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return await f.read()
+
+
+_transcript_cache: Optional[TranscriptCache] = None
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """The process-wide cache, or None when TRANSCRIPT_CACHE_DIR is empty."""
+    global _transcript_cache
+    if not TRANSCRIPT_CACHE_DIR:
+        return None
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache(TRANSCRIPT_CACHE_DIR)
+    return _transcript_cache
+
+
 async def get_transcript_text_from_s3_url(s3_url: str) -> str:
     """
     Given an S3 HTTPS URL stored in s3TranscriptUrl, download and return the text.
 
+    Uses the shared pooled client and the on-disk transcript cache (one HEAD when
+    the transcript is already cached).
+
     Example s3_url:
         https://biohack-agent-transcripts-us-east-2.s3.amazonaws.com/transcripts-text/aa4b0d2449c576a8.txt
     """
     bucket, key = parse_s3_url(s3_url)
+    s3 = await get_shared_s3_client()
 
-    async with get_s3_client() as s3:
-        resp = await s3.get_object(Bucket=bucket, Key=key)
-        body = resp["Body"]  # StreamingBody (async)
-        data: bytes = await body.read()
+    cache = get_transcript_cache()
+    if cache is not None:
+        return await cache.read_text(s3, bucket, key)
 
+    resp = await s3.get_object(Bucket=bucket, Key=key)
+    async with resp["Body"] as body:  # StreamingBody (async)
+        data: bytes = await body.read()
     return data.decode("utf-8")
 
 